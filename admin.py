@@ -0,0 +1,216 @@
+"""admin.py – 운영용 관리 API (/fast/admin/*)
+
+``X-Admin-Token`` 헤더가 ``ADMIN_TOKEN`` 과 일치해야 한다. ``ADMIN_TOKEN`` 이 없으면 모두 거부한다
+(로컬 개발에서만 ``ADMIN_OPEN=1`` 로 토큰 없이 연다).
+
+방·태스크·메모리 조회는 읽기 전용이며 부하가 걸린 노드에서 몇 초마다 불러도 되도록 만든다.
+* 방 목록은 ``game.room_index`` 색인으로 페이지에 담길 방만 읽는다 (``rooms`` 전체를 훑지 않음)
+* ``round_buffer`` · ``round_events`` · ``listen_acks`` 는 진행 중인 턴 수만큼만 남아 있다
+* 메모리 추정은 ``ADMIN_MEMORY_CACHE_SEC`` 동안 캐시하고, 방은 ``ADMIN_MEMORY_SAMPLE_ROOMS`` 개 표본으로 추정한다
+"""
+import asyncio
+import hmac
+import os
+import sys
+import time
+from itertools import islice
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+
+from monitoring.loop_monitor import loop_monitor
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+ADMIN_OPEN  = os.getenv("ADMIN_OPEN", "0") == "1"
+ROOM_PAGE_MAX     = 200
+MEM_CACHE_SEC     = float(os.getenv("ADMIN_MEMORY_CACHE_SEC", "10"))
+MEM_SAMPLE_ROOMS  = int(os.getenv("ADMIN_MEMORY_SAMPLE_ROOMS", "50"))
+
+def require_admin(x_admin_token: str | None = Header(default=None)):
+    if not ADMIN_TOKEN:
+        if ADMIN_OPEN:
+            return
+        raise HTTPException(status_code=403, detail="admin api disabled (ADMIN_TOKEN not set)")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="forbidden")
+
+router = APIRouter(prefix="/fast/admin", dependencies=[Depends(require_admin)])
+
+# ────────────────────────────── 이벤트 루프 지연
+@router.get("/loop")
+async def loop_status():
+    return loop_monitor.status()
+
+@router.post("/loop")
+async def loop_configure(
+    enabled: bool | None = None,
+    threshold_ms: float | None = None,
+    interval_ms: float | None = None,
+):
+    loop_monitor.configure(
+        interval=interval_ms / 1000 if interval_ms is not None else None,
+        threshold=threshold_ms / 1000 if threshold_ms is not None else None,
+    )
+    if enabled is True:
+        loop_monitor.start()
+    elif enabled is False:
+        loop_monitor.stop()
+    return loop_monitor.status()
+
+# ────────────────────────────── DB 커넥션 풀
+@router.get("/db")
+async def db_pool():
+    from db import pool_status
+    return pool_status()
+
+# ────────────────────────────── 키워드 카탈로그
+@router.get("/keywords")
+async def keyword_catalog():
+    from service.keyword_catalog import catalog
+    return catalog.status()
+
+@router.post("/keywords/reload")
+async def keyword_reload():
+    from service import keyword_catalog
+    return keyword_catalog.reload()
+
+# ────────────────────────────── 분석 샤드
+@router.get("/shards")
+async def shard_status():
+    from main import rooms
+    from game.shards import shard_router
+    return shard_router.status(rooms.keys())
+
+# ────────────────────────────── 방
+def _room_summary(room_id: str, room: dict, now: float) -> dict:
+    from game.room_index import room_index
+    deadline = room.get("deadline")
+    return {
+        "room_id":    room_id,
+        "state":      room.get("state"),
+        "phase":      room_index.phase_of(room_id),
+        "deadline":   deadline,
+        "remaining":  round(max(0.0, deadline - now), 2) if deadline else None,
+        "players":    len(room["users"]),
+        "round":      room.get("round"),
+        "max_rounds": room.get("max_rounds"),
+    }
+
+@router.get("/rooms")
+async def room_list(
+    phase: str | None = None,
+    cursor: int | None = Query(None, ge=0),     # 이전 응답의 next_cursor
+    limit: int = Query(50, ge=1, le=ROOM_PAGE_MAX),
+):
+    from main import rooms
+    from game.room_index import room_index
+    total, ids, next_cursor = room_index.page(phase, cursor, limit)
+    now = time.time()
+    return {
+        "total":     total,
+        "limit":     limit,
+        "next_cursor": next_cursor,
+        "phases":    room_index.counts(),
+        "untracked": len(rooms) - len(room_index),      # 0 이 아니면 색인 갱신이 빠진 경로가 있다
+        "items":     [_room_summary(rid, rooms[rid], now) for rid in ids if rid in rooms],
+    }
+
+@router.get("/rooms/{room_id}")
+async def room_detail(room_id: str):
+    from main import rooms, round_buffer, round_events, listen_acks
+    from game.shards import shard_router
+    room = rooms.get(room_id)
+    if room is None:
+        raise HTTPException(status_code=404, detail="room not found")
+
+    scores = room.get("scores", {})
+    gate = listen_acks.get(room_id)
+    if gate is not None:
+        gate = {"phase": gate.phase, "expected": sorted(gate.expected), "acked": sorted(gate.acked)}
+    prefix = f"{room_id}:"
+    return {
+        **_room_summary(room_id, room, time.time()),
+        "host":    room["host"],
+        "turn":    room.get("turn"),
+        "order":   room["order"],
+        "users": [
+            {"sid": sid, "id": u["id"], "nickname": u["nickname"], "ready": u["ready"],
+             "mic": u.get("mic", False), "score": scores.get(sid)}
+            for sid, u in room["users"].items()
+        ],
+        "keywords": {"used": room.get("kw_idx", 0), "total": len(room.get("keywords", []))},
+        "gate":    gate,
+        "analysis": [
+            {"key": k, "done": b["future"].done()} for k, b in round_buffer.items() if k.startswith(prefix)
+        ],
+        "events": [
+            {"key": k, "set": ev.is_set()} for k, ev in round_events.items() if k.startswith(prefix)
+        ],
+        "shard": shard_router.for_room(room_id).idx if shard_router.enabled else None,
+    }
+
+# ────────────────────────────── 태스크
+@router.get("/tasks")
+async def task_status(sample: int = Query(20, ge=0, le=ROOM_PAGE_MAX)):
+    from main import round_buffer, round_events, listen_acks
+    from game import rounds, speculative
+    from game.shards import shard_router
+
+    futures = [b["future"] for b in round_buffer.values()]
+    outstanding = [k for k, ev in round_events.items() if not ev.is_set()]
+    gates: dict = {}
+    for gate in listen_acks.values():
+        gates[gate.phase] = gates.get(gate.phase, 0) + 1
+    analysis = sys.modules.get("game.analysis")      # 아직 분석을 한 번도 안 했으면 import 하지 않는다
+    return {
+        "loop_tasks":   len(asyncio.all_tasks()),
+        "round_buffer": {"size": len(round_buffer), "pending": sum(not f.done() for f in futures)},
+        "round_events": {"size": len(round_events), "outstanding": len(outstanding), "keys": outstanding[:sample]},
+        "phase_gates":  gates,
+        "background":   rounds.background_tasks(),
+        "speculative":  speculative.status(),
+        "providers": {
+            "local":  analysis.provider_inflight() if analysis else {},
+            "shards": await shard_router.provider_inflight() if shard_router.enabled else {},
+        },
+        "shards": {s.label: s.inflight for s in shard_router.shards},
+    }
+
+# ────────────────────────────── 메모리
+_mem_cache: dict = {"at": 0.0, "report": None}
+_catalog_size: dict = {"version": None, "bytes": 0}
+
+def _memory_report() -> dict:
+    from main import rooms, round_buffer, round_events, listen_acks
+    from game import speculative
+    from monitoring.memory import deep_size, rss_bytes
+    from service.keyword_catalog import catalog
+
+    seen: set = set()                        # 구조 사이에 공유된 객체는 한 번만 센다
+    sample = list(islice(rooms.values(), MEM_SAMPLE_ROOMS))
+    sampled = sum(deep_size(r, seen) for r in sample)
+    per_room = sampled / len(sample) if sample else 0
+
+    if _catalog_size["version"] != catalog.version:    # 카탈로그는 재적재될 때만 다시 잰다
+        _catalog_size.update(version=catalog.version, bytes=deep_size(catalog.items))
+
+    spec = speculative.status()
+    return {
+        "rss": rss_bytes(),
+        "structures": {
+            "rooms":        {"count": len(rooms), "bytes": int(per_room * len(rooms)),
+                             "per_room": int(per_room), "sampled": len(sample)},
+            "round_buffer": {"count": len(round_buffer), "bytes": deep_size(round_buffer, seen),
+                             "audio_b64": sum(len(b.get("audio_b64", "")) for b in round_buffer.values())},
+            "round_events": {"count": len(round_events), "bytes": deep_size(round_events, seen)},
+            "listen_acks":  {"count": len(listen_acks), "bytes": deep_size(listen_acks, seen)},
+            "speculative":  {"count": spec["open"], "bytes": spec["buffered_bytes"]},
+            "keywords":     {"count": len(catalog.items), "bytes": _catalog_size["bytes"]},
+        },
+    }
+
+@router.get("/memory")
+async def memory_status(fresh: bool = False):
+    now = time.monotonic()
+    if fresh or _mem_cache["report"] is None or now - _mem_cache["at"] > MEM_CACHE_SEC:
+        _mem_cache.update(at=now, report=_memory_report())
+    return {**_mem_cache["report"], "age": round(now - _mem_cache["at"], 2)}
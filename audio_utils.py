@@ -16,11 +16,13 @@
 
 from __future__ import annotations
 
+import asyncio
 import io
+import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from typing import Final
 
-import librosa
 import numpy as np
 import soundfile as sf
 
@@ -28,6 +30,11 @@ __all__ = [
     "TARGET_SR_STT",
     "TARGET_SR_HUM",
     "convert_format",
+    "convert_format_async",
+    "trim_silence",
+    "prepare_recording",
+    "prepare_recording_async",
+    "warm_decoders",
 ]
 
 # ────────────────────────────────────────────────
@@ -36,6 +43,22 @@ __all__ = [
 TARGET_SR_STT: Final[int] = 16_000  # Whisper STT용
 TARGET_SR_HUM: Final[int] = 8_000   # ACRCloud 허밍용
 
+# 디코딩 전용 스레드 (numpy·soxr·ffmpeg 는 GIL 을 놓고 일한다)
+DECODE_WORKERS: Final[int] = int(os.getenv("DECODE_WORKERS", str(min(4, os.cpu_count() or 1))))
+_decode_pool = ThreadPoolExecutor(max_workers=DECODE_WORKERS, thread_name_prefix="decode")
+_warm_wav: bytes | None = None
+_decoders_warm = False          # 프로세스당 한 번만 예열 (매 턴 prepare_turn 이 부르더라도)
+
+# ────────────────────────────────────────────────
+# VAD (프레임 RMS 에너지 게이트)
+# ────────────────────────────────────────────────
+VAD_ENABLED:       Final[bool]  = os.getenv("VAD", "1") == "1"
+VAD_FRAME_MS:      Final[int]   = int(os.getenv("VAD_FRAME_MS", "30"))
+VAD_MIN_DB:        Final[float] = float(os.getenv("VAD_MIN_DB", "-50"))     # 이보다 작으면 무조건 무음 (dBFS)
+VAD_MARGIN_DB:     Final[float] = float(os.getenv("VAD_MARGIN_DB", "12"))   # 잡음 바닥 + margin 이상이면 소리
+VAD_PAD_MS:        Final[int]   = int(os.getenv("VAD_PAD_MS", "250"))       # 자른 구간 앞뒤 여유
+VAD_MIN_VOICED_SEC: Final[float] = float(os.getenv("VAD_MIN_VOICED_SEC", "0.4"))
+
 # ────────────────────────────────────────────────
 # 내부 유틸리티
 # ────────────────────────────────────────────────
@@ -51,6 +74,7 @@ def _resample(y: np.ndarray, orig_sr: int, target_sr: int) -> tuple[np.ndarray,
     """고품질(res_type="soxr_hq") 리샘플"""
     if orig_sr == target_sr:
         return y, orig_sr
+    import librosa   # numba JIT 때문에 import 가 느려 실제로 리샘플이 필요할 때 로드
     y_res = librosa.resample(y, orig_sr=orig_sr, target_sr=target_sr, res_type="soxr_hq")
     return y_res, target_sr
 
@@ -77,6 +101,42 @@ def _ffmpeg_resample(raw: bytes, sr: int) -> bytes:
     result = subprocess.run(cmd, input=raw, stdout=subprocess.PIPE, check=True)
     return result.stdout
 
+def _frame_db(y: np.ndarray, frame: int) -> np.ndarray:
+    """프레임별 RMS (dBFS) – reshape 한 번으로 전체 프레임을 벡터 연산"""
+    n = len(y) // frame
+    if n == 0:
+        return np.full(1, -120.0, dtype=np.float32)
+    frames = y[: n * frame].reshape(n, frame)
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-6))
+
+def trim_silence(y: np.ndarray, sr: int) -> tuple[np.ndarray, float]:
+    """앞뒤 무음을 잘라낸 신호와 소리가 있는 프레임의 총 길이(초)를 반환.
+
+    임계값 = max(VAD_MIN_DB, min(잡음 바닥(하위 10%) + VAD_MARGIN_DB, 최대 - 10 dB)).
+    계속 소리가 나는 녹음(잡음 바닥 ≈ 최대)도 통째로 버리지 않도록 최대값 기준으로 상한을 둔다.
+    """
+    frame = max(1, sr * VAD_FRAME_MS // 1000)
+    db = _frame_db(y, frame)
+    floor, peak = float(np.percentile(db, 10)), float(db.max())
+    threshold = max(VAD_MIN_DB, min(floor + VAD_MARGIN_DB, peak - 10))
+    voiced = db > threshold
+    idx = np.flatnonzero(voiced)
+    if idx.size == 0:
+        return y[:0], 0.0
+
+    pad = VAD_PAD_MS // VAD_FRAME_MS
+    start = max(0, idx[0] - pad) * frame
+    end = min(len(y), (idx[-1] + 1 + pad) * frame)
+    return y[start:end], idx.size * frame / sr
+
+def _to_wav(y: np.ndarray, sr: int) -> bytes:
+    """float [-1, 1] → PCM16 WAV (범위를 넘는 샘플은 잘라서 int16 이 뒤집히지 않게)"""
+    buf = io.BytesIO()
+    pcm = (np.clip(y, -1.0, 1.0) * 32767).astype(np.int16)
+    sf.write(buf, pcm, sr, format="WAV", subtype="PCM_16")
+    return buf.getvalue()
+
 # ────────────────────────────────────────────────
 # Public API
 # ────────────────────────────────────────────────
@@ -114,6 +174,80 @@ def convert_format(raw_bytes: bytes, *, for_whisper: bool = True) -> bytes:
     data = _normalize_if_too_quiet(data)
 
     # 5) PCM16 WAV로 직렬화
-    buf = io.BytesIO()
-    sf.write(buf, (data * 32767).astype(np.int16), target_sr, format="WAV", subtype="PCM_16")
-    return buf.getvalue()
+    return _to_wav(data, target_sr)
+
+
+def prepare_recording(raw_bytes: bytes) -> dict:
+    """분석용 전처리: 16 kHz 로 한 번만 디코딩 → 무음 제거 → 정규화 → 16 kHz·8 kHz WAV.
+
+    Returns
+    -------
+    dict
+        ``stt`` (16 kHz WAV), ``hum`` (8 kHz WAV), ``duration`` (원본 길이, 초),
+        ``voiced`` (소리가 있는 구간 길이, 초), ``trimmed`` (잘라낸 뒤 길이, 초),
+        ``empty`` (True 면 ``stt``·``hum`` 은 None).
+    """
+    try:
+        data, sr = sf.read(io.BytesIO(raw_bytes), dtype="float32")
+    except RuntimeError:
+        data, sr = sf.read(io.BytesIO(_ffmpeg_resample(raw_bytes, TARGET_SR_STT)), dtype="float32")
+    data = _to_mono(data)
+    data, sr = _resample(data, sr, TARGET_SR_STT)
+    duration = len(data) / sr
+
+    if VAD_ENABLED:
+        data, voiced = trim_silence(data, sr)
+    else:
+        voiced = duration
+    out = {"duration": duration, "voiced": voiced, "trimmed": len(data) / sr, "empty": voiced < VAD_MIN_VOICED_SEC}
+    if out["empty"]:
+        return {**out, "stt": None, "hum": None}
+
+    # 잡음 바닥까지 키우지 않도록 자른 뒤에 정규화.
+    # 리샘플 필터가 피크를 넘길 수 있으므로 8 kHz 는 원래 신호에서 리샘플한 뒤 따로 정규화한다
+    hum, _ = _resample(data, sr, TARGET_SR_HUM)
+    stt = _normalize_if_too_quiet(data)
+    hum = _normalize_if_too_quiet(hum)
+    return {**out, "stt": _to_wav(stt, sr), "hum": _to_wav(hum, TARGET_SR_HUM)}
+
+
+async def convert_format_async(raw_bytes: bytes, *, for_whisper: bool = True) -> bytes:
+    """``convert_format`` 을 디코딩 스레드 풀에서 실행."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _decode_pool, lambda: convert_format(raw_bytes, for_whisper=for_whisper)
+    )
+
+
+async def prepare_recording_async(raw_bytes: bytes) -> dict:
+    """``prepare_recording`` 을 디코딩 스레드 풀에서 실행."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_decode_pool, prepare_recording, raw_bytes)
+
+
+async def warm_decoders() -> None:
+    """스레드를 미리 띄우고 리샘플 경로(librosa·soxr)를 한 번씩 태워 둔다.
+
+    ThreadPoolExecutor 는 submit 될 때 스레드를 만들기 때문에 워커 수만큼 동시에 던진다.
+    0.6초 사인파 WAV 를 분석 전처리·재생용 변환 경로로 한 번씩 태워 첫 턴의 초기화 비용을 없앤다.
+    무음이면 VAD 에서 바로 빠져 8 kHz 리샘플까지 가지 않으므로 소리가 있어야 한다.
+    프로세스당 한 번만 실제로 돌고, 이후 호출은 바로 반환한다.
+    """
+    global _warm_wav, _decoders_warm
+    if _decoders_warm:
+        return
+    _decoders_warm = True                        # 동시에 여러 번 불려도 한 번만 태운다
+    try:
+        if _warm_wav is None:
+            buf = io.BytesIO()
+            t = np.arange(int(44_100 * 0.6)) / 44_100
+            tone = (np.sin(2 * np.pi * 220 * t) * 0.3 * 32767).astype(np.int16)
+            sf.write(buf, tone, 44_100, format="WAV", subtype="PCM_16")
+            _warm_wav = buf.getvalue()
+        await asyncio.gather(*(
+            prepare_recording_async(_warm_wav) if i % 2 == 0 else convert_format_async(_warm_wav)   # 워커 1개여도 16·8 kHz 둘 다
+            for i in range(DECODE_WORKERS)
+        ))
+    except BaseException:
+        _decoders_warm = False                   # 실패·취소 시 다음 호출에서 다시 시도
+        raise
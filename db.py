@@ -1,50 +1,178 @@
 from dotenv import load_dotenv
 load_dotenv()
-from sqlalchemy import create_engine, text
-from sqlalchemy.ext.asyncio import create_async_engine
-from sqlalchemy.orm import sessionmaker
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Iterable, List, Sequence
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, UniqueConstraint, event, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
 import os
 
+from monitoring.metrics import counter, gauge, histogram
+
 FAST_DB_HOST = os.getenv("FAST_DB_HOST")
 FAST_DB_USER = os.getenv("FAST_DB_USER")
 FAST_DB_PASS = os.getenv("FAST_DB_PASS")
 FAST_DB_PORT = os.getenv("FAST_DB_PORT")
 FAST_DB_NAME = os.getenv("FAST_DB_NAME")
-DATABASE_URL = (f"mysql+asyncmy://{FAST_DB_USER}:{FAST_DB_PASS}@{FAST_DB_HOST}:{FAST_DB_PORT}/{FAST_DB_NAME}")
-
-engine = create_async_engine(DATABASE_URL, pool_size=10, max_overflow=20, echo=False)
-
-async def fetch_random_keywords(limit: int) -> list[dict]:
-    """
-    keyword 테이블에서 `limit` 개를 중복 없이 무작위로 뽑아
-    Socket.IO 로직에서 바로 쓸 수 있는 딕셔너리 형태로 반환한다.
-    """
-    sql = text(
-        """
-        SELECT keyword_type, keyword_name, keyword_alias
-        FROM keyword
-        ORDER BY RAND()
-        LIMIT :limit
-        """
-    )
+# FAST_DATABASE_URL 로 통째로 바꿀 수 있다 (예: 로컬 테스트용 sqlite+aiosqlite:///./fast.db)
+DATABASE_URL = os.getenv("FAST_DATABASE_URL") or (
+    f"mysql+asyncmy://{FAST_DB_USER}:{FAST_DB_PASS}@{FAST_DB_HOST}:{FAST_DB_PORT}/{FAST_DB_NAME}"
+)
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
 
-    async with engine.connect() as conn:
-        result = await conn.execute(sql, {"limit": limit})
-        rows = result.mappings().all()
-
-    keywords = []
-    for row in rows:
-        # '레드벨벳|redvelvet' → ['레드벨벳', 'redvelvet']
-        alias_list = (
-            [a.strip() for a in row["keyword_alias"].split("|")]
-            if row["keyword_alias"]
-            else []
-        )
-        keywords.append(
-            {
-                "type": row["keyword_type"],
-                "name": row["keyword_name"],
-                "alias": alias_list,
-            }
+# ───────────────────────────── 풀 크기: DB 커넥션 예산을 워커 수로 나눈다
+# 워커 1개 기준 기본값은 예전과 같은 pool_size=10, max_overflow=20
+WORKERS        = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+DB_CONN_BUDGET = int(os.getenv("FAST_DB_MAX_CONNECTIONS", "30"))   # 이 서비스가 쓸 전체 커넥션 수
+PER_WORKER     = max(3, DB_CONN_BUDGET // WORKERS)
+POOL_SIZE      = max(1, PER_WORKER // 3)
+MAX_OVERFLOW   = PER_WORKER - POOL_SIZE
+POOL_RECYCLE   = int(os.getenv("FAST_DB_POOL_RECYCLE", "1800"))    # MySQL wait_timeout 보다 짧게
+POOL_TIMEOUT   = float(os.getenv("FAST_DB_POOL_TIMEOUT", "10"))
+
+_pool_kw: Dict[str, Any] = {} if IS_SQLITE else {
+    "pool_size":    POOL_SIZE,
+    "max_overflow": MAX_OVERFLOW,
+    "pool_recycle": POOL_RECYCLE,
+    "pool_timeout": POOL_TIMEOUT,
+}
+engine = create_async_engine(DATABASE_URL, pool_pre_ping=True, echo=False, **_pool_kw)
+
+# ───────────────────────────── 풀 텔레메트리
+DB_CHECKOUT_WAIT = histogram("db_checkout_wait_seconds", "커넥션 풀 대기 시간",
+                             buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10))
+DB_IN_USE        = gauge("db_pool_in_use", "사용 중인 커넥션 수")
+DB_POOL_LIMIT    = gauge("db_pool_limit", "풀 최대 커넥션 수 (pool_size + max_overflow)")
+DB_CONNECTS      = counter("db_connections_opened_total", "새로 연 DB 커넥션 수")
+DB_QUERY_SECONDS = histogram("db_query_seconds", "쿼리 소요 시간")
+
+DB_POOL_LIMIT.set(0 if IS_SQLITE else POOL_SIZE + MAX_OVERFLOW)
+
+def _pool_checkedout() -> int:
+    pool = engine.sync_engine.pool
+    return pool.checkedout() if hasattr(pool, "checkedout") else 0
+
+# checkin 이벤트 시점에는 풀 내부 카운터가 아직 줄지 않아서 직접 센다
+@event.listens_for(engine.sync_engine, "connect")
+def _on_connect(dbapi_conn, record):
+    DB_CONNECTS.inc()
+
+@event.listens_for(engine.sync_engine, "checkout")
+def _on_checkout(dbapi_conn, record, proxy):
+    DB_IN_USE.inc()
+
+@event.listens_for(engine.sync_engine, "checkin")
+def _on_checkin(dbapi_conn, record):
+    DB_IN_USE.dec()
+
+def pool_status() -> Dict[str, Any]:
+    pool = engine.sync_engine.pool
+    return {
+        "class":      type(pool).__name__,
+        "size":       pool.size() if hasattr(pool, "size") else None,
+        "checkedout": _pool_checkedout(),
+        "overflow":   pool.overflow() if hasattr(pool, "overflow") else None,
+        "limit":      None if IS_SQLITE else POOL_SIZE + MAX_OVERFLOW,
+        "workers":    WORKERS,
+        "checkout_wait": DB_CHECKOUT_WAIT.snapshot(),
+    }
+
+@asynccontextmanager
+async def connect(begin: bool = False):
+    """풀 대기 시간을 기록하는 커넥션 (begin=True 면 트랜잭션)"""
+    t0 = time.perf_counter()
+    ctx = engine.begin() if begin else engine.connect()
+    async with ctx as conn:
+        DB_CHECKOUT_WAIT.observe(time.perf_counter() - t0)
+        yield conn
+
+async def _timed(conn: AsyncConnection, name: str, stmt, params=None):
+    t0 = time.perf_counter()
+    try:
+        return await conn.execute(stmt, params) if params is not None else await conn.execute(stmt)
+    finally:
+        DB_QUERY_SECONDS.observe(time.perf_counter() - t0, query=name)
+
+# ───────────────────────────── 테이블·문장 (모듈 로드 시 한 번만 만들어 컴파일 캐시를 탄다)
+metadata = MetaData()
+keyword_table = Table(
+    "keyword", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("keyword_name", String(255), nullable=False),
+    Column("keyword_type", String(50)),
+    Column("keyword_alias", String(1000)),
+    # 같은 이름이 제목·가수로 따로 있을 수 있다 (예: '비', '태양') → 이름+타입으로 유일
+    UniqueConstraint("keyword_name", "keyword_type", name="uq_keyword_name_type"),
+)
+KEYWORD_KEY_COLS = ("keyword_name", "keyword_type")
+_KEYWORD_COLS = (keyword_table.c.keyword_type, keyword_table.c.keyword_name, keyword_table.c.keyword_alias)
+SELECT_KEYWORDS = select(*_KEYWORD_COLS)
+
+async def create_schema():
+    """로컬 SQLite 등 스탠드인 DB 에 테이블 생성 (운영 MySQL 은 기존 스키마 사용)"""
+    async with connect(begin=True) as conn:
+        await conn.run_sync(metadata.create_all)
+
+# ───────────────────────────── bulk helpers
+async def truncate(conn: AsyncConnection, table: Table):
+    stmt = f"DELETE FROM {table.name}" if IS_SQLITE else f"TRUNCATE TABLE {table.name}"
+    await _timed(conn, f"truncate:{table.name}", text(stmt))
+
+async def bulk_insert(conn: AsyncConnection, table: Table, rows: Sequence[Dict[str, Any]], batch_size: int = 1_000):
+    """executemany 로 batch_size 씩 삽입"""
+    stmt = insert(table)
+    for i in range(0, len(rows), batch_size):
+        await _timed(conn, f"bulk_insert:{table.name}", stmt, list(rows[i : i + batch_size]))
+
+async def bulk_upsert(
+    conn: AsyncConnection,
+    table: Table,
+    rows: Sequence[Dict[str, Any]],
+    key_cols: Iterable[str],
+    batch_size: int = 1_000,
+):
+    """키가 겹치면 나머지 컬럼을 갱신 (MySQL: ON DUPLICATE KEY, SQLite: ON CONFLICT)"""
+    if not rows:
+        return
+    key_cols = list(key_cols)
+    update_cols = [c for c in rows[0] if c not in key_cols]
+    if IS_SQLITE:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        stmt = dialect_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=key_cols, set_={c: stmt.excluded[c] for c in update_cols}
         )
-    return keywords
\ No newline at end of file
+    else:
+        from sqlalchemy.dialects.mysql import insert as dialect_insert
+        stmt = dialect_insert(table)
+        stmt = stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in update_cols})
+    for i in range(0, len(rows), batch_size):
+        await _timed(conn, f"bulk_upsert:{table.name}", stmt, list(rows[i : i + batch_size]))
+
+# ───────────────────────────── keyword reads
+# 키워드 테이블은 부팅 때만 바뀌므로 전체 행을 잠깐 캐시해 두고 파이썬에서 뽑는다
+# (게임마다 ORDER BY RAND() 로 테이블 전체를 정렬하지 않도록)
+KEYWORD_CACHE_TTL = float(os.getenv("KEYWORD_CACHE_TTL", "300"))
+_keyword_cache: Dict[str, Any] = {"rows": None, "at": 0.0}
+
+def invalidate_keyword_cache():
+    _keyword_cache.update(rows=None, at=0.0)
+
+def _to_keyword(row) -> dict:
+    # '레드벨벳|redvelvet' → ['레드벨벳', 'redvelvet']
+    alias_list = (
+        [a.strip() for a in row["keyword_alias"].split("|")]
+        if row["keyword_alias"]
+        else []
+    )
+    return {"type": row["keyword_type"], "name": row["keyword_name"], "alias": alias_list}
+
+async def fetch_all_keywords() -> List[dict]:
+    now = time.monotonic()
+    if _keyword_cache["rows"] is None or now - _keyword_cache["at"] > KEYWORD_CACHE_TTL:
+        async with connect() as conn:
+            result = await _timed(conn, "select:keyword", SELECT_KEYWORDS)
+            rows = result.mappings().all()
+        _keyword_cache.update(rows=[_to_keyword(r) for r in rows], at=now)
+    return _keyword_cache["rows"]
@@ -17,14 +17,18 @@
 """
 from __future__ import annotations
 
-import asyncio, base64, hashlib, hmac, os, re, time, json, logging, difflib, random, unicodedata, io
+import asyncio, base64, hashlib, hmac, os, re, time, logging
+from functools import lru_cache
 from typing import Any, Dict, List, Tuple
 
 import aiohttp
 from bs4 import BeautifulSoup
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 
-from audio_utils import convert_format
+from audio_utils import prepare_recording_async, warm_decoders
+from game.scoring import KeywordMatcher, ScoreEngine, matcher_for
+from service.keyword_catalog import initials, normalize
+from monitoring.metrics import counter, gauge, histogram
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +44,20 @@ LEMON_URL  = "https://api.lemonfox.ai/v1/audio/transcriptions"
 SERPER_KEY       = os.getenv("SERPER_API_KEY")
 SERPER_ENDPOINT  = "https://google.serper.dev/search"
 
+# 턴 사이(약 35초)에도 외부 API 커넥션이 살아 있도록 keep-alive 를 넉넉히
+KEEPALIVE_SEC = 60
+
+PREPARE_SECONDS = histogram("turn_prepare_seconds", "다음 턴 사전 준비 소요 시간")
+VOICED_SECONDS  = histogram("recording_voiced_seconds", "무음 제거 후 녹음 길이",
+                            buckets=(0.25, 0.5, 1, 2, 3, 4, 5, 6, 8, 10, 15))
+SILENT_TURNS    = counter("recording_silent_total", "무음으로 판정해 외부 API 를 건너뛴 녹음 수")
+
+PROVIDERS         = ("acr", "whisper", "serper", "image")
+PROVIDER_INFLIGHT = gauge("provider_inflight", "외부 API 별 진행 중인 호출 수")
+
+# 녹음 앞부분 분석(game.speculative)에서 판정을 확정할 ACR 최소 유사도
+SPECULATIVE_MIN_SIM = float(os.getenv("SPECULATIVE_MIN_SIM", "0.8"))
+
 OFFICIAL_DOMAINS = [
     "music.bugs.co.kr",
     "www.genie.co.kr",
@@ -84,29 +102,8 @@ async def _extract_album_image(url: str, session: aiohttp.ClientSession) -> str
         return None
 
 def _match_keyword(keyword: Dict[str, Any], title: str, artist: str) -> bool:
-    """logic.py의 keyword_match 간략 이식."""
-    ktype  = keyword.get("type")
-    kname  = keyword.get("name", "")
-    kalias = keyword.get("alias", [])
-
-    if ktype == "제목":
-        return kname.lower() in title.lower()
-
-    if artist.lower() == kname.lower():
-        return True
-
-    def normalize(s: str) -> str:
-        s = re.sub(r"[()\[\]]", "", s.lower())                       # 괄호 제거
-        return re.split(r',|&|/|feat\.?|with', s)[0].strip()
-
-    if normalize(artist) == normalize(kname):
-        return True
-
-    return any(a and a.lower() in artist.lower() for a in kalias)
-
-def _similarity(a: str, b: str) -> float:
-    """Levenshtein 기반 유사도 (0.0 ~ 1.0)"""
-    return difflib.SequenceMatcher(None, a.lower(), b.lower()).ratio()
+    """logic.py의 keyword_match 간략 이식 (실제 구현은 game.scoring.KeywordMatcher)."""
+    return KeywordMatcher(keyword).match(title, artist)
 
 JOSA = ("은", "는", "이", "가", "을", "를", "에", "의", "로", "과", "와")
 
@@ -133,23 +130,9 @@ def _strip_josa(token: str) -> str:
         return token[:-1]
     return token
 
-def _to_initials(hangul: str) -> str:
-    """'윤미래' → 'ㅇㅁㄹ' (초성열)"""
-    CHO = [chr(c) for c in range(0x1100, 0x1113)]
-    res = []
-    for ch in hangul:
-        code = ord(ch) - 0xAC00
-        if 0 <= code <= 11171:
-            res.append(CHO[code // 588])
-        else:
-            res.append(ch)
-    return "".join(res)
-
-def _normalize_korean(text: str) -> str:
-    # KC 정규화 + 소문자, 공백·특수문자 축약
-    txt = unicodedata.normalize("NFKC", text).lower()
-    txt = re.sub(r"[^가-힣a-z0-9]+", " ", txt).strip()
-    return txt
+# 초성열·정규화는 키워드 카탈로그와 같은 구현을 쓴다 (카탈로그는 키워드별로 미리 계산해 둔다)
+_to_initials      = initials
+_normalize_korean = normalize
 
 def _keyword_variants(name: str, aliases: List[str]) -> List[str]:
     basics = [name] + [_normalize_korean(a) for a in aliases if a]
@@ -171,6 +154,11 @@ def _keyword_variants(name: str, aliases: List[str]) -> List[str]:
 
     return list({w for w in basics + extras if w})
 
+@lru_cache(maxsize=1024)
+def _keyword_targets(name: str, aliases: Tuple[str, ...]) -> Tuple[str, ...]:
+    """키워드별 변형 목록 캐시 (다음 턴 키워드는 prepare_turn 에서 미리 계산)."""
+    return tuple(_keyword_variants(name, list(aliases)))
+
 def remove_keyword_like_tokens(stt_text: str, keyword: dict) -> str:
     raw_alias = keyword.get("alias", "")
     if isinstance(raw_alias, list):
@@ -178,13 +166,12 @@ def remove_keyword_like_tokens(stt_text: str, keyword: dict) -> str:
     else:                                 # "a|b|c" 형태
         alias_list = raw_alias.split("|") if raw_alias else []
 
-    targets = _keyword_variants(keyword["name"], alias_list)
+    targets = _keyword_targets(keyword["name"], tuple(alias_list))
     clean_tokens = []
     for raw_tok in _normalize_korean(stt_text).split():
         tok = _strip_josa(raw_tok)                    # ② 조사 제거
-        matched = any(
-            fuzz.ratio(tok, kw) >= 75                 # ④ 유사도 75%
-            for kw in targets
+        matched = process.extractOne(                 # ④ 유사도 75%
+            tok, targets, scorer=fuzz.ratio, score_cutoff=75
         )
         if not matched:
             clean_tokens.append(raw_tok)
@@ -217,18 +204,63 @@ async def _call_with_retry(fn, *args, **kw):
     logging.getLogger(__name__).warning("%s 실패: %s", fn.__name__, last_exc)
     return None
 
-# ───────────────────────────────────────── scoring
-def _score_acr(sim: float) -> int:
-    """ACRCloud: 80점 기본 + 유사도(0~1) × 15 → 80~95점 + 랜덤 보정 1~5점 → 최종 81~100점"""
-    base = max(80, min(95, 80 + int(round(sim * 15))))
-    bonus = random.randint(1, 5)
-    return min(base + bonus, 100)
-
-def _score_stt(sim: float) -> int:
-    """STT·Serper: 60점 기본 + 종합점수(0~1) × 15 → 60~75점 + 랜덤 보정 1~5점 → 최종 61~80점"""
-    base = max(60, min(75, 60 + int(round(sim * 15))))
-    bonus = random.randint(1, 5)
-    return min(base + bonus, 80)
+# ───────────────────────────────────────── shared session
+_session: aiohttp.ClientSession | None = None
+_session_loop: asyncio.AbstractEventLoop | None = None
+_last_prewarm = 0.0
+
+def _get_session() -> aiohttp.ClientSession:
+    """루프마다 하나씩 공유하는 세션 (턴마다 TLS 핸드셰이크를 다시 하지 않도록)."""
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        connector = aiohttp.TCPConnector(limit=100, keepalive_timeout=KEEPALIVE_SEC, ttl_dns_cache=300)
+        _session = aiohttp.ClientSession(connector=connector)
+        _session_loop = loop
+    return _session
+
+async def close_session():
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+async def _prewarm_connections():
+    """ACR·LemonFox·Serper 호스트에 미리 접속해 커넥션 풀에 keep-alive 로 남겨 둔다."""
+    global _last_prewarm
+    if time.monotonic() - _last_prewarm < KEEPALIVE_SEC / 2:
+        return
+    _last_prewarm = time.monotonic()
+    session = _get_session()
+
+    async def _touch(url: str):
+        try:
+            async with session.head(url, timeout=aiohttp.ClientTimeout(total=3)):
+                pass
+        except (asyncio.TimeoutError, aiohttp.ClientError):
+            pass
+
+    await asyncio.gather(
+        _touch(f"https://{ACR_HOST}/"),
+        _touch(LEMON_URL.rsplit("/v1/", 1)[0] + "/"),
+        _touch(SERPER_ENDPOINT.rsplit("/", 1)[0] + "/"),
+    )
+
+async def prepare_turn(keyword: Dict[str, Any]):
+    """다음 턴을 위한 사전 준비 – 현재 턴의 listen·result 페이즈 동안 run_rounds 가 호출.
+
+    * 키워드 매처·변형 목록 미리 계산
+    * 외부 API 커넥션 예열
+    * 디코딩 스레드 생성·리샘플 경로 예열 (프로세스당 한 번)
+    """
+    t0 = time.perf_counter()
+    matcher_for(keyword)
+    raw_alias = keyword.get("alias", [])
+    alias_list = raw_alias if isinstance(raw_alias, list) else (raw_alias.split("|") if raw_alias else [])
+    _keyword_targets(keyword.get("name", ""), tuple(alias_list))
+    await asyncio.gather(_prewarm_connections(), warm_decoders(), return_exceptions=True)
+    PREPARE_SECONDS.observe(time.perf_counter() - t0)
+
 # ───────────────────────────────────────── external calls
 async def _call_acr(session: aiohttp.ClientSession, wav: bytes) -> Dict[str, Any]:
     ts = str(int(time.time()))
@@ -269,16 +301,15 @@ async def _call_whisper(session: aiohttp.ClientSession, wav: bytes) -> str:
         j = await r.json()
     return j.get("text", "").strip()
 
-async def _serper_search(session: aiohttp.ClientSession, query: str) -> Tuple[str | None, str | None, str | None]:
-    if not query:
-        return None, None, None
-
+async def _call_serper(session: aiohttp.ClientSession, query: str) -> Dict[str, Any]:
     payload = {"q": query, "num": 10, "gl": "kr", "hl": "ko"}
     headers = {"X-API-KEY": SERPER_KEY, "Content-Type": "application/json"}
     async with session.post(SERPER_ENDPOINT, json=payload, headers=headers, timeout=8) as r:
         r.raise_for_status()
-        data = await r.json()
+        return await r.json()
 
+def _parse_serper(data: Dict[str, Any]) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """Serper 응답 → ([(곡명, 가수), ...] 후보 전체, 앨범 이미지를 찾아볼 공식 사이트 링크)."""
     # 1) Knowledge Graph 우선
     kg = data.get("knowledgeGraph", {})
     title = artist = None
@@ -287,128 +318,275 @@ async def _serper_search(session: aiohttp.ClientSession, query: str) -> Tuple[st
         attrs  = {k.lower(): v for k, v in kg.get("attributes", {}).items()}
         artist = attrs.get("artist") or attrs.get("artists") or kg.get("artist")
 
-    # 2) Organic 결과에서 보완
+    # 2) Organic 결과 전체를 후보로 (KG 에 빠진 값은 첫 organic 후보로 보완)
     items = _boost_official(data.get("organic", []))
-    if (not title or not artist) and items:
-        for it in items:
-            t, a = _parse_title_artist(it.get("title", ""))
-            if t and a:
-                title, artist = title or t, artist or a
-                if title and artist:
-                    break
-
-    # 3) 앨범 이미지
-    image = None
+    organic = []
     for it in items:
-        link = it.get("link", "")
-        if any(d in link for d in OFFICIAL_DOMAINS):
-            image = await _extract_album_image(link, session)
-            if image:
-                break
+        t, a = _parse_title_artist(it.get("title", ""))
+        if t and a:
+            organic.append((t, a))
+
+    candidates: List[Tuple[str, str]] = []
+    if title or artist:
+        if organic:
+            title, artist = title or organic[0][0], artist or organic[0][1]
+        if title and artist:
+            candidates.append((title, artist))
+    candidates += [c for c in organic if c not in candidates]
+
+    # 3) 앨범 이미지 후보 링크
+    links = [it.get("link", "") for it in items]
+    return candidates, [l for l in links if any(d in l for d in OFFICIAL_DOMAINS)]
+
+# ───────────────────────────────────────── providers
+async def _tracked(provider: str, aw):
+    """진행 중인 외부 호출 수 (관리 API ``/fast/admin/tasks`` 의 providers)"""
+    PROVIDER_INFLIGHT.inc(provider=provider)
+    try:
+        return await aw
+    finally:
+        PROVIDER_INFLIGHT.dec(provider=provider)
 
-    return title, artist, image
+def provider_inflight() -> Dict[str, int]:
+    return {p: int(PROVIDER_INFLIGHT.value(provider=p)) for p in PROVIDERS}
 
-# ───────────────────────────────────────── main entry
-async def analyze_recording(raw: bytes, keyword: Dict[str, Any]) -> Dict[str, Any]:
-    """녹음 bytes + keyword → 판정 dict."""
-    wav_hum = convert_format(raw, for_whisper=False)   # 8 kHz
-    wav_stt = convert_format(raw, for_whisper=True)    # 16 kHz
-
-    async with aiohttp.ClientSession() as session:
-        acr_task = asyncio.create_task(
-            _call_with_retry(_call_acr, session, wav_hum)
-        )
-        stt_task = asyncio.create_task(
-            _call_with_retry(_call_whisper, session, wav_stt)
-        )
-        acr_json, lyrics = await asyncio.gather(
-            acr_task, stt_task, return_exceptions=True
-        )
+class LiveProviders:
+    """실제 외부 API 호출 (기본값)."""
 
-        if isinstance(acr_json, Exception) or acr_json is None:
-            acr_json = {}
-        if isinstance(lyrics, Exception) or lyrics is None:
-            lyrics = ""
-        print("\n🟦 Whisper 추출 가사:\n", lyrics)
-
-        if keyword.get("type") == "가수":
-            lyrics_clean = remove_keyword_like_tokens(lyrics, keyword)
-            print("🟢 키워드 제거 후:", lyrics_clean or "<empty>")
-        else:                     # 제목 키워드는 그대로 둠
-            lyrics_clean = lyrics
-
-        if not lyrics_clean.strip():
-            print("🛑 키워드만 포함 → Serper 건너뜀")
-            lyrics_clean = None    # 아래에서 falsy 체크용
-
-        # Serper Search
-        s_title, s_artist, s_img = await _serper_search(
-            session,
-            (lyrics_clean[:100] + " 가사") if lyrics_clean else ""
-        )
+    name = "live"
+
+    async def acr(self, wav: bytes) -> Dict[str, Any] | None:
+        return await _tracked("acr", _call_with_retry(_call_acr, _get_session(), wav))
+
+    async def whisper(self, wav: bytes) -> str | None:
+        return await _tracked("whisper", _call_with_retry(_call_whisper, _get_session(), wav))
+
+    async def serper(self, query: str) -> Dict[str, Any]:
+        return await _tracked("serper", _call_serper(_get_session(), query))
+
+    async def album_image(self, url: str) -> str | None:
+        return await _tracked("image", _extract_album_image(url, _get_session()))
 
-        # 🔵 Serper 결과 출력
-        print("\n🟦 Serper 검색 결과:")
-        print(f"title  : {s_title}")
-        print(f"artist : {s_artist}")
-        print(f"image  : {s_img}")
-
-        # ── 1) ACRCloud 우선 매칭
-        hum_tracks = acr_json.get("metadata", {}).get("humming", [])
-
-        print("\n🟦 ACRCloud Top 5:")
-        for i, trk in enumerate(hum_tracks[:5]):
-            title  = trk.get("title", "")
-            artist = trk.get("artists", [{}])[0].get("name", "")
-            score  = trk.get("score", "")
-            print(f"{i+1}. {title} / {artist} ({score})")
-
-        for trk in hum_tracks:
-            t_title  = trk.get("title", "")
-            t_artist = trk.get("artists", [{}])[0].get("name", "")
-            if _match_keyword(keyword, t_title, t_artist):
-                sim = float(trk.get("score", 0))
-                score = _score_acr(sim)
-                print(f"🔵 ACR 유사도: {sim:.2f} → 점수: {score}")
-                return {
-                    "matched": True,
-                    "title":   t_title,
-                    "artist":  t_artist,
-                    "score":   score,
-                    "source":  "acr",
-                    "image":   s_img,  # 이미 Serper에서 얻은 이미지 재사용
-                }
-
-        # ── 2) ACR 실패 → STT·Serper
-        if s_title and s_artist and _match_keyword(keyword, s_title, s_artist):
-            if s_title and s_artist and _match_keyword(keyword, s_title, s_artist):
-                title_in_lyrics  = s_title.lower() in lyrics.lower() if lyrics else False
-                artist_in_lyrics = s_artist.lower() in lyrics.lower() if lyrics else False
-
-                sim_title  = _similarity(lyrics, s_title) if lyrics else 0
-                sim_artist = _similarity(lyrics, s_artist) if lyrics else 0
-                sim_lev    = 0.5 * sim_title + 0.5 * sim_artist
-
-                sim = 0.2 * title_in_lyrics + 0.2 * artist_in_lyrics + 0.6 * sim_lev
-                score = _score_stt(sim)
-
-                print("\n🟨 STT 유사도 디버깅:")
-                print(f"- title 포함 여부      : {title_in_lyrics}")
-                print(f"- artist 포함 여부     : {artist_in_lyrics}")
-                print(f"- Levenshtein title     : {sim_title:.2f}")
-                print(f"- Levenshtein artist    : {sim_artist:.2f}")
-                print(f"- 가중 평균 sim         : {sim:.2f}")
-                print(f"- 최종 점수             : {score}")
-
-                return {
-                    "matched": True,
-                    "title":   s_title,
-                    "artist":  s_artist,
-                    "score":   score,
-                    "source":  "stt",
-                    "image":   s_img,
-                }
-
-
-        # ── 3) 완전 실패
-        return {"matched": False, "title": None, "artist": None, "score": 0, "image": None}
+class ReplayProviders:
+    """아카이브에 남은 응답을 그대로 돌려준다 (오프라인 재채점용, 네트워크 없음).
+
+    ``responses`` 는 ``analyze_recording(trace=...)`` 가 채운 ``trace["responses"]``.
+    """
+
+    name = "replay"
+
+    def __init__(self, responses: Dict[str, Any]):
+        self.responses = responses
+
+    async def acr(self, wav: bytes) -> Dict[str, Any] | None:
+        return self.responses.get("acr")
+
+    async def whisper(self, wav: bytes) -> str | None:
+        return self.responses.get("whisper")
+
+    async def serper(self, query: str) -> Dict[str, Any]:
+        return self.responses.get("serper") or {}
+
+    async def album_image(self, url: str) -> str | None:
+        return (self.responses.get("images") or {}).get(url)
+
+_live = LiveProviders()
+
+async def _serper_search(
+    providers, query: str, responses: Dict[str, Any]
+) -> Tuple[List[Tuple[str, str]], str | None]:
+    """검색 → ([(곡명, 가수), ...] 후보 전체, 앨범 이미지)."""
+    if not query:
+        return [], None
+
+    data = await providers.serper(query)
+    responses["serper"] = data
+    candidates, links = _parse_serper(data)
+
+    image = None
+    images = responses.setdefault("images", {})
+    for link in links:
+        image = await providers.album_image(link)
+        images[link] = image
+        if image:
+            break
+
+    return candidates, image
+
+class _Stopwatch:
+    """단계별 소요 시간 (초) – trace["timings"] 에 기록."""
+
+    def __init__(self, timings: Dict[str, float]):
+        self.timings = timings
+        self.t0 = time.perf_counter()
+
+    async def run(self, stage: str, aw):
+        t = time.perf_counter()
+        try:
+            return await aw
+        finally:
+            self.timings[stage] = time.perf_counter() - t
+
+    def mark(self, stage: str, since: float) -> float:
+        now = time.perf_counter()
+        self.timings[stage] = now - since
+        return now
+
+    def done(self):
+        self.timings["total"] = time.perf_counter() - self.t0
+
+# ───────────────────────────────────────── main entry
+async def analyze_recording(
+    raw: bytes,
+    keyword: Dict[str, Any],
+    *,
+    seed: Any = None,
+    providers=None,
+    trace: Dict[str, Any] | None = None,
+    speculative: bool = False,
+) -> Dict[str, Any]:
+    """녹음 bytes + keyword → 판정 dict. ``seed`` 가 같으면 보정 점수도 같다.
+
+    * ``providers``   : 외부 API 구현 (기본 ``LiveProviders``, 재채점은 ``ReplayProviders``)
+    * ``trace``       : 넘기면 ``responses`` (ACR·Whisper·Serper 원본 응답), ``timings`` (단계별 초),
+                        ``audio`` (원본·무음 제거 후 길이)를 채워 준다 → ``game.archive`` 에 그대로 저장
+    * ``speculative`` : 녹음 앞부분 – ACR 만 보고 ``SPECULATIVE_MIN_SIM`` 이상 키워드 일치일 때만 matched
+    """
+    providers = providers or _live
+    trace = trace if trace is not None else {}
+    trace.setdefault("responses", {})
+    sw = _Stopwatch(trace.setdefault("timings", {}))
+    try:
+        return await _analyze(raw, keyword, seed, providers, trace, sw, speculative)
+    finally:
+        sw.done()
+
+async def _analyze_prefix(rec, engine: ScoreEngine, matcher: KeywordMatcher, providers, trace, sw: _Stopwatch) -> Dict[str, Any]:
+    """녹음 앞부분 – ACR 허밍만 호출. 확신할 만한 키워드 일치가 아니면 matched=False (전체 녹음 분석으로 넘김)"""
+    responses = trace["responses"]
+    trace["speculative"] = True
+    acr_json = await sw.run("acr", providers.acr(rec["hum"])) or {}
+    responses["acr"] = acr_json
+
+    t = time.perf_counter()
+    acr = engine.best_acr(matcher, acr_json.get("metadata", {}).get("humming", []))
+    sw.mark("score", t)
+    if not acr or acr["sim"] < SPECULATIVE_MIN_SIM:
+        return {"matched": False, "title": None, "artist": None, "score": 0, "image": None, "speculative": True}
+
+    print(f"⚡ 앞부분 ACR 일치: {acr['title']} / {acr['artist']} ({acr['sim']:.2f}) → 점수: {acr['score']}")
+    _, image = await sw.run("serper", _serper_search(providers, f"{acr['title']} {acr['artist']}", responses))
+    return {
+        "matched":     True,
+        "title":       acr["title"],
+        "artist":      acr["artist"],
+        "score":       acr["score"],
+        "source":      "acr",
+        "image":       image,
+        "speculative": True,
+    }
+
+async def _analyze(raw, keyword, seed, providers, trace, sw: _Stopwatch, speculative: bool = False) -> Dict[str, Any]:
+    engine  = ScoreEngine(seed)
+    matcher = matcher_for(keyword)
+    responses = trace["responses"]
+
+    # 한 번 디코딩 → 앞뒤 무음 제거 → 16 kHz(STT)·8 kHz(허밍)
+    rec = await sw.run("decode", prepare_recording_async(raw))
+    trace["audio"] = {k: rec[k] for k in ("duration", "voiced", "trimmed", "empty")}
+    print(f"🎚️ 녹음 {rec['duration']:.2f}s → 소리 {rec['voiced']:.2f}s (전송 {rec['trimmed']:.2f}s)")
+    if rec["empty"]:
+        if not speculative:
+            SILENT_TURNS.inc()
+            print("🔇 무음 녹음 → 외부 API 호출 없이 실패 처리")
+        return {"matched": False, "title": None, "artist": None, "score": 0, "image": None, "silent": True}
+    if speculative:
+        return await _analyze_prefix(rec, engine, matcher, providers, trace, sw)
+    VOICED_SECONDS.observe(rec["voiced"])
+    wav_hum, wav_stt = rec["hum"], rec["stt"]
+
+    acr_task = asyncio.create_task(sw.run("acr", providers.acr(wav_hum)))
+    stt_task = asyncio.create_task(sw.run("whisper", providers.whisper(wav_stt)))
+    acr_json, lyrics = await asyncio.gather(
+        acr_task, stt_task, return_exceptions=True
+    )
+
+    if isinstance(acr_json, Exception) or acr_json is None:
+        acr_json = {}
+    if isinstance(lyrics, Exception) or lyrics is None:
+        lyrics = ""
+    responses["acr"], responses["whisper"] = acr_json, lyrics
+    print("\n🟦 Whisper 추출 가사:\n", lyrics)
+
+    t = time.perf_counter()
+    if keyword.get("type") == "가수":
+        lyrics_clean = remove_keyword_like_tokens(lyrics, keyword)
+        print("🟢 키워드 제거 후:", lyrics_clean or "<empty>")
+    else:                     # 제목 키워드는 그대로 둠
+        lyrics_clean = lyrics
+
+    if not lyrics_clean.strip():
+        print("🛑 키워드만 포함 → Serper 건너뜀")
+        lyrics_clean = None    # 아래에서 falsy 체크용
+    sw.mark("clean", t)
+
+    # Serper Search
+    s_candidates, s_img = await sw.run("serper", _serper_search(
+        providers,
+        (lyrics_clean[:100] + " 가사") if lyrics_clean else "",
+        responses,
+    ))
+
+    # 🔵 Serper 결과 출력
+    print("\n🟦 Serper 검색 후보:")
+    for i, (t, a) in enumerate(s_candidates[:5]):
+        print(f"{i+1}. {t} / {a}")
+    print(f"image  : {s_img}")
+
+    # ── 1) ACRCloud 우선 매칭 (허밍 후보 전체 중 최고 score)
+    t = time.perf_counter()
+    hum_tracks = acr_json.get("metadata", {}).get("humming", [])
+
+    print("\n🟦 ACRCloud Top 5:")
+    for i, trk in enumerate(hum_tracks[:5]):
+        title  = trk.get("title", "")
+        artist = trk.get("artists", [{}])[0].get("name", "")
+        score  = trk.get("score", "")
+        print(f"{i+1}. {title} / {artist} ({score})")
+
+    acr = engine.best_acr(matcher, hum_tracks)
+    if acr:
+        sw.mark("score", t)
+        print(f"🔵 ACR 유사도: {acr['sim']:.2f} → 점수: {acr['score']}")
+        return {
+            "matched": True,
+            "title":   acr["title"],
+            "artist":  acr["artist"],
+            "score":   acr["score"],
+            "source":  "acr",
+            "image":   s_img,  # 이미 Serper에서 얻은 이미지 재사용
+        }
+
+    # ── 2) ACR 실패 → STT·Serper (검색 후보 전체 중 가사와 가장 가까운 것)
+    stt = engine.best_stt(matcher, lyrics, s_candidates)
+    sw.mark("score", t)
+    if stt:
+        print("\n🟨 STT 유사도 디버깅:")
+        print(f"- title 포함 여부      : {stt['title_in']}")
+        print(f"- artist 포함 여부     : {stt['artist_in']}")
+        print(f"- Levenshtein title     : {stt['sim_title']:.2f}")
+        print(f"- Levenshtein artist    : {stt['sim_artist']:.2f}")
+        print(f"- 가중 평균 sim         : {stt['sim']:.2f}")
+        print(f"- 최종 점수             : {stt['score']}")
+
+        return {
+            "matched": True,
+            "title":   stt["title"],
+            "artist":  stt["artist"],
+            "score":   stt["score"],
+            "source":  "stt",
+            "image":   s_img,
+        }
+
+    # ── 3) 완전 실패
+    return {"matched": False, "title": None, "artist": None, "score": 0, "image": None}
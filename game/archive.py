@@ -0,0 +1,122 @@
+"""archive.py – 턴 아카이브 (오프라인 재채점용)
+
+``TURN_ARCHIVE_DIR`` 를 설정하면 턴마다 원본 녹음·키워드·시드·외부 API 응답(ACR JSON, Whisper 텍스트,
+Serper JSON, 앨범 이미지)·최종 판정·단계별 소요 시간을 남긴다. ``python -m game.replay`` 가 이걸 읽어
+네트워크 없이 ``analyze_recording`` 을 다시 돌린다.
+
+디렉터리 구조 (append-only, 날짜별 세그먼트)
+-------------------------------------------
+* ``turns-YYYYMMDD.jsonl`` : 한 줄에 턴 하나 (``audio`` 에 오디오 파일명·offset·length)
+* ``audio-YYYYMMDD.bin``   : 클라이언트 원본 오디오(webm/opus)를 이어 붙인 파일 (base64 없이 그대로)
+
+오디오를 먼저 쓰고 레코드를 나중에 쓰므로, 중간에 죽어도 레코드가 없는 오디오 조각만 남는다.
+``TURN_ARCHIVE_SAMPLE`` (0~1, 기본 1) 로 일부 턴만 남길 수 있다.
+
+``status`` 는 ``ok`` (판정 완료), ``timeout`` (listen 페이즈 안에 분석이 끝나지 않아 run_rounds 가 취소),
+``cancelled`` (그 밖의 취소), ``error`` (분석 중 예외). ``ok`` 가 아니면 ``result`` 는 플레이어에게 나간 실패 판정이고
+``responses`` 에는 그 시점까지 도착한 응답만 있다.
+"""
+from __future__ import annotations
+
+import json
+import os
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from monitoring.metrics import counter
+
+ARCHIVE_TURNS = counter("archive_turns_total", "아카이브에 기록한 턴 수")
+ARCHIVE_BYTES = counter("archive_bytes_total", "아카이브에 기록한 바이트 수")
+
+class TurnArchive:
+    """단일 스레드에서 순서대로 append (루프는 dict 하나 만드는 비용만 부담)."""
+
+    def __init__(self, directory: str | os.PathLike | None, sample: float = 1.0):
+        self.dir = Path(directory) if directory else None
+        self.sample = sample
+        self._pool = None
+        if self.dir:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archive")
+
+    @property
+    def enabled(self) -> bool:
+        return self.dir is not None
+
+    def wants(self) -> bool:
+        """이번 턴을 남길지 (샘플링)"""
+        return self.enabled and (self.sample >= 1 or random.random() < self.sample)
+
+    def record(
+        self,
+        *,
+        room_id: str,
+        turn: Any,
+        keyword: Dict[str, Any],
+        seed: Any,
+        trace: Dict[str, Any],
+        result: Dict[str, Any],
+        audio: bytes,
+        status: str = "ok",
+        error: Optional[str] = None,
+    ):
+        if not self.enabled:
+            return
+        rec = {
+            "id":        uuid.uuid4().hex,
+            "ts":        time.time(),
+            "room_id":   room_id,
+            "turn":      turn,
+            "keyword":   keyword,
+            "seed":      seed,
+            "responses": trace.get("responses", {}),
+            "timings":   trace.get("timings", {}),
+            "result":    result,
+            "status":    status,
+        }
+        if error:
+            rec["error"] = error
+        if trace.get("speculative"):          # 녹음 앞부분 판정 (audio 도 앞부분) → 재채점도 같은 경로로
+            rec["speculative"] = True
+        self._pool.submit(self._append, rec, audio)
+
+    def _append(self, rec: Dict[str, Any], audio: bytes):
+        day = time.strftime("%Y%m%d", time.localtime(rec["ts"]))
+        audio_path = self.dir / f"audio-{day}.bin"
+        with audio_path.open("ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(audio)
+        rec["audio"] = {"file": audio_path.name, "offset": offset, "length": len(audio)}
+        line = json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with (self.dir / f"turns-{day}.jsonl").open("a", encoding="utf-8") as f:
+            f.write(line)
+        ARCHIVE_TURNS.inc()
+        ARCHIVE_BYTES.inc(len(audio) + len(line))
+
+# ────────────────────────────────────────────── reader
+def iter_records(directory: str | os.PathLike, since: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """세그먼트 순서대로 레코드를 읽는다 (``since`` = 'YYYYMMDD' 이후만). 잘린 마지막 줄은 건너뛴다."""
+    for path in sorted(Path(directory).glob("turns-*.jsonl")):
+        if since and path.stem.split("-", 1)[1] < since:
+            continue
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+def read_audio(directory: str | os.PathLike, rec: Dict[str, Any]) -> bytes:
+    meta = rec["audio"]
+    with (Path(directory) / meta["file"]).open("rb") as f:
+        f.seek(meta["offset"])
+        return f.read(meta["length"])
+
+turn_archive = TurnArchive(
+    os.getenv("TURN_ARCHIVE_DIR") or None,
+    sample=float(os.getenv("TURN_ARCHIVE_SAMPLE", "1")),
+)
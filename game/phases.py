@@ -0,0 +1,108 @@
+"""phases.py – 클라이언트 ack 기반 페이즈 진행
+
+고정 sleep 대신 ``hold()`` 로 페이즈를 기다린다. 남아 있는 플레이어가 모두 ack 하면 바로 넘어가고,
+ack 가 오지 않아도 기존 상수(``INTRO_LEN`` · ``KW_LEN`` · ``LISTEN_LEN`` · ``RESULT_LEN``)가 지나면 넘어간다.
+
+클라이언트 이벤트 (payload: ``{roomId}``)
+----------------------------------------
+* ``intro_seen``        : 인트로 연출 끝
+* ``keyword_ready``     : 키워드 확인 완료 (차례인 플레이어만 기다림)
+* ``playback_finished`` : listen 페이즈 녹음 재생 끝
+* ``result_seen``       : 결과 표시 끝
+
+방마다 열려 있는 게이트는 하나뿐이며 ``main.listen_acks`` 에 둔다 (room_id → PhaseGate).
+ack 의 ``phase`` 가 지금 게이트와 다르면 (늦게 도착한 이전 페이즈 ack) 무시한다.
+``ADAPTIVE_PHASES=0`` 이면 ack 는 무시하지만, 기다리던 플레이어가 모두 나가면 (예: 키워드 페이즈의 차례 플레이어)
+예전처럼 바로 넘어간다.
+"""
+import asyncio
+import os
+
+from main import listen_acks
+from monitoring.metrics import counter, histogram
+
+ADAPTIVE_PHASES = os.getenv("ADAPTIVE_PHASES", "1") == "1"
+PHASE_MIN_SEC   = float(os.getenv("PHASE_MIN_SEC", "1.0"))   # 모두 ack 해도 최소 이만큼은 유지
+
+PHASE_SAVED = histogram("phase_time_saved_seconds", "ack 로 앞당긴 페이즈 시간",
+                        buckets=(0, 0.5, 1, 2, 3, 4, 5, 6, 8, 10))
+PHASE_EARLY = counter("phase_early_total", "상한 전에 끝난 페이즈 수")
+
+ACK_EVENTS = {
+    "intro_seen":        "intro",
+    "keyword_ready":     "keyword",
+    "playback_finished": "listen",
+    "result_seen":       "result",
+}
+
+class PhaseGate:
+    """한 페이즈의 ack 수집기 – 기다리는 sid 가 모두 ack 하거나 나가면 열린다.
+
+    ``acks=False`` 면 ack 는 받지 않고 나가는 것만 센다.
+    """
+
+    __slots__ = ("phase", "expected", "acks", "acked", "_event")
+
+    def __init__(self, phase: str, expected, acks: bool = True):
+        self.phase    = phase
+        self.expected = set(expected)
+        self.acks     = acks
+        self.acked    = set()
+        self._event   = asyncio.Event()
+        self._check()
+
+    def ack(self, sid: str) -> bool:
+        if not self.acks or sid not in self.expected:
+            return False
+        self.acked.add(sid)
+        self._check()
+        return True
+
+    def discard(self, sid: str):
+        """플레이어가 나가면 더 기다리지 않는다"""
+        self.expected.discard(sid)
+        self._check()
+
+    def _check(self):
+        if self.expected <= self.acked:
+            self._event.set()
+
+    async def wait(self):
+        await self._event.wait()
+
+def ack(room_id: str, sid: str, phase: str) -> bool:
+    gate = listen_acks.get(room_id)
+    return gate is not None and gate.phase == phase and gate.ack(sid)
+
+def discard(room_id: str, sid: str):
+    gate = listen_acks.get(room_id)
+    if gate is not None:
+        gate.discard(sid)
+
+async def hold(room_id: str, phase: str, length: float, expected) -> float:
+    """``expected`` 가 모두 ack 하거나 ``length`` 초가 지날 때까지 대기 → 실제 걸린 시간(초)
+
+    ``ADAPTIVE_PHASES=0`` 이면 ack 로는 끝나지 않고, ``expected`` 가 모두 나갔을 때만 일찍 끝난다.
+    """
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+    gate = PhaseGate(phase, expected, acks=ADAPTIVE_PHASES)
+    listen_acks[room_id] = gate
+    try:
+        await asyncio.wait_for(gate.wait(), timeout=length)
+        remain = min(PHASE_MIN_SEC, length) - (loop.time() - t0)
+        if ADAPTIVE_PHASES and remain > 0:
+            await asyncio.sleep(remain)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        if listen_acks.get(room_id) is gate:
+            listen_acks.pop(room_id, None)
+    return loop.time() - t0
+
+def record_saved(phase: str, saved: float):
+    """고정 sleep 이었을 때보다 줄어든 시간 기록"""
+    saved = max(0.0, saved)
+    PHASE_SAVED.observe(saved, phase=phase)
+    if saved > 0.05:
+        PHASE_EARLY.inc(phase=phase)
@@ -0,0 +1,229 @@
+"""replay.py – 아카이브된 턴 일괄 재채점
+
+``game.archive`` 가 남긴 턴을 코어 수만큼의 프로세스에 나눠 ``analyze_recording`` 으로 다시 판정한다.
+외부 API 는 ``ReplayProviders`` 가 아카이브된 응답으로 대신하므로 네트워크·과금 없이
+``_match_keyword`` · ``remove_keyword_like_tokens`` · 채점 기준을 바꿔 가며 비교할 수 있다.
+
+보고 항목
+---------
+* 기존 판정과의 일치율 (matched·곡·가수 / 점수까지 완전 일치) – ``status`` 가 ``ok`` 인 턴만
+* 시간 초과·오류로 끝났던 턴(``timeout``·``cancelled``·``error``)을 받아 둔 응답만으로 다시 판정했을 때 맞힌 수
+* 정답 라벨이 있으면 정확도·오탐·미탐 (레코드의 ``label`` 또는 ``--labels`` jsonl: ``{"id", "matched", "title"?}``)
+* 단계별 소요 시간 (재채점 / 아카이브 당시 실측) p50·p95
+
+실행
+----
+python -m game.replay /data/turn-archive --workers 8 --labels labels.jsonl --diff 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+from game.archive import iter_records, read_audio
+
+STAGES = ("decode", "acr", "whisper", "clean", "serper", "score", "total")
+
+# ────────────────────────────────────────────── worker (자식 프로세스)
+def _worker_init():
+    # analyze_recording 의 디버그 print 가 수천 턴 분량으로 쏟아지지 않도록
+    sys.stdout = open(os.devnull, "w")
+    # librosa import·리샘플 초기화가 첫 배치의 decode 시간에 섞이지 않도록 미리
+    from audio_utils import warm_decoders
+    asyncio.run(warm_decoders())
+
+async def _replay_batch(directory: str, recs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    from game.analysis import ReplayProviders, analyze_recording
+
+    out = []
+    for rec in recs:
+        trace: Dict[str, Any] = {}
+        try:
+            result = await analyze_recording(
+                read_audio(directory, rec),
+                rec["keyword"],
+                seed=rec.get("seed"),
+                providers=ReplayProviders(rec.get("responses", {})),
+                trace=trace,
+                speculative=bool(rec.get("speculative")),
+            )
+            out.append({"id": rec["id"], "result": result, "timings": trace.get("timings", {})})
+        except Exception as e:                       # 한 턴 실패로 배치 전체를 버리지 않는다
+            out.append({"id": rec["id"], "error": f"{type(e).__name__}: {e}"})
+    return out
+
+def _run_batch(directory: str, recs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return asyncio.run(_replay_batch(directory, recs))
+
+# ────────────────────────────────────────────── 집계
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    s = sorted(values)
+    return s[min(len(s) - 1, int(round(q * (len(s) - 1))))]
+
+def _same_answer(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    return (
+        bool(a.get("matched")) == bool(b.get("matched"))
+        and a.get("title") == b.get("title")
+        and a.get("artist") == b.get("artist")
+    )
+
+def _correct(result: Dict[str, Any], label: Dict[str, Any]) -> bool:
+    if bool(result.get("matched")) != bool(label.get("matched")):
+        return False
+    want = label.get("title")
+    return not (want and result.get("matched")) or (result.get("title") or "").lower() == want.lower()
+
+def _load_labels(path: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return {l["id"]: l for l in map(json.loads, filter(str.strip, f))}
+
+def _stage_summary(rows: List[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    out = {}
+    for stage in STAGES:
+        vals = [r[stage] for r in rows if stage in r]
+        if vals:
+            out[stage] = {"p50": _percentile(vals, 0.50), "p95": _percentile(vals, 0.95)}
+    return out
+
+def replay(
+    directory: str,
+    *,
+    workers: int,
+    batch: int,
+    limit: Optional[int] = None,
+    since: Optional[str] = None,
+    labels: Optional[Dict[str, Dict[str, Any]]] = None,
+    diff: int = 0,
+) -> Dict[str, Any]:
+    labels = labels or {}
+    recs: Dict[str, Dict[str, Any]] = {}
+    for rec in iter_records(directory, since=since):
+        recs[rec["id"]] = rec
+        if limit and len(recs) >= limit:
+            break
+    items = list(recs.values())
+
+    t0 = time.perf_counter()
+    done: List[Dict[str, Any]] = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_worker_init) as pool:
+        futs = [pool.submit(_run_batch, directory, items[i : i + batch]) for i in range(0, len(items), batch)]
+        for fut in as_completed(futs):
+            done += fut.result()
+    elapsed = time.perf_counter() - t0
+
+    errors = [d for d in done if "error" in d]
+    scored = [d for d in done if "result" in d]
+
+    agree = exact = 0
+    incomplete = recovered = 0
+    changed = []
+    correct = before_correct = labelled = 0
+    false_pos = false_neg = 0
+    for d in scored:
+        rec, new = recs[d["id"]], d["result"]
+        old = rec.get("result", {})
+        if rec.get("status", "ok") != "ok":         # 당시엔 판정이 없었다 → 일치율에서 빼고 따로 센다
+            incomplete += 1
+            recovered += bool(new.get("matched"))
+        elif _same_answer(old, new):
+            agree += 1
+            exact += old.get("score") == new.get("score") and old.get("source") == new.get("source")
+        else:
+            changed.append({"id": d["id"], "keyword": rec["keyword"].get("name"), "before": old, "after": new})
+
+        label = labels.get(d["id"]) or rec.get("label")
+        if label:
+            labelled += 1
+            correct += _correct(new, label)
+            before_correct += _correct(old, label)
+            false_pos += bool(new.get("matched")) and not label.get("matched")
+            false_neg += not new.get("matched") and bool(label.get("matched"))
+
+    n = (len(scored) - incomplete) or 1
+    report: Dict[str, Any] = {
+        "turns":      len(items),
+        "errors":     len(errors),
+        "elapsed":    elapsed,
+        "turns_per_sec": len(items) / elapsed if elapsed else 0.0,
+        "agreement":  agree / n,
+        "exact":      exact / n,
+        "changed":    len(changed),
+        "incomplete": incomplete,
+        "recovered":  recovered,
+        "timings": {
+            "replay":  _stage_summary([d["timings"] for d in scored]),
+            "archived": _stage_summary([recs[d["id"]].get("timings", {}) for d in scored]),
+        },
+    }
+    if labelled:
+        report["accuracy"] = {
+            "labelled":  labelled,
+            "after":     correct / labelled,
+            "before":    before_correct / labelled,
+            "false_pos": false_pos,
+            "false_neg": false_neg,
+        }
+    if diff:
+        report["diff"] = changed[:diff]
+        report["error_samples"] = errors[:diff]
+    return report
+
+# ────────────────────────────────────────────── entry
+def _print_report(r: Dict[str, Any]):
+    print(f"turns {r['turns']}  errors {r['errors']}  "
+          f"{r['elapsed']:.1f}s ({r['turns_per_sec']:.1f} turns/s)")
+    print(f"기존 판정 일치 {r['agreement']:.1%}  (점수까지 {r['exact']:.1%}), 바뀐 턴 {r['changed']}")
+    if r["incomplete"]:
+        print(f"시간 초과·오류 턴 {r['incomplete']}  (다시 판정하면 키워드 일치 {r['recovered']})")
+    if "accuracy" in r:
+        a = r["accuracy"]
+        print(f"정확도 {a['before']:.1%} → {a['after']:.1%}  "
+              f"(라벨 {a['labelled']}, 오탐 {a['false_pos']}, 미탐 {a['false_neg']})")
+    print(f"{'stage':<8} {'replay p50':>11} {'p95':>9} {'live p50':>10} {'p95':>9}")
+    for stage in STAGES:
+        rp = r["timings"]["replay"].get(stage, {})
+        lv = r["timings"]["archived"].get(stage, {})
+        if rp or lv:
+            print(f"{stage:<8} {rp.get('p50', 0) * 1000:>9.1f}ms {rp.get('p95', 0) * 1000:>7.1f}ms"
+                  f" {lv.get('p50', 0) * 1000:>8.1f}ms {lv.get('p95', 0) * 1000:>7.1f}ms")
+    for c in r.get("diff", []):
+        b, a = c["before"], c["after"]
+        print(f"- {c['id']} [{c['keyword']}] {b.get('title')}/{b.get('score')} → {a.get('title')}/{a.get('score')}")
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="아카이브된 턴 일괄 재채점")
+    p.add_argument("archive", help="TURN_ARCHIVE_DIR 경로")
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--batch",   type=int, default=32, help="프로세스에 한 번에 넘길 턴 수")
+    p.add_argument("--limit",   type=int, default=None)
+    p.add_argument("--since",   default=None, help="YYYYMMDD 이후 세그먼트만")
+    p.add_argument("--labels",  default=None, help="정답 라벨 jsonl")
+    p.add_argument("--diff",    type=int, default=10, help="판정이 바뀐 턴 표본 수")
+    p.add_argument("--json",    default=None, help="전체 보고서를 JSON 으로 저장")
+    return p.parse_args()
+
+if __name__ == "__main__":
+    args = _parse_args()
+    report = replay(
+        args.archive,
+        workers=args.workers,
+        batch=args.batch,
+        limit=args.limit,
+        since=args.since,
+        labels=_load_labels(args.labels),
+        diff=args.diff,
+    )
+    _print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
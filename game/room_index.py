@@ -0,0 +1,124 @@
+"""room_index.py – 방 페이즈 색인 (관리 API 용)
+
+``rooms`` 를 매번 훑지 않고도 페이즈별 방 수·목록을 돌려주도록, 방이 생기고 페이즈가 바뀌고 사라질 때마다 갱신한다.
+
+* ``waiting``  : 대기실 (join_room 으로 생성)
+* ``resuming`` : 재시작 후 스냅샷에서 복구, 재접속 대기
+* ``intro`` · ``keyword`` · ``record`` · ``listen`` · ``result`` : ``enter_phase`` 로 기록
+* ``finished`` : 최종 결과까지 나간 방
+
+색인은 방 id·페이즈만 가진다. 마감 시각·인원 등은 페이지에 담긴 방만 ``rooms`` 에서 읽는다.
+
+페이지는 커서로 넘긴다. 방이 목록(전체 또는 페이즈)에 들어올 때마다 늘어나는 순번을 붙여 append 만 하므로
+순번 목록은 늘 정렬돼 있고, 커서(마지막으로 받은 순번) 다음 위치는 ``bisect`` 로 찾는다 → 페이지 비용은 offset 과 무관.
+빠진 방은 자리만 비워 두고 (빈 자리가 절반을 넘으면 압축) 건너뛴다.
+"""
+from __future__ import annotations
+
+import itertools
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+class _Ordered:
+    """들어온 순서대로 room_id 를 두는 목록 – append · 삭제 O(1), 커서 이후 페이지 O(log n + limit + 사이의 빈 자리)"""
+
+    __slots__ = ("seqs", "ids", "pos", "dead")
+
+    def __init__(self):
+        self.seqs: List[int] = []
+        self.ids: List[Optional[str]] = []
+        self.pos: Dict[str, int] = {}
+        self.dead = 0
+
+    def __len__(self) -> int:
+        return len(self.pos)
+
+    def add(self, room_id: str, seq: int):
+        self.pos[room_id] = len(self.ids)
+        self.seqs.append(seq)
+        self.ids.append(room_id)
+
+    def discard(self, room_id: str):
+        i = self.pos.pop(room_id, None)
+        if i is None:
+            return
+        self.ids[i] = None
+        self.dead += 1
+        if self.dead > 32 and self.dead * 2 > len(self.ids):
+            self._compact()
+
+    def _compact(self):
+        live = [(s, r) for s, r in zip(self.seqs, self.ids) if r is not None]
+        self.seqs = [s for s, _ in live]
+        self.ids  = [r for _, r in live]
+        self.pos  = {r: i for i, r in enumerate(self.ids)}
+        self.dead = 0
+
+    def after(self, cursor: Optional[int], limit: int) -> Tuple[List[str], Optional[int]]:
+        """(room_id 목록, 다음 커서) – 페이지가 덜 찼으면 다음 커서는 None (마지막 페이지)"""
+        i = 0 if cursor is None else bisect_right(self.seqs, cursor)
+        out: List[str] = []
+        last = None
+        n = len(self.ids)
+        while i < n and len(out) < limit:
+            room_id = self.ids[i]
+            if room_id is not None:
+                out.append(room_id)
+                last = self.seqs[i]
+            i += 1
+        return out, (last if len(out) == limit else None)
+
+class RoomIndex:
+    def __init__(self):
+        self._phase: Dict[str, str] = {}                        # room_id → phase
+        self._all = _Ordered()                                  # 생성 순서
+        self._by_phase: Dict[str, _Ordered] = {}                # phase → 페이즈에 들어온 순서
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._phase)
+
+    def set_phase(self, room_id: str, phase: str):
+        old = self._phase.get(room_id)
+        if old == phase:
+            return
+        if old is None:
+            self._all.add(room_id, next(self._seq))
+        else:
+            self._discard(old, room_id)
+        self._phase[room_id] = phase
+        bucket = self._by_phase.get(phase)
+        if bucket is None:
+            bucket = self._by_phase[phase] = _Ordered()
+        bucket.add(room_id, next(self._seq))
+
+    def remove(self, room_id: str):
+        old = self._phase.pop(room_id, None)
+        if old is not None:
+            self._all.discard(room_id)
+            self._discard(old, room_id)
+
+    def _discard(self, phase: str, room_id: str):
+        bucket = self._by_phase.get(phase)
+        if bucket is not None:
+            bucket.discard(room_id)
+            if not bucket:
+                del self._by_phase[phase]
+
+    def phase_of(self, room_id: str) -> Optional[str]:
+        return self._phase.get(room_id)
+
+    def counts(self) -> Dict[str, int]:
+        return {phase: len(ids) for phase, ids in self._by_phase.items()}
+
+    def page(
+        self, phase: Optional[str] = None, cursor: Optional[int] = None, limit: int = 50
+    ) -> Tuple[int, List[str], Optional[int]]:
+        """(전체 개수, room_id 목록, 다음 커서) – ``phase`` 를 주면 그 페이즈의 방만"""
+        ordered = self._all if phase is None else self._by_phase.get(phase)
+        if ordered is None:
+            return 0, [], None
+        ids, next_cursor = ordered.after(cursor, limit)
+        return len(ordered), ids, next_cursor
+
+room_index = RoomIndex()
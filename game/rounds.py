@@ -1,23 +1,80 @@
 from main import sio, rooms, round_buffer, round_events
+from utils import broadcast_room_update
+from game.snapshots import snapshotter
+from game import phases, speculative
+from game.room_index import room_index
+from game.shards import shard_router
 import asyncio
+import os
+import time
 
 TURN_TIMEOUT = 12   # 녹음 제출 대기
 LISTEN_LEN   = 10
 RECORD_LEN   = 10
 KW_LEN       = 9
+RESULT_LEN   = 6    # 결과 표시 대기
+INTRO_LEN    = 11   # 게임 인트로
 
-async def run_rounds(room_id: str):
+# 분석이 제때 끝나지 않았을 때 플레이어에게 나가는 판정
+FAILED_RESULT = {"matched": False, "title": None, "artist": None, "score": 0, "image": None}
+ANALYSIS_TIMEOUT_MSG = "analysis timeout"
+
+RESUME_GRACE = float(os.getenv("RESUME_GRACE_SEC", "20"))   # 재시작 후 재접속 대기
+PREFETCH_TIMEOUT = float(os.getenv("PREFETCH_TIMEOUT_SEC", "8"))  # 다음 턴 준비 최대 (샤드가 멈춰도 태스크가 쌓이지 않게)
+
+def enter_phase(room_id: str, phase: str, length: float):
+    """페이즈·마감 시각 기록 + 스냅샷 (바뀐 조각만 기록되므로 매 전환마다 호출해도 싸다)"""
+    room = rooms.get(room_id)
+    if not room:
+        return
+    room["phase"]    = phase
+    room["deadline"] = time.time() + length
+    room_index.set_phase(room_id, phase)
+    snapshotter.snapshot(room_id, room)
+
+def turn_seed(room: dict) -> str:
+    """턴마다 고정 시드: 같은 방 시드 + 같은 키워드 순번이면 같은 보정 점수"""
+    return f"{room.get('seed')}:{room.get('kw_idx')}"
+
+_prefetch_tasks: dict[str, asyncio.Task] = {}
+
+async def _prefetch_turn(room_id: str):
+    """다음 턴 키워드의 매처·외부 커넥션·디코딩 스레드를 미리 준비"""
+    try:
+        room = rooms.get(room_id)
+        if not room or room["kw_idx"] >= len(room["keywords"]):
+            return                               # 마지막 턴 → 준비할 키워드 없음 (finally 에서 정리)
+        keyword = room["keywords"][room["kw_idx"]]
+        if shard_router.enabled:                 # 분석을 맡을 샤드에서 커넥션·디코더 예열
+            await asyncio.wait_for(shard_router.prepare(room_id, keyword), PREFETCH_TIMEOUT)
+        else:
+            from game.analysis import prepare_turn   # 무거운 모듈은 첫 사용 시 import
+            await asyncio.wait_for(prepare_turn(keyword), PREFETCH_TIMEOUT)
+    except asyncio.TimeoutError:
+        print(f"⚠️ prefetch 시간 초과 ({room_id}, {PREFETCH_TIMEOUT}s)")
+    except Exception as e:
+        print(f"⚠️ prefetch 실패 ({room_id}): {e!r}")
+    finally:
+        _prefetch_tasks.pop(room_id, None)
+
+def schedule_prefetch(room_id: str):
+    """이전 준비가 끝나지 않았으면 겹쳐서 띄우지 않는다"""
+    if room_id not in _prefetch_tasks:
+        _prefetch_tasks[room_id] = asyncio.create_task(_prefetch_turn(room_id))
+
+async def run_rounds(room_id: str, start_round: int = 1, start_turn: int = 0):
     room = rooms.get(room_id)
     if not room: return
 
     max_rounds = room["max_rounds"]
 
-    for rnd in range(1, max_rounds + 1):
+    for rnd in range(start_round, max_rounds + 1):
         room["round"] = rnd
 
-        turn_idx = 0
+        turn_idx = start_turn if rnd == start_round else 0
         while turn_idx < len(room["order"]):
             sid_turn = room["order"][turn_idx]
+            room["turn"] = turn_idx
 
             # 탈주자면 즉시 skip
             if sid_turn not in room["users"]:
@@ -30,11 +87,10 @@ async def run_rounds(room_id: str):
 
             keyword = room["keywords"][room["kw_idx"]]
             room["kw_idx"] += 1
+            schedule_prefetch(room_id)                 # 이번 턴 동안 다음 키워드 준비
             nick = room["users"][sid_turn]["nickname"]
 
-            key_kw = f"{room_id}:{sid_turn}:{turn_idx}:kw"
-            kw_event = asyncio.Event()
-            round_events[key_kw] = kw_event            # leave_room()에서 set 가능
+            enter_phase(room_id, "keyword", KW_LEN)
             await sio.emit(
                 "keyword_phase",
                 {
@@ -46,12 +102,9 @@ async def run_rounds(room_id: str):
                 },
                 room=room_id,
             )
-            try:
-                await asyncio.wait_for(kw_event.wait(), timeout=KW_LEN)
-            except asyncio.TimeoutError:
-                pass                                   # 8초 정상 경과
-            finally:
-                round_events.pop(key_kw, None)         # 정리
+            # 차례인 플레이어의 keyword_ready, 중도 탈주(leave_room), KW_LEN 경과 중 먼저
+            waited = await phases.hold(room_id, "keyword", KW_LEN, {sid_turn})
+            phases.record_saved("keyword", KW_LEN - waited)
 
             if sid_turn not in room["users"]:
                 continue
@@ -60,7 +113,9 @@ async def run_rounds(room_id: str):
             key   = f"{room_id}:{sid_turn}:{turn_idx}"
             event = asyncio.Event()
             round_events[key] = event
+            speculative.open_turn(key, room_id, sid_turn, keyword, turn_seed(room))   # recording_chunk 수신 준비
 
+            enter_phase(room_id, "record", RECORD_LEN + 2)
             await sio.emit("record_begin",
                            {"playerSid": sid_turn, "turn": turn_idx},
                            room=room_id)
@@ -70,8 +125,10 @@ async def run_rounds(room_id: str):
                 await asyncio.wait_for(event.wait(), timeout=RECORD_LEN + 2)
             except asyncio.TimeoutError:
                 pass    # 그냥 넘어가면 아래에서 buf가 없어서 skip 처리됨
+            round_events.pop(key, None)     # 끝난 턴의 Event 는 남겨 두지 않는다
 
             buf = round_buffer.pop(key, None)
+            speculative.drop(key)           # 제출됐으면 이미 넘겨받았고, 아니면 앞부분 분석 취소
             if not buf:
                 # 제출이 없었거나 탈주 → skip
                 if sid_turn in room["users"]:
@@ -82,6 +139,7 @@ async def run_rounds(room_id: str):
             audio_b64       = buf["audio_b64"]
 
             # 4) listen phase
+            enter_phase(room_id, "listen", LISTEN_LEN)
             await sio.emit(
                 "listen_phase",
                 {
@@ -91,38 +149,136 @@ async def run_rounds(room_id: str):
                 },
                 room=room_id,
             )
-            await asyncio.sleep(LISTEN_LEN)
+            # 모두 재생을 끝냈으면(playback_finished) LISTEN_LEN 전이라도 결과로
+            listen_t0 = time.monotonic()
+            await phases.hold(room_id, "listen", LISTEN_LEN, room["users"].keys())
 
             # 5) 분석 결과 전송
             try:
                 result = await asyncio.wait_for(
-                    analysis_future,
+                    asyncio.shield(analysis_future),   # wait_for 가 이유 없이 취소하지 않게 → 아래에서 직접 취소
                     timeout=LISTEN_LEN + 0.5,   # 10.5 s 내 미도착 → 실패 처리
                 )
             except asyncio.TimeoutError:
-                analysis_future.cancel()
-                result = {
-                    "matched": False,
-                    "title":   None,
-                    "artist":  None,
-                    "score":   0,
-                    "image":   None,
-                }
+                analysis_future.cancel(ANALYSIS_TIMEOUT_MSG)   # submit 쪽에서 timeout 으로 아카이브
+                result = dict(FAILED_RESULT)
+            except Exception as e:
+                # 샤드 안 예외(ShardError)·분석 예외 → 게임은 계속, 이번 턴만 점수 없이
+                print(f"⚠️ 분석 실패 ({room_id}): {e!r}")
+                result = dict(FAILED_RESULT)
+            # 고정 sleep 이었다면 max(LISTEN_LEN, 분석 완료) 시점에 결과가 나갔다
+            listen_took = time.monotonic() - listen_t0
+            phases.record_saved("listen", max(LISTEN_LEN, listen_took) - listen_took)
             if sid_turn in room["scores"]:
                 room["scores"][sid_turn] += result.get("score", 0)
-        
+
+            enter_phase(room_id, "result", RESULT_LEN)
             await sio.emit("round_result",
                            {**result, "playerNick": nick, "playerSid": sid_turn},
                            room=room_id)
-            await asyncio.sleep(6)          # result 표시 대기
+            waited = await phases.hold(room_id, "result", RESULT_LEN, room["users"].keys())   # result 표시 대기
+            phases.record_saved("result", RESULT_LEN - waited)
             turn_idx += 1                   # 정상 완료 → 인덱스 증가
         
         # while end
     # for rnd
 
     # 6) 최종 결과 (남아 있는 인원만 표시)
+    if rooms.get(room_id) is not room:
+        return          # 모두 나가 leave_room 이 방·색인 항목을 지웠다 → 다시 넣지 않는다
     final_scores = [
         {"nickname": u["nickname"], "score": room["scores"][sid]}
         for sid, u in room["users"].items()
     ]
-    await sio.emit("game_result", {"scores": final_scores}, room=room_id)
\ No newline at end of file
+    await sio.emit("game_result", {"scores": final_scores}, room=room_id)
+    room["phase"] = "finished"
+    room_index.set_phase(room_id, "finished")
+    room.pop("roster", None)
+    snapshotter.forget(room_id)
+
+# ────────────────────────────── 재시작 후 이어하기
+_resume_tasks: dict[str, asyncio.Task] = {}
+
+def restore_rooms() -> list[str]:
+    """부팅 시 스냅샷으로 방을 되살리고, 재접속을 기다렸다가 이어서 진행한다."""
+    restored = []
+    for room_id, snap in snapshotter.load().items():
+        if room_id in rooms:
+            continue
+        roster = {
+            uid: {**snap["players"].get(uid, {}), "score": snap["scores"].get(uid, 0)}
+            for uid in snap["order"]
+        }
+        rooms[room_id] = {
+            "users": {}, "order": [], "host": None, "state": "resuming",
+            "round":      snap.get("round") or 1,
+            "turn":       snap.get("turn") or 0,
+            "max_rounds": snap["max_rounds"],
+            "scores":     {},
+            "keywords":   snap["keywords"],
+            "kw_idx":     snap.get("kw_idx") or 0,
+            "seed":       snap.get("seed"),
+            "phase":      snap.get("phase"),
+            "deadline":   snap.get("deadline"),
+            "roster":     roster,                      # 아직 재접속하지 않은 플레이어 (userId 기준)
+            "resume":     {"order": snap["order"], "host": snap.get("host")},
+        }
+        room_index.set_phase(room_id, "resuming")
+        _resume_tasks[room_id] = asyncio.create_task(resume_room(room_id))
+        restored.append(room_id)
+    if restored:
+        print(f"♻️ 스냅샷에서 방 {len(restored)}개 복구")
+    return restored
+
+def background_tasks() -> dict:
+    """관리 API 용 – 진행 중인 사전 준비·재개 태스크 수"""
+    return {"prefetch": len(_prefetch_tasks), "resume": len(_resume_tasks)}
+
+async def resume_room(room_id: str):
+    room = rooms.get(room_id)
+    if not room:
+        return
+    try:
+        # 모두 돌아오거나 유예 시간이 끝날 때까지 대기
+        until = time.monotonic() + RESUME_GRACE
+        while room["roster"] and time.monotonic() < until:
+            await asyncio.sleep(0.5)
+
+        if not room["users"]:
+            rooms.pop(room_id, None)
+            room_index.remove(room_id)
+            snapshotter.forget(room_id)
+            return
+
+        snap_order = room["resume"]["order"]
+        sid_of = {u["id"]: sid for sid, u in room["users"].items()}
+        room["order"] = [sid_of[uid] for uid in snap_order if uid in sid_of]
+        room["host"]  = sid_of.get(room["resume"]["host"]) or room["host"] or room["order"][0]
+
+        # 재개 위치: 녹음은 저장하지 않으므로 진행 중이던 턴은 keyword 페이즈부터 다시,
+        # 결과까지 나간 턴은 다음 턴부터
+        rnd, turn, phase = room["round"], room["turn"], room["phase"]
+        if phase in ("keyword", "record", "listen"):
+            room["kw_idx"] = max(0, room["kw_idx"] - 1)
+        elif phase == "result":
+            turn += 1
+        elif phase == "intro":
+            rnd, turn = 1, 0
+
+        start_turn = len(room["order"])
+        for uid in snap_order[turn:]:
+            if uid in sid_of:
+                start_turn = room["order"].index(sid_of[uid])
+                break
+        if start_turn >= len(room["order"]):
+            rnd, start_turn = rnd + 1, 0
+
+        room["state"] = "playing"
+        room.pop("resume", None)
+        await broadcast_room_update(room_id)
+        await sio.emit("game_resumed",
+                       {"round": rnd, "maxRounds": room["max_rounds"]},
+                       room=room_id)
+        await run_rounds(room_id, start_round=rnd, start_turn=start_turn)
+    finally:
+        _resume_tasks.pop(room_id, None)
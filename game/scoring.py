@@ -0,0 +1,133 @@
+"""scoring.py – 키워드 매칭 + 후보 일괄 채점
+
+* ACR 허밍 후보 전체, Serper 검색 후보 전체를 한 번에 평가한다.
+* 가사-제목/가수 유사도는 rapidfuzz ``process.cdist`` (C 구현)로 한 번에 계산한다.
+* 보정 점수(1~5점)는 방마다 시드를 가진 ``random.Random`` 에서 뽑아 리플레이·벤치마크에서 재현된다.
+"""
+from __future__ import annotations
+
+import random
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from rapidfuzz import fuzz, process
+
+_PAREN_RE = re.compile(r"[()\[\]]")
+_SPLIT_RE = re.compile(r',|&|/|feat\.?|with')
+
+def _normalize_artist(s: str) -> str:
+    s = _PAREN_RE.sub("", s.lower())                                   # 괄호 제거
+    return _SPLIT_RE.split(s)[0].strip()
+
+class KeywordMatcher:
+    """keyword 하나에 대한 비교용 문자열을 미리 만들어 두고 (title, artist) 후보를 판정."""
+
+    __slots__ = ("type", "name", "name_lower", "name_norm", "aliases_lower")
+
+    def __init__(self, keyword: Dict[str, Any]):
+        raw_alias = keyword.get("alias", [])
+        if isinstance(raw_alias, str):                 # "a|b|c" 형태
+            raw_alias = raw_alias.split("|") if raw_alias else []
+
+        self.type          = keyword.get("type")
+        self.name          = keyword.get("name", "")
+        self.name_lower    = self.name.lower()
+        self.name_norm     = _normalize_artist(self.name)
+        self.aliases_lower = tuple(a.lower() for a in raw_alias if a)
+
+    def match(self, title: str, artist: str) -> bool:
+        if self.type == "제목":
+            return self.name_lower in title.lower()
+
+        artist_lower = artist.lower()
+        if artist_lower == self.name_lower:
+            return True
+        if _normalize_artist(artist) == self.name_norm:
+            return True
+        return any(a in artist_lower for a in self.aliases_lower)
+
+    def match_many(self, candidates: Sequence[Tuple[str, str]]) -> List[bool]:
+        return [self.match(t, a) for t, a in candidates]
+
+@lru_cache(maxsize=1024)
+def _cached_matcher(ktype: Any, name: str, aliases: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher({"type": ktype, "name": name, "alias": list(aliases)})
+
+def matcher_for(keyword: Dict[str, Any]) -> KeywordMatcher:
+    """keyword 별 KeywordMatcher 캐시 (다음 턴 키워드는 미리 만들어 둔다)."""
+    raw_alias = keyword.get("alias", [])
+    if isinstance(raw_alias, str):
+        raw_alias = raw_alias.split("|") if raw_alias else []
+    return _cached_matcher(keyword.get("type"), keyword.get("name", ""), tuple(raw_alias))
+
+class ScoreEngine:
+    """시드 고정 RNG + 후보 일괄 채점기."""
+
+    def __init__(self, seed: Any = None):
+        self.rng = random.Random(seed)
+
+    def _bonus(self) -> int:
+        return self.rng.randint(1, 5)
+
+    def score_acr(self, sim: float) -> int:
+        """ACRCloud: 80점 기본 + 유사도(0~1) × 15 → 80~95점 + 랜덤 보정 1~5점 → 최종 81~100점"""
+        base = max(80, min(95, 80 + int(round(sim * 15))))
+        return min(base + self._bonus(), 100)
+
+    def score_stt(self, sim: float) -> int:
+        """STT·Serper: 60점 기본 + 종합점수(0~1) × 15 → 60~75점 + 랜덤 보정 1~5점 → 최종 61~80점"""
+        base = max(60, min(75, 60 + int(round(sim * 15))))
+        return min(base + self._bonus(), 80)
+
+    # ───────────────────────────── ACR
+    def best_acr(self, matcher: KeywordMatcher, hum_tracks: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """키워드와 맞는 허밍 후보 중 ACR score 가 가장 높은 것 (없으면 None)."""
+        best, best_sim = None, -1.0
+        for trk in hum_tracks:
+            title  = trk.get("title", "")
+            artist = (trk.get("artists") or [{}])[0].get("name", "")
+            if not matcher.match(title, artist):
+                continue
+            sim = float(trk.get("score", 0) or 0)
+            if sim > best_sim:
+                best, best_sim = (title, artist), sim
+        if best is None:
+            return None
+        return {"title": best[0], "artist": best[1], "sim": best_sim, "score": self.score_acr(best_sim)}
+
+    # ───────────────────────────── STT·Serper
+    def best_stt(
+        self,
+        matcher: KeywordMatcher,
+        lyrics: str,
+        candidates: List[Tuple[str, str]],
+    ) -> Optional[Dict[str, Any]]:
+        """키워드와 맞는 Serper 후보 전체를 가사와 비교해 종합 유사도가 가장 높은 것."""
+        matched = [c for c, ok in zip(candidates, matcher.match_many(candidates)) if ok]
+        if not matched:
+            return None
+
+        lyrics_lower = lyrics.lower() if lyrics else ""
+        if lyrics_lower:
+            # [title_1..title_n, artist_1..artist_n] 을 한 번에 비교 → (1, 2n) 행렬
+            choices = [t.lower() for t, _ in matched] + [a.lower() for _, a in matched]
+            row = process.cdist([lyrics_lower], choices, scorer=fuzz.ratio, workers=1)[0] / 100.0
+            n = len(matched)
+            sim_titles, sim_artists = row[:n], row[n:]
+        else:
+            sim_titles = sim_artists = [0.0] * len(matched)
+
+        best = None
+        for (title, artist), s_t, s_a in zip(matched, sim_titles, sim_artists):
+            title_in  = bool(lyrics_lower) and title.lower() in lyrics_lower
+            artist_in = bool(lyrics_lower) and artist.lower() in lyrics_lower
+            sim = 0.2 * title_in + 0.2 * artist_in + 0.6 * (0.5 * float(s_t) + 0.5 * float(s_a))
+            if best is None or sim > best["sim"]:
+                best = {
+                    "title": title, "artist": artist, "sim": sim,
+                    "title_in": title_in, "artist_in": artist_in,
+                    "sim_title": float(s_t), "sim_artist": float(s_a),
+                }
+        best["score"] = self.score_stt(best["sim"])
+        return best
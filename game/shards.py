@@ -0,0 +1,286 @@
+"""shards.py – 방 단위 CPU 작업 샤딩 (분석 워커 프로세스)
+
+Socket.IO 서버(``sio``)와 ``rooms`` 상태는 메인 프로세스의 이벤트 루프 하나에 그대로 두고,
+방에서 생기는 무거운 작업만 ``crc32(room_id) % ANALYSIS_SHARDS`` 로 정한 워커 프로세스에 보낸다.
+
+* ``convert`` : 재생용 16 kHz WAV 변환
+* ``analyze`` : 디코딩·VAD·리샘플 + 외부 API 분석 (``game.analysis.analyze_recording``)
+* ``prepare`` : 다음 턴 사전 준비 (커넥션 예열은 실제로 API 를 부를 샤드에서 해야 의미가 있다)
+* ``stats``   : 샤드 안에서 진행 중인 외부 API 호출 수 (관리 API)
+
+샤드마다 이벤트 루프를 계속 돌리는 프로세스 하나를 띄우고 Pipe 로 ``(job_id, kind, payload)`` 를 주고받는다.
+한 샤드 안에서도 작업은 동시에 진행되며 (외부 API 대기 중 다른 방의 작업 처리),
+무거운 방 하나가 CPU 를 쓰더라도 다른 샤드의 방·메인 루프의 emit·타이머에는 영향이 없다.
+
+샤드 프로세스가 죽으면 대기 중인 작업은 ``ShardDown`` 으로 끝나고 다음 작업 때 다시 띄운다.
+``ANALYSIS_SHARDS=0`` (기본) 이면 예전처럼 메인 프로세스에서 처리한다.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import multiprocessing as mp
+import os
+import sys
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+from monitoring.metrics import counter, gauge, histogram
+
+ANALYSIS_SHARDS = int(os.getenv("ANALYSIS_SHARDS", "0"))
+
+SHARD_INFLIGHT = gauge("shard_inflight", "샤드별 처리 중인 작업 수")
+SHARD_JOBS     = counter("shard_jobs_total", "샤드별 처리한 작업 수")
+SHARD_ERRORS   = counter("shard_errors_total", "샤드에서 실패한 작업 수")
+SHARD_RESTARTS = counter("shard_restarts_total", "죽어서 다시 띄운 샤드 수")
+SHARD_SECONDS  = histogram("shard_job_seconds", "샤드 작업 실행 시간")
+SHARD_IPC      = histogram("shard_ipc_seconds", "샤드 왕복 오버헤드 (전송·대기)",
+                           buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25))
+
+class ShardError(RuntimeError):
+    """샤드 안에서 작업이 예외로 끝남"""
+
+class ShardDown(ShardError):
+    """샤드 프로세스가 죽어서 결과를 받을 수 없음 (호출 측에서 로컬 처리로 대체 가능)"""
+
+def shard_of(room_id: str, n: int) -> int:
+    return zlib.crc32(room_id.encode()) % n
+
+# ────────────────────────────────────────────── 워커 프로세스 쪽
+async def _handle(kind: str, payload: tuple) -> Any:
+    if kind == "analyze":
+        from game.analysis import analyze_recording
+        raw, keyword, kw, want_trace = payload
+        trace: Dict[str, Any] = {}
+        result = await analyze_recording(raw, keyword, trace=trace, **kw)
+        return result, (trace if want_trace else None)
+    if kind == "convert":
+        from audio_utils import convert_format_async
+        raw, kw = payload
+        return await convert_format_async(raw, **kw)
+    if kind == "prepare":
+        from game.analysis import prepare_turn
+        (keyword,) = payload
+        return await prepare_turn(keyword)
+    if kind == "stats":
+        analysis = sys.modules.get("game.analysis")
+        return analysis.provider_inflight() if analysis else {}
+    raise ValueError(f"unknown shard job: {kind}")
+
+async def _warm():
+    """librosa·analysis import 와 디코딩 스레드를 미리 (첫 턴이 import 를 기다리지 않도록)"""
+    from game.analysis import warm_decoders
+    await warm_decoders()
+
+def _worker_main(idx: int, conn):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    send_lock = threading.Lock()
+
+    def reply(msg):
+        with send_lock:
+            conn.send(msg)
+
+    async def run(job_id: int, kind: str, payload: tuple):
+        t0 = time.perf_counter()
+        try:
+            msg = (job_id, True, await _handle(kind, payload), time.perf_counter() - t0)
+        except Exception as e:
+            msg = (job_id, False, f"{type(e).__name__}: {e}", time.perf_counter() - t0)
+        await loop.run_in_executor(None, reply, msg)     # WAV 처럼 큰 결과를 보내는 동안 루프를 막지 않도록
+
+    def reader():
+        while True:
+            try:
+                msg = conn.recv()
+            except (EOFError, OSError):                  # 메인 프로세스가 사라짐
+                msg = None
+            if msg is None:
+                loop.call_soon_threadsafe(loop.stop)
+                return
+            loop.call_soon_threadsafe(lambda m=msg: loop.create_task(run(*m)))
+
+    threading.Thread(target=reader, name=f"shard-{idx}-reader", daemon=True).start()
+    loop.create_task(_warm())
+    loop.run_forever()
+
+# ────────────────────────────────────────────── 메인 프로세스 쪽
+class Shard:
+    def __init__(self, idx: int):
+        self.idx      = idx
+        self.label    = str(idx)
+        self.proc     = None
+        self.conn     = None
+        self.inflight = 0
+        self.jobs     = 0
+        self.restarts = 0
+        self._ids     = itertools.count()
+        self._pending: Dict[int, tuple] = {}
+        self._send_lock = threading.Lock()
+
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.is_alive()
+
+    def start(self):
+        ctx = mp.get_context("spawn")        # 부모의 루프·스레드·소켓을 물려받지 않도록
+        parent, child = ctx.Pipe()
+        self.proc = ctx.Process(target=_worker_main, args=(self.idx, child), name=f"shard-{self.idx}", daemon=True)
+        self.proc.start()
+        child.close()
+        self.conn = parent
+        self._pending = {}
+        threading.Thread(
+            target=self._reader, args=(parent, self._pending), name=f"shard-{self.idx}-reader", daemon=True
+        ).start()
+
+    def stop(self):
+        if self.conn is not None:
+            try:
+                with self._send_lock:
+                    self.conn.send(None)
+            except OSError:
+                pass
+        if self.proc is not None:
+            self.proc.join(timeout=3)
+            if self.proc.is_alive():
+                self.proc.terminate()
+        self.proc = self.conn = None
+
+    def _reader(self, conn, pending: Dict[int, tuple]):
+        while True:
+            try:
+                job_id, ok, out, took = conn.recv()
+            except (EOFError, OSError):
+                break
+            entry = pending.pop(job_id, None)
+            if entry:
+                loop, fut = entry
+                loop.call_soon_threadsafe(_resolve, fut, ok, out, took)
+        # 프로세스 종료 → 남은 작업 실패 처리
+        for loop, fut in pending.values():
+            loop.call_soon_threadsafe(_fail, fut, ShardDown(f"shard {self.idx} exited"))
+        pending.clear()
+
+    def _send(self, msg):
+        with self._send_lock:
+            self.conn.send(msg)
+
+    async def call(self, kind: str, payload: tuple, *, control: bool = False) -> Any:
+        """``control`` 작업(관리 API 의 stats 등)은 작업 수·inflight·소요 시간 지표에 넣지 않는다"""
+        if not self.alive:
+            if self.proc is not None:
+                self.restarts += 1
+                SHARD_RESTARTS.inc(shard=self.label)
+                print(f"♻️ shard {self.idx} 재시작")
+            self.start()
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        job_id = next(self._ids)
+        self._pending[job_id] = (loop, fut)
+
+        if not control:
+            self.inflight += 1
+            SHARD_INFLIGHT.inc(shard=self.label)
+        t0 = time.perf_counter()
+        try:
+            try:
+                await loop.run_in_executor(None, self._send, (job_id, kind, payload))
+            except (OSError, ValueError) as e:
+                self._pending.pop(job_id, None)
+                if fut.done() and not fut.cancelled():
+                    fut.exception()                  # reader 가 먼저 실패 처리한 경우 (경고 방지)
+                else:
+                    fut.cancel()
+                raise ShardDown(f"shard {self.idx}: {e}") from e
+            out, took = await fut
+            if not control:
+                SHARD_SECONDS.observe(took, shard=self.label, kind=kind)
+                SHARD_IPC.observe(max(0.0, time.perf_counter() - t0 - took), shard=self.label)
+            return out
+        except ShardError:
+            SHARD_ERRORS.inc(shard=self.label, kind=kind)
+            raise
+        finally:
+            if not control:
+                self.inflight -= 1
+                self.jobs += 1
+                SHARD_INFLIGHT.dec(shard=self.label)
+                SHARD_JOBS.inc(shard=self.label, kind=kind)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "shard":    self.idx,
+            "pid":      self.proc.pid if self.proc else None,
+            "alive":    self.alive,
+            "inflight": self.inflight,
+            "jobs":     self.jobs,
+            "restarts": self.restarts,
+        }
+
+def _resolve(fut: asyncio.Future, ok: bool, out: Any, took: float):
+    if fut.done():                           # 호출 측이 이미 취소 (분석 타임아웃 등)
+        return
+    if ok:
+        fut.set_result((out, took))
+    else:
+        fut.set_exception(ShardError(out))
+
+def _fail(fut: asyncio.Future, exc: Exception):
+    if not fut.done():
+        fut.set_exception(exc)
+
+class ShardRouter:
+    """room_id → 샤드. 같은 방의 작업은 항상 같은 샤드로 간다."""
+
+    def __init__(self, n: int):
+        self.shards = [Shard(i) for i in range(max(0, n))]
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.shards)
+
+    def start(self):
+        for s in self.shards:
+            if not s.alive:
+                s.start()
+
+    def stop(self):
+        for s in self.shards:
+            s.stop()
+
+    def for_room(self, room_id: str) -> Shard:
+        return self.shards[shard_of(room_id, len(self.shards))]
+
+    async def analyze(
+        self, room_id: str, raw: bytes, keyword: dict, *, trace: Optional[dict] = None, **kw
+    ) -> dict:
+        result, tr = await self.for_room(room_id).call("analyze", (raw, keyword, kw, trace is not None))
+        if trace is not None and tr:
+            trace.update(tr)
+        return result
+
+    async def convert(self, room_id: str, raw: bytes, **kw) -> bytes:
+        return await self.for_room(room_id).call("convert", (raw, kw))
+
+    async def prepare(self, room_id: str, keyword: dict):
+        return await self.for_room(room_id).call("prepare", (keyword,))
+
+    async def provider_inflight(self, timeout: float = 1.0) -> Dict[str, Dict[str, int]]:
+        """살아 있는 샤드별 진행 중인 외부 API 호출 수 (죽은 샤드는 다시 띄우지 않고 건너뜀)"""
+        alive = [s for s in self.shards if s.alive]
+        results = await asyncio.gather(
+            *(asyncio.wait_for(s.call("stats", (), control=True), timeout) for s in alive), return_exceptions=True
+        )
+        return {s.label: r for s, r in zip(alive, results) if isinstance(r, dict)}
+
+    def status(self, room_ids=()) -> Dict[str, Any]:
+        per_shard = [dict(s.status(), rooms=0) for s in self.shards]
+        for room_id in room_ids:
+            st = per_shard[shard_of(room_id, len(self.shards))]
+            st["rooms"] += 1
+        return {"enabled": self.enabled, "shards": per_shard}
+
+shard_router = ShardRouter(ANALYSIS_SHARDS)
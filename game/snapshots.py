@@ -0,0 +1,208 @@
+"""snapshots.py – 진행 중인 게임 상태 스냅샷 (재시작 후 이어하기용)
+
+방 상태를 두 조각으로 나눠 저장한다.
+
+* ``meta``     : 게임 시작 시 한 번 정해지는 값 (키워드 목록, 시드, 최대 라운드, 플레이어 정보)
+* ``progress`` : 페이즈가 바뀔 때마다 변하는 값 (라운드, 턴, kw_idx, 점수, 순서, 페이즈·마감 시각)
+
+조각별로 직렬화 결과의 해시를 기억해 두고 바뀐 조각만 쓰므로,
+페이즈 전환마다 호출해도 대개 수백 바이트짜리 ``progress`` 하나만 기록된다.
+sid 는 재시작하면 무의미하므로 모든 식별자는 ``userId`` 기준으로 저장한다.
+
+SNAPSHOT_STORE
+--------------
+* ``file:/path/to/dir``    : 방·조각마다 JSON 파일 (임시 파일 → rename 으로 원자적 교체)
+* ``sqlite:/path/to.db``   : SQLite 테이블 한 개
+* 미설정                    : 스냅샷 비활성화
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from monitoring.metrics import counter
+
+SNAPSHOT_WRITES  = counter("snapshot_writes_total", "기록한 스냅샷 조각 수")
+SNAPSHOT_SKIPPED = counter("snapshot_skipped_total", "변경이 없어 건너뛴 스냅샷 조각 수")
+SNAPSHOT_BYTES   = counter("snapshot_bytes_total", "기록한 스냅샷 바이트 수")
+
+VERSION = 1
+
+# ────────────────────────────────────────────── stores
+class SnapshotStore:
+    """room_id × part → bytes 저장소 인터페이스"""
+
+    def save(self, room_id: str, part: str, data: bytes): ...
+
+    def delete(self, room_id: str): ...
+
+    def load_all(self) -> Dict[str, Dict[str, bytes]]: ...
+
+class FileSnapshotStore(SnapshotStore):
+    def __init__(self, directory: str | os.PathLike):
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, room_id: str, part: str) -> Path:
+        # 클라이언트가 정한 roomId 를 그대로 파일명에 쓰지 않는다
+        digest = hashlib.sha1(room_id.encode()).hexdigest()
+        return self.dir / f"{digest}.{part}.json"
+
+    def save(self, room_id: str, part: str, data: bytes):
+        path = self._path(room_id, part)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def delete(self, room_id: str):
+        digest = hashlib.sha1(room_id.encode()).hexdigest()
+        for path in self.dir.glob(f"{digest}.*.json"):
+            path.unlink(missing_ok=True)
+
+    def load_all(self) -> Dict[str, Dict[str, bytes]]:
+        out: Dict[str, Dict[str, bytes]] = {}
+        for path in self.dir.glob("*.json"):
+            _, part, _ = path.name.split(".", 2)
+            data = path.read_bytes()
+            room_id = json.loads(data)["room_id"]
+            out.setdefault(room_id, {})[part] = data
+        return out
+
+class SQLiteSnapshotStore(SnapshotStore):
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS room_snapshot ("
+                " room_id TEXT NOT NULL, part TEXT NOT NULL, data BLOB NOT NULL, updated REAL NOT NULL,"
+                " PRIMARY KEY (room_id, part))"
+            )
+
+    def save(self, room_id: str, part: str, data: bytes):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO room_snapshot (room_id, part, data, updated) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(room_id, part) DO UPDATE SET data = excluded.data, updated = excluded.updated",
+                (room_id, part, data, time.time()),
+            )
+
+    def delete(self, room_id: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM room_snapshot WHERE room_id = ?", (room_id,))
+
+    def load_all(self) -> Dict[str, Dict[str, bytes]]:
+        out: Dict[str, Dict[str, bytes]] = {}
+        with self._lock:
+            rows = self._conn.execute("SELECT room_id, part, data FROM room_snapshot").fetchall()
+        for room_id, part, data in rows:
+            out.setdefault(room_id, {})[part] = bytes(data)
+        return out
+
+def store_from_env(spec: Optional[str] = None) -> Optional[SnapshotStore]:
+    spec = spec if spec is not None else os.getenv("SNAPSHOT_STORE", "")
+    if spec.startswith("file:"):
+        return FileSnapshotStore(spec[len("file:"):])
+    if spec.startswith("sqlite:"):
+        return SQLiteSnapshotStore(spec[len("sqlite:"):])
+    return None
+
+# ────────────────────────────────────────────── writer
+class Snapshotter:
+    """바뀐 조각만 단일 스레드에서 순서대로 기록 (루프는 직렬화·해시 비용만 부담)."""
+
+    def __init__(self, store: Optional[SnapshotStore]):
+        self.store = store
+        self._digests: Dict[tuple, bytes] = {}
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snapshot") if store else None
+
+    @property
+    def enabled(self) -> bool:
+        return self.store is not None
+
+    @staticmethod
+    def _uid(room: dict, sid: str) -> Optional[str]:
+        user = room["users"].get(sid)
+        return user["id"] if user else None
+
+    def _parts(self, room_id: str, room: dict) -> Dict[str, Dict[str, Any]]:
+        players = {
+            u["id"]: {"nickname": u["nickname"], "avatar": u.get("avatar")}
+            for u in room["users"].values()
+        }
+        for uid, info in room.get("roster", {}).items():      # 아직 재접속하지 않은 플레이어
+            players.setdefault(uid, {"nickname": info["nickname"], "avatar": info.get("avatar")})
+        order  = [uid for uid in (self._uid(room, s) for s in room["order"]) if uid]
+        scores = {}
+        for sid, score in room.get("scores", {}).items():
+            uid = self._uid(room, sid)
+            if uid:
+                scores[uid] = score
+        for uid, info in room.get("roster", {}).items():
+            scores.setdefault(uid, info.get("score", 0))
+        return {
+            "meta": {
+                "v": VERSION,
+                "room_id":    room_id,
+                "max_rounds": room.get("max_rounds"),
+                "keywords":   room.get("keywords", []),
+                "seed":       room.get("seed"),
+                "players":    players,
+            },
+            "progress": {
+                "v": VERSION,
+                "room_id":  room_id,
+                "host":     self._uid(room, room.get("host")),
+                "round":    room.get("round"),
+                "turn":     room.get("turn"),
+                "kw_idx":   room.get("kw_idx"),
+                "order":    order,
+                "scores":   scores,
+                "phase":    room.get("phase"),
+                "deadline": room.get("deadline"),
+            },
+        }
+
+    def snapshot(self, room_id: str, room: dict):
+        if not self.enabled:
+            return
+        for part, body in self._parts(room_id, room).items():
+            data = json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode()
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            if self._digests.get((room_id, part)) == digest:
+                SNAPSHOT_SKIPPED.inc(part=part)
+                continue
+            self._digests[(room_id, part)] = digest
+            SNAPSHOT_WRITES.inc(part=part)
+            SNAPSHOT_BYTES.inc(len(data))
+            self._pool.submit(self.store.save, room_id, part, data)
+
+    def forget(self, room_id: str):
+        if not self.enabled:
+            return
+        for part in ("meta", "progress"):
+            self._digests.pop((room_id, part), None)
+        self._pool.submit(self.store.delete, room_id)
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """부팅 시 1회 – 조각을 합친 방별 dict (조각이 빠진 방은 버린다)"""
+        if not self.enabled:
+            return {}
+        out = {}
+        for room_id, parts in self.store.load_all().items():
+            if "meta" not in parts or "progress" not in parts:
+                continue
+            meta, progress = json.loads(parts["meta"]), json.loads(parts["progress"])
+            if meta.get("v") != VERSION or progress.get("v") != VERSION:
+                continue
+            out[room_id] = {**meta, **progress}
+        return out
+
+snapshotter = Snapshotter(store_from_env())
@@ -0,0 +1,207 @@
+"""speculative.py – 녹음 앞부분으로 미리 분석
+
+지금은 ``submit_recording`` 으로 녹음 전체가 도착해야 분석을 시작한다. ACR 허밍은 4~6초면 곡을 찾는 경우가 많으므로,
+record 페이즈 동안 클라이언트가 보내는 ``recording_chunk`` (MediaRecorder timeslice 조각 또는 앞부분 스니펫)를 모아 두었다가
+누적 길이가 ``SPECULATIVE_MIN_SEC`` 을 넘으면 그 앞부분으로 ``analyze_recording(..., speculative=True)`` 를 띄운다.
+
+* 앞부분 분석은 ACR 허밍만 호출하고, 키워드와 맞는 후보가 ``SPECULATIVE_MIN_SIM`` 이상일 때만 판정을 낸다
+  (앨범 이미지는 곡명·가수로 Serper 한 번).
+* 제출 시점에 이미 확신할 만한 일치로 끝나 있으면 그 판정을 그대로 쓰고 전체 녹음 분석(ACR·Whisper·Serper)을 건너뛴다.
+* 아직 진행 중이면 기다리지 않고 전체 분석을 같이 시작한다. 앞부분이 먼저 확신할 만한 일치로 끝나면 전체 분석을 취소하고,
+  전체 분석이 먼저 끝나면 그 결과를 쓴다 (앞부분 분석은 이미 보낸 ACR 호출이므로 취소하지 않고 마저 끝낸다).
+* 일치가 아니면 제출된 전체 녹음을 평소대로 분석하고 앞부분 결과는 버린다.
+
+클라이언트 이벤트
+----------------
+``recording_chunk`` : ``{roomId, playerSid, turn, chunk: bytes}``
+조각은 이어 붙였을 때 재생 가능한 앞부분이어야 한다 (첫 조각에 컨테이너 헤더).
+녹음 길이는 서버 시계로 잰다 (record_begin 이후 경과 시간 – 그보다 길게 녹음했을 수는 없다). 클라이언트가 보낸 값은 믿지 않는다.
+
+예산
+----
+앞부분 분석이 빗나가면 ACR 호출이 한 번 더 든다. 적중하면 Whisper·Serper 를 아낀다.
+시작 횟수를 실제 분석량에 묶은 토큰 버킷으로 제한한다: 턴 분석(전체 분석 시작 또는 앞부분 판정 채택)마다
+``SPECULATIVE_RATIO`` 개가 쌓이고 (최대 ``SPECULATIVE_BURST``), 앞부분 분석 하나가 1개를 쓴다.
+그래서 추가 ACR 호출은 분석한 턴 수 × ``SPECULATIVE_RATIO`` (+ 버킷 크기)를 넘지 않는다.
+진행 중인 앞부분 분석 수도 진행 중인 전체 분석 수 + ``SPECULATIVE_BURST`` 를 넘지 않게 한다.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from monitoring.metrics import counter, histogram
+
+SPECULATIVE           = os.getenv("SPECULATIVE", "1") == "1"
+SPECULATIVE_MIN_SEC   = float(os.getenv("SPECULATIVE_MIN_SEC", "5"))           # 이만큼 모이면 앞부분 분석 시작
+SPECULATIVE_RATIO     = float(os.getenv("SPECULATIVE_RATIO", "0.5"))           # 분석한 턴 하나당 쌓이는 토큰
+SPECULATIVE_BURST     = float(os.getenv("SPECULATIVE_BURST", "20"))
+SPECULATIVE_MAX_BYTES = int(os.getenv("SPECULATIVE_MAX_BYTES", str(2 * 1024 * 1024)))
+
+SPEC_TURNS   = counter("speculative_turns_total", "앞부분 분석 결과별 턴 수 (kept·superseded·late·error·budget·oversize)")
+SPEC_SECONDS = histogram("speculative_analysis_seconds", "앞부분 분석 소요 시간")
+READY_SECONDS = histogram("analysis_ready_seconds", "record_begin 부터 판정이 나오기까지 (mode=speculative|full)",
+                          buckets=(1, 2, 3, 4, 5, 6, 7, 8, 10, 12, 15, 20))
+
+class _Budget:
+    """토큰 버킷 – 시간 대신 분석한 턴 수로 충전 (앞부분 분석 비용을 전체 분석량에 비례하게)"""
+
+    def __init__(self, ratio: float, burst: float):
+        self.ratio  = ratio
+        self.burst  = burst
+        self.tokens = burst
+
+    def earn(self):
+        self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def take(self) -> bool:
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+class Speculation:
+    """턴 하나의 앞부분 분석 상태 (record_begin 에서 열고 submit_recording 에서 가져간다)"""
+
+    __slots__ = ("room_id", "sid", "keyword", "seed", "t0", "chunks", "nbytes",
+                 "closed", "prefix", "trace", "task", "started")
+
+    def __init__(self, room_id: str, sid: str, keyword: dict, seed: Any):
+        self.room_id = room_id
+        self.sid     = sid
+        self.keyword = keyword
+        self.seed    = seed
+        self.t0      = time.monotonic()
+        self.chunks: List[bytes] = []
+        self.nbytes  = 0
+        self.closed  = False              # 분석을 띄웠거나 포기함 → 더 모으지 않는다
+        self.prefix  = b""
+        self.trace: Dict[str, Any] = {}
+        self.task: Optional[asyncio.Task] = None
+        self.started = 0.0
+
+    def _launch(self, analyze: Callable):
+        self.closed = True
+        self.prefix, self.chunks = b"".join(self.chunks), []
+        self.started = time.monotonic()
+        self.task = asyncio.create_task(analyze(
+            self.prefix, self.keyword,
+            room_id=self.room_id, seed=self.seed, trace=self.trace, speculative=True,
+        ))
+        self.task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task):
+        if task.cancelled():
+            return
+        SPEC_SECONDS.observe(time.monotonic() - self.started)
+        task.exception()                      # 전체 분석이 먼저 끝나 아무도 보지 않는 실패 (경고 방지)
+
+    def pending(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def confident(self, earn: bool = True) -> Optional[dict]:
+        """끝난 앞부분 판정이 확신할 만한 키워드 일치면 그 결과, 아니면 None (전체 분석으로 대체)
+
+        기다리지 않는다 – 아직 진행 중이면 바로 None (late). 이미 전체 분석을 시작해 버킷을 채웠으면 ``earn=False``.
+        """
+        if self.task is None:
+            return None
+        if not self.task.done():
+            SPEC_TURNS.inc(outcome="late")
+            return None
+        try:
+            result = self.task.result()
+        except asyncio.CancelledError:
+            return None
+        except Exception as e:
+            print(f"⚠️ 앞부분 분석 실패 ({self.room_id}): {e!r}")
+            SPEC_TURNS.inc(outcome="error")
+            return None
+        if result.get("matched"):
+            SPEC_TURNS.inc(outcome="kept")
+            if earn:
+                _budget.earn()                # 전체 분석 대신 이 판정을 썼다 → 분석한 턴으로 친다
+            return result
+        SPEC_TURNS.inc(outcome="superseded")
+        return None
+
+    def ready(self, mode: str):
+        """record_begin → 판정 완료까지 걸린 시간 기록"""
+        READY_SECONDS.observe(time.monotonic() - self.t0, mode=mode)
+
+    def cancel(self):
+        if self.task is None:
+            return
+        if not self.task.done():
+            self.task.cancel()
+        elif not self.task.cancelled():
+            self.task.exception()             # 아무도 기다리지 않은 실패 (경고 방지)
+
+_turns: Dict[str, Speculation] = {}
+_budget = _Budget(SPECULATIVE_RATIO, SPECULATIVE_BURST)
+_running: Set[asyncio.Task] = set()     # 진행 중인 앞부분 분석 (take 로 넘어간 턴 포함)
+_full_inflight = 0                      # 진행 중인 전체 분석
+
+@contextmanager
+def full_analysis():
+    """submit_recording 의 전체 분석을 감싼다 – 진행 중 개수를 세고, 시작할 때 버킷을 채운다"""
+    global _full_inflight
+    _full_inflight += 1
+    _budget.earn()
+    try:
+        yield
+    finally:
+        _full_inflight -= 1
+
+def open_turn(key: str, room_id: str, sid: str, keyword: dict, seed: Any):
+    """record_begin 직전에 호출 – 이 턴의 조각을 받을 준비"""
+    _turns[key] = Speculation(room_id, sid, keyword, seed)
+
+def feed(key: str, sid: str, chunk: bytes, analyze: Callable):
+    """녹음 조각 누적 → record_begin 후 ``SPECULATIVE_MIN_SEC`` 이 지났으면 (예산이 남아 있을 때) 앞부분 분석 시작"""
+    spec = _turns.get(key)
+    if not SPECULATIVE or spec is None or spec.closed or sid != spec.sid or not chunk:
+        return
+    spec.chunks.append(chunk)
+    spec.nbytes += len(chunk)
+    if spec.nbytes > SPECULATIVE_MAX_BYTES:
+        spec.closed, spec.chunks = True, []
+        SPEC_TURNS.inc(outcome="oversize")
+        return
+
+    if time.monotonic() - spec.t0 < SPECULATIVE_MIN_SEC:     # 서버 시계 기준 (클라이언트 값은 쓰지 않음)
+        return
+    if len(_running) >= _full_inflight + SPECULATIVE_BURST or not _budget.take():
+        spec.closed, spec.chunks = True, []
+        SPEC_TURNS.inc(outcome="budget")
+        return
+    spec._launch(analyze)
+    _running.add(spec.task)
+    spec.task.add_done_callback(_running.discard)
+
+def take(key: str) -> Optional[Speculation]:
+    """submit_recording 에서 호출 – 턴 상태를 넘겨받는다 (이후 drop 은 아무 일도 하지 않음)"""
+    spec = _turns.pop(key, None)
+    if spec is not None:
+        spec.chunks = []
+    return spec
+
+def drop(key: str):
+    """제출 없이 턴이 끝남 (시간 초과·탈주) → 진행 중인 앞부분 분석 취소"""
+    spec = _turns.pop(key, None)
+    if spec is not None:
+        spec.cancel()
+
+def status() -> Dict[str, Any]:
+    return {
+        "enabled":   SPECULATIVE,
+        "min_sec":   SPECULATIVE_MIN_SEC,
+        "open":      len(_turns),
+        "running":   len(_running),
+        "full_inflight": _full_inflight,
+        "buffered_bytes": sum(len(s.prefix) if s.closed else s.nbytes for s in _turns.values()),
+        "tokens":    round(_budget.tokens, 2),
+    }
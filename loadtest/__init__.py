@@ -0,0 +1,5 @@
+"""loadtest – Socket.IO 게임 서버 부하 테스트 도구
+
+* ``python -m loadtest.server`` : 키워드 DB·외부 API를 스텁으로 바꾼 서버 실행
+* ``python -m loadtest.run``    : 수많은 방/클라이언트를 만들어 게임 한 판을 끝까지 진행
+"""
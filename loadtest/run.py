@@ -0,0 +1,328 @@
+"""loadtest/run.py – 동시 게임 방 부하 생성기
+
+방마다 ``--players`` 명의 Socket.IO 클라이언트를 붙여
+``join_room → toggle_ready → start_game → submit_recording`` 을 한 판 끝까지 진행한다.
+``--rooms 50,100,200`` 처럼 여러 단계를 주면 단계별로 측정하고,
+기준(drift·루프 지연)을 만족하는 최대 방 수를 코어당 수용량으로 보고한다.
+
+측정 항목
+---------
+* emit 지연     : 방장이 주기적으로 보낸 ``room_chat`` 이 자기에게 돌아오기까지의 시간
+* 페이즈 drift  : intro/keyword/listen/result 실측 길이 − 서버 상수
+* 루프 지연     : 서버의 ``/fast/loadtest/stats`` (loadtest.server 로 띄운 경우)
+* 방당 메모리   : 단계 시작 대비 RSS 증가량 ÷ 방 수
+
+실행
+----
+python -m loadtest.server --port 8000 &
+python -m loadtest.run --url http://127.0.0.1:8000 --rooms 50,100,200 --players 3
+"""
+from __future__ import annotations
+
+import argparse
+import array
+import asyncio
+import io
+import json
+import math
+import time
+import uuid
+import wave
+from collections import defaultdict
+
+import aiohttp
+import socketio
+
+SOCKETIO_PATH = "/fast/socket.io"
+
+# ────────────────────────────────────────────── fixture
+def _sine_wav(seconds: float = 10.0, sr: int = 16_000, freq: float = 440.0) -> bytes:
+    """외부 파일이 없을 때 쓰는 mono·PCM16 사인파 WAV"""
+    n = int(seconds * sr)
+    pcm = array.array("h", (int(12_000 * math.sin(2 * math.pi * freq * i / sr)) for i in range(n)))
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sr)
+        w.writeframes(pcm.tobytes())
+    return buf.getvalue()
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    s = sorted(values)
+    return s[min(len(s) - 1, int(round(q * (len(s) - 1))))]
+
+def _summary(values: list[float]) -> dict:
+    return {
+        "n":   len(values),
+        "p50": round(_percentile(values, 0.50), 4),
+        "p95": round(_percentile(values, 0.95), 4),
+        "p99": round(_percentile(values, 0.99), 4),
+        "max": round(max(values, default=0.0), 4),
+    }
+
+# ────────────────────────────────────────────── 방 시뮬레이션
+class RoomSim:
+    """방 하나 = 클라이언트 N명. 방장(0번) 기준으로 페이즈 시각을 기록한다."""
+
+    def __init__(self, args, room_id: str, audio: bytes, stats: dict):
+        self.args    = args
+        self.room_id = room_id
+        self.audio   = audio
+        self.stats   = stats
+        serializer   = "msgpack" if args.msgpack else "default"
+        self.clients = [socketio.AsyncClient(reconnection=False, serializer=serializer) for _ in range(args.players)]
+        self.done    = asyncio.Event()
+        self.marks: list[tuple[str, float]] = []
+        self.pending_chat: dict[str, float] = {}
+        self.keywords: dict[int, dict] = {}
+
+    def _mark(self, name: str):
+        self.marks.append((name, time.monotonic()))
+
+    def _bind(self, idx: int, cli: socketio.AsyncClient):
+        host = idx == 0
+
+        @cli.on("record_begin")
+        async def on_record_begin(data):
+            if host:
+                self._mark("record_begin")
+            if data.get("playerSid") == cli.get_sid():
+                asyncio.create_task(self._submit(idx, data))
+
+        @cli.on("keyword_phase")
+        async def on_keyword(data):
+            if data.get("playerSid") == cli.get_sid():
+                self.keywords[idx] = data["keyword"]
+                self._ack(cli, "keyword_ready")
+            if host:
+                self._mark("keyword_phase")
+
+        @cli.on("game_intro")
+        async def on_intro(data):
+            self._ack(cli, "intro_seen")
+            if host:
+                self._mark("game_intro")
+
+        @cli.on("listen_phase")
+        async def on_listen(data):
+            self._ack(cli, "playback_finished")
+            if host:
+                self._mark("listen_phase")
+
+        @cli.on("round_result")
+        async def on_result(data):
+            self._ack(cli, "result_seen")
+            if host:
+                self._mark("round_result")
+
+        if not host:
+            return
+
+        @cli.on("game_result")
+        async def on_game_result(data):
+            self._mark("game_result")
+            self.done.set()
+
+        @cli.on("room_chat")
+        async def on_chat(data):
+            sent = self.pending_chat.pop(data.get("message"), None)
+            if sent is not None:
+                self.stats["emit_latency"].append(time.monotonic() - sent)
+
+    def _ack(self, cli: socketio.AsyncClient, event: str):
+        """--ack-delay 가 있으면 그만큼 뒤에 페이즈 ack (연출·재생이 끝난 클라이언트 흉내)"""
+        if self.args.ack_delay is None:
+            return
+
+        async def send():
+            await asyncio.sleep(self.args.ack_delay)
+            await cli.emit(event, {"roomId": self.room_id})
+        asyncio.create_task(send())
+
+    async def _submit(self, idx: int, data: dict):
+        if self.args.chunk_sec:
+            await self._send_chunks(idx, data)
+        else:
+            await asyncio.sleep(self.args.record_sec)
+        await self.clients[idx].emit("submit_recording", {
+            "roomId":    self.room_id,
+            "playerSid": data["playerSid"],
+            "turn":      data.get("turn", -1),
+            "keyword":   self.keywords.get(idx, {"type": "가수", "name": "", "alias": []}),
+            "audio":     self.audio,
+        })
+
+    async def _send_chunks(self, idx: int, data: dict):
+        """MediaRecorder timeslice 흉내 – record_sec 동안 chunk_sec 마다 녹음 조각을 보낸다"""
+        n = max(1, math.ceil(self.args.record_sec / self.args.chunk_sec))
+        size = math.ceil(len(self.audio) / n)
+        for i in range(n):
+            await asyncio.sleep(min(self.args.chunk_sec, self.args.record_sec - i * self.args.chunk_sec))
+            await self.clients[idx].emit("recording_chunk", {
+                "roomId":    self.room_id,
+                "playerSid": data["playerSid"],
+                "turn":      data.get("turn", -1),
+                "chunk":     self.audio[i * size : (i + 1) * size],
+            })
+
+    async def _ping_loop(self):
+        host = self.clients[0]
+        while not self.done.is_set():
+            tag = f"lt-ping-{uuid.uuid4().hex[:8]}"
+            self.pending_chat[tag] = time.monotonic()
+            await host.emit("room_chat", {"roomId": self.room_id, "message": tag})
+            await asyncio.sleep(self.args.ping_interval)
+
+    async def run(self):
+        for i, cli in enumerate(self.clients):
+            self._bind(i, cli)
+            await cli.connect(self.args.url, socketio_path=SOCKETIO_PATH, transports=["websocket"])
+            await cli.emit("join_room", {
+                "roomId":   self.room_id,
+                "userId":   f"{self.room_id}-u{i}",
+                "nickname": f"p{i}",
+                "avatar":   "",
+            })
+        await asyncio.sleep(0.2)
+        for cli in self.clients[1:]:
+            await cli.emit("toggle_ready")
+        await self.clients[0].emit("start_game", {"roomId": self.room_id, "maxRounds": self.args.max_rounds})
+
+        pinger = asyncio.create_task(self._ping_loop())
+        try:
+            await asyncio.wait_for(self.done.wait(), timeout=self.args.game_timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+        finally:
+            pinger.cancel()
+            for cli in self.clients:
+                await cli.disconnect()
+
+    def phase_durations(self) -> dict[str, list[float]]:
+        """연속된 표식 사이 간격 → 페이즈별 실측 길이"""
+        out = defaultdict(list)
+        for (a, ta), (b, tb) in zip(self.marks, self.marks[1:]):
+            if a == "game_intro" and b == "keyword_phase":
+                out["intro"].append(tb - ta)
+            elif a == "keyword_phase" and b == "record_begin":
+                out["keyword"].append(tb - ta)
+            elif a == "listen_phase" and b == "round_result":
+                out["listen"].append(tb - ta)
+            elif a == "round_result" and b in ("keyword_phase", "game_result"):
+                out["result"].append(tb - ta)
+        return out
+
+# ────────────────────────────────────────────── 단계 실행
+async def _server(session: aiohttp.ClientSession, url: str, path: str, method: str = "GET") -> dict | None:
+    try:
+        async with session.request(method, url + path) as r:
+            if r.status == 200:
+                return await r.json()
+    except aiohttp.ClientError:
+        pass
+    return None
+
+async def run_step(args, n_rooms: int, audio: bytes, session: aiohttp.ClientSession) -> dict:
+    stats = {"emit_latency": [], "timeouts": 0}
+    await _server(session, args.url, "/fast/loadtest/reset", "POST")
+
+    sims = [RoomSim(args, f"lt-{n_rooms}-{i}-{uuid.uuid4().hex[:6]}", audio, stats) for i in range(n_rooms)]
+    tasks = []
+    for sim in sims:
+        tasks.append(asyncio.create_task(sim.run()))
+        await asyncio.sleep(1 / args.connect_rate)
+
+    peak = None
+    while not all(t.done() for t in tasks):
+        s = await _server(session, args.url, "/fast/loadtest/stats")
+        if s and (peak is None or s["rss"] > peak["rss"]):
+            peak = s
+        await asyncio.sleep(2)
+    errors = [t.exception() for t in tasks if t.exception()]
+    final = await _server(session, args.url, "/fast/loadtest/stats") or peak
+
+    expected = (final or {}).get("phases") or {
+        "intro": 11, "keyword": 9, "listen": 10, "result": 6,
+    }
+    drift: dict[str, list[float]] = defaultdict(list)
+    for sim in sims:
+        for phase, values in sim.phase_durations().items():
+            drift[phase] += [v - expected[phase] for v in values]
+    all_drift = [d for values in drift.values() for d in values]
+
+    report = {
+        "rooms":        n_rooms,
+        "clients":      n_rooms * args.players,
+        "errors":       len(errors),
+        "timeouts":     stats["timeouts"],
+        "emit_latency": _summary(stats["emit_latency"]),
+        "drift":        {phase: _summary(values) for phase, values in drift.items()},
+        "drift_all":    _summary(all_drift),
+    }
+    if final:
+        report["loop_lag"] = final["loop_lag"]
+        if peak:
+            report["mem_per_room_kb"] = round(max(0, peak["rss"] - peak["rss_base"]) / n_rooms / 1024, 1)
+    return report
+
+def _within_budget(args, report: dict) -> bool:
+    if report["errors"] or report["timeouts"]:
+        return False
+    if report["drift_all"]["p95"] > args.max_drift:
+        return False
+    lag = report.get("loop_lag")
+    return not lag or lag["p99"] <= args.max_lag
+
+async def main_async(args):
+    if args.audio:
+        with open(args.audio, "rb") as f:
+            audio = f.read()
+    else:
+        audio = _sine_wav(args.record_sec or 10)
+    steps = [int(x) for x in args.rooms.split(",") if x.strip()]
+
+    reports = []
+    async with aiohttp.ClientSession() as session:
+        for n in steps:
+            print(f"▶ {n} rooms × {args.players} players")
+            report = await run_step(args, n, audio, session)
+            report["ok"] = _within_budget(args, report)
+            reports.append(report)
+            print(json.dumps(report, ensure_ascii=False, indent=2))
+            if not report["ok"] and args.stop_on_fail:
+                break
+
+    passed = [r["rooms"] for r in reports if r["ok"]]
+    capacity = max(passed, default=0)
+    # 서버는 uvicorn 워커 1개(=이벤트 루프 1개, 코어 1개)로 띄운다고 가정
+    print(json.dumps({
+        "capacity_rooms_per_core": capacity,
+        "criteria": {"max_drift_p95": args.max_drift, "max_loop_lag_p99": args.max_lag},
+    }, indent=2))
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Socket.IO 게임 방 부하 생성기")
+    p.add_argument("--url", default="http://127.0.0.1:8000")
+    p.add_argument("--rooms", default="10,50,100", help="쉼표로 구분한 단계별 방 수")
+    p.add_argument("--players", type=int, default=3)
+    p.add_argument("--max-rounds", type=int, default=1)
+    p.add_argument("--audio", help="제출할 녹음 파일 (기본: 10초 사인파 WAV)")
+    p.add_argument("--record-sec", type=float, default=10.0, help="record_begin 후 제출까지 대기(초)")
+    p.add_argument("--ack-delay", type=float, default=None,
+                   help="페이즈 ack 를 보낼 시점(초). 지정하면 drift 는 음수(단축된 시간)로 나온다")
+    p.add_argument("--chunk-sec", type=float, default=None,
+                   help="녹음 중 이 간격(초)으로 recording_chunk 전송 (앞부분 분석 측정용)")
+    p.add_argument("--msgpack", action="store_true", help="SIO_SERIALIZER=msgpack 서버용 클라이언트")
+    p.add_argument("--ping-interval", type=float, default=2.0, help="emit 지연 측정 주기(초)")
+    p.add_argument("--connect-rate", type=float, default=50.0, help="초당 생성할 방 수")
+    p.add_argument("--game-timeout", type=float, default=600.0)
+    p.add_argument("--max-drift", type=float, default=0.25, help="허용 drift p95(초)")
+    p.add_argument("--max-lag", type=float, default=0.1, help="허용 루프 지연 p99(초)")
+    p.add_argument("--stop-on-fail", action="store_true")
+    return p.parse_args()
+
+if __name__ == "__main__":
+    asyncio.run(main_async(_parse_args()))
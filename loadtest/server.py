@@ -0,0 +1,106 @@
+"""loadtest/server.py – 외부 의존성을 스텁으로 바꾼 부하 테스트용 서버
+
+실제 ``main:sio_app`` 을 그대로 띄우되 아래만 교체한다.
+
+* 키워드 DB      → ``KEYWORD_SOURCE=memory`` (``service/keyword_dataset.csv`` 메모리 카탈로그)
+* 음성 분석(API) → 지정한 지연(초) 후 고정 결과 반환
+* ``/fast/loadtest/stats`` 통계 엔드포인트 추가 (루프 지연은 ``monitoring.loop_monitor`` 샘플을 그대로 읽음)
+
+실행
+----
+python -m loadtest.server --port 8000 --analysis-latency 2.0
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import time
+
+# main import 전에 DB 관련 환경을 채워 둔다 (실제 접속은 하지 않음)
+os.environ.setdefault("INITIAL_KEYWORD_LOAD", "0")
+os.environ.setdefault("KEYWORD_SOURCE", "memory")
+os.environ.setdefault("FAST_DB_PORT", "3306")
+os.environ["LOOP_MONITOR"] = "1"                        # 루프 지연은 서버의 loop_monitor 로 잰다
+os.environ.setdefault("LOOP_MONITOR_INTERVAL", "0.05")
+
+import uvicorn
+
+import main
+import game.analysis as analysis
+import game.rounds as rounds
+import websocket.events as events
+from monitoring.loop_monitor import loop_monitor
+from monitoring.memory import rss_bytes as _rss_bytes
+
+_baseline = {"rss": 0, "time": time.monotonic()}
+_settings = {"analysis_latency": 2.0, "analysis_jitter": 0.5, "speculative_hit": 0.7}
+
+# ────────────────────────────────────────────── 스텁
+async def fake_analyze_recording(raw: bytes, keyword: dict, **kw) -> dict:
+    latency = _settings["analysis_latency"] + random.uniform(0, _settings["analysis_jitter"])
+    if kw.get("speculative"):                 # 앞부분 분석: ACR 만 → 절반 지연, --speculative-hit 비율로 일치
+        await asyncio.sleep(latency / 2)
+        if random.random() >= _settings["speculative_hit"]:
+            return {"matched": False, "title": None, "artist": None, "score": 0, "image": None, "speculative": True}
+        return {"matched": True, "title": "loadtest", "artist": keyword.get("name"), "score": 90,
+                "source": "acr", "image": None, "speculative": True}
+    await asyncio.sleep(latency)
+    return {
+        "matched": True,
+        "title":   "loadtest",
+        "artist":  keyword.get("name"),
+        "score":   80,
+        "source":  "stub",
+        "image":   None,
+    }
+
+# ────────────────────────────────────────────── 측정
+@main.app.post("/fast/loadtest/reset")
+async def loadtest_reset():
+    loop_monitor.reset()
+    _baseline.update(rss=_rss_bytes(), time=time.monotonic())
+    return {"rss": _baseline["rss"], "rooms": len(main.rooms)}
+
+@main.app.get("/fast/loadtest/stats")
+async def loadtest_stats():
+    return {
+        "rooms":      len(main.rooms),
+        "playing":    sum(1 for r in main.rooms.values() if r.get("state") == "playing"),
+        "rss":        _rss_bytes(),
+        "rss_base":   _baseline["rss"],
+        "elapsed":    time.monotonic() - _baseline["time"],
+        "cpu_count":  os.cpu_count(),
+        "loop_lag":   loop_monitor.lag_summary(),
+        "phases": {
+            "intro":   rounds.INTRO_LEN,
+            "keyword": rounds.KW_LEN,
+            "record":  rounds.RECORD_LEN,
+            "listen":  rounds.LISTEN_LEN,
+            "result":  rounds.RESULT_LEN,
+        },
+    }
+
+events.analyze_recording     = fake_analyze_recording
+
+async def _no_prewarm():
+    return None
+
+analysis._prewarm_connections = _no_prewarm   # 턴 사전 준비에서 실제 API 호스트에 접속하지 않도록
+
+# ────────────────────────────────────────────── entry
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="부하 테스트용 스텁 서버")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8000)
+    p.add_argument("--analysis-latency", type=float, default=2.0, help="스텁 분석 기본 지연(초)")
+    p.add_argument("--analysis-jitter",  type=float, default=0.5, help="스텁 분석 추가 지연 최대(초)")
+    p.add_argument("--speculative-hit",  type=float, default=0.7, help="앞부분 분석이 일치로 끝나는 비율")
+    return p.parse_args()
+
+if __name__ == "__main__":
+    args = _parse_args()
+    _settings.update(analysis_latency=args.analysis_latency, analysis_jitter=args.analysis_jitter,
+                     speculative_hit=args.speculative_hit)
+    uvicorn.run(main.sio_app, host=args.host, port=args.port, log_level="warning")
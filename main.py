@@ -1,6 +1,7 @@
 import sys
 sys.path.append("./.venv/Lib/site-packages")
 import os
+import startup
 from fastapi import FastAPI
 from service.keyword_loader import load_keywords
 from fastapi.middleware.cors import CORSMiddleware
@@ -10,16 +11,30 @@ from fastapi import FastAPI, Depends
 from contextlib import asynccontextmanager
 from sqlalchemy.orm import Session
 from sqlalchemy import text
+from fastapi.responses import JSONResponse, PlainTextResponse
+from monitoring import metrics
+from monitoring.loop_monitor import loop_monitor
+from game.shards import shard_router
+from websocket import serializer
 
 # ASGI 서버 설정
-sio = socketio.AsyncServer(async_mode="asgi", cors_allowed_origins="*")
+sio = socketio.AsyncServer(async_mode="asgi", cors_allowed_origins="*", **serializer.server_options())
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # 🚀 서버 시작 시 실행
-    if os.getenv("INITIAL_KEYWORD_LOAD", "1") == "1":
-        await load_keywords()
+    # 🚀 서버 시작 시 실행 (STARTUP_MODE=lazy 면 키워드 적재·워밍업을 백그라운드로)
+    await startup.run(load_keywords if os.getenv("INITIAL_KEYWORD_LOAD", "1") == "1" else None)
+    if os.getenv("LOOP_MONITOR", "1") == "1":
+        loop_monitor.start()
+    shard_router.start()   # ANALYSIS_SHARDS > 0 이면 분석 워커 프로세스 기동
+    restore_rooms()   # SNAPSHOT_STORE 가 설정된 경우 진행 중이던 게임 복구
 
     yield
+    loop_monitor.stop()
+    shard_router.stop()
+    if "game.analysis" in sys.modules:
+        await sys.modules["game.analysis"].close_session()
+    if "db" in sys.modules:          # KEYWORD_SOURCE=memory 면 DB 를 아예 쓰지 않는다
+        await sys.modules["db"].engine.dispose()
 app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
@@ -38,12 +53,26 @@ sio_app = socketio.ASGIApp(
 rooms = {}
 round_buffer = {}
 round_events = {}
+listen_acks = {}     # room_id → game.phases.PhaseGate (intro·keyword·listen·result ack)
 
 # ────────────────────────────── 각종 핸들러 및 게임 로직 import
-from websocket.events import *
-from game.rounds import *
-from utils import *
+with startup.phase("import:handlers"):
+    from websocket.events import *
+    from game.rounds import *
+    from utils import *
+from admin import router as admin_router
+
+app.include_router(admin_router)
 
 @app.get("/fast/healthz")
 async def healthz():
     return {"status": "ok"}
+
+@app.get("/fast/readyz")
+async def readyz():
+    report = startup.report()
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+@app.get("/fast/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    return metrics.render()
@@ -0,0 +1 @@
+"""monitoring – 메트릭 레지스트리와 이벤트 루프 지연 감시"""
@@ -0,0 +1,190 @@
+"""loop_monitor.py – 이벤트 루프 지연 워치독
+
+``convert_format``·BeautifulSoup·rapidfuzz 처럼 CPU를 쓰는 코드가 루프 위에서 돌면
+게임 타이머와 Socket.IO ping 이 밀린다. 이 모듈은 두 갈래로 이를 잡는다.
+
+1. **샘플러 코루틴** : ``interval`` 마다 깨어나 예정 시각 대비 지연(lag)을 측정
+2. **워치독 스레드** : 샘플러의 heartbeat 가 ``threshold`` 이상 끊기면
+   루프 스레드의 현재 스택(``sys._current_frames``)과 실행 중인 Task 를 기록
+
+루프가 멈춘 *도중* 의 스택을 떠야 원인 코드가 보이기 때문에 스레드가 필요하다.
+평소 비용은 0.1초마다 sleep 한 번 + 스레드의 float 비교 정도.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from monitoring.metrics import counter, gauge, histogram
+
+PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+
+LOOP_LAG   = histogram("loop_lag_seconds", "이벤트 루프 스케줄링 지연",
+                       buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5))
+LOOP_STALL = counter("loop_stalls_total", "임계값을 넘은 루프 정지 횟수")
+LOOP_LAST  = gauge("loop_lag_last_seconds", "마지막 샘플의 루프 지연")
+
+def _is_project_frame(filename: str) -> bool:
+    return (
+        filename.startswith(PROJECT_ROOT)
+        and "site-packages" not in filename
+        and ".venv" not in filename
+    )
+
+class LoopMonitor:
+    """샘플러 + 워치독. ``start()``/``stop()`` 으로 런타임에 켜고 끈다."""
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.1,
+                 history: int = 50, stack_limit: int = 30, keep: int = 12_000):
+        self.interval    = interval
+        self.threshold   = threshold
+        self.stack_limit = stack_limit
+        self.stalls: deque[Dict[str, Any]] = deque(maxlen=history)
+        self.recent: deque[float] = deque(maxlen=keep)     # 최근 지연 샘플 (백분위 계산용)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._sampler: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._beat = time.monotonic()
+        self._pending: Optional[Dict[str, Any]] = None   # 워치독이 뜬 스택(루프 재개 대기)
+        self._max_lag = 0.0
+        self._samples = 0
+
+    # ───────────────────────────── 제어
+    @property
+    def enabled(self) -> bool:
+        return self._sampler is not None and not self._sampler.done()
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        if self.enabled:
+            return
+        self._loop = loop or asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._sampler = self._loop.create_task(self._sample(), name="loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._sampler:
+            self._sampler.cancel()
+            self._sampler = None
+        if self._watchdog:
+            self._watchdog.join(timeout=self.threshold)
+            self._watchdog = None
+
+    def configure(self, *, interval: float | None = None, threshold: float | None = None):
+        if interval is not None:
+            self.interval = max(0.01, interval)
+        if threshold is not None:
+            self.threshold = max(0.01, threshold)
+
+    # ───────────────────────────── 샘플러 (루프 스레드)
+    async def _sample(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            t0 = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - t0 - self.interval)
+            self._beat = time.monotonic()
+            self._samples += 1
+            self._max_lag = max(self._max_lag, lag)
+            self.recent.append(lag)
+            LOOP_LAG.observe(lag)
+            LOOP_LAST.set(lag)
+
+            pending, self._pending = self._pending, None
+            if lag >= self.threshold:
+                record = pending or {"at": time.time(), "task": None, "coro": None,
+                                     "handler": None, "where": None, "stack": []}
+                record["lag"] = round(lag, 4)
+                self.stalls.append(record)
+                LOOP_STALL.inc(handler=record["handler"] or record["coro"] or "unknown")
+
+    # ───────────────────────────── 워치독 (별도 스레드)
+    def _watch(self):
+        while not self._stop.wait(self.threshold / 2):
+            silent = time.monotonic() - self._beat
+            if silent < self.interval + self.threshold or self._pending is not None:
+                continue
+            self._pending = self._capture()
+
+    def _current_task(self) -> Optional[asyncio.Task]:
+        try:
+            return asyncio.current_task(self._loop)   # 다른 스레드에서 loop 를 지정해 읽기만 한다
+        except (RuntimeError, AttributeError, TypeError):
+            return None
+
+    def _capture(self) -> Dict[str, Any]:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        frames = []
+        while frame is not None:                     # 스택 전체를 따라가야 깊은 librosa·numba 호출 아래의 핸들러도 보인다
+            frames.append((frame, frame.f_lineno))
+            frame = frame.f_back
+        full = traceback.StackSummary.extract(reversed(frames), lookup_lines=False)
+
+        # 가장 바깥쪽 프로젝트 프레임 = 핸들러, 가장 안쪽 프레임 = 실제로 CPU를 쓰는 곳
+        handler = next((f for f in full if _is_project_frame(f.filename)), None)
+        stack = list(full[-self.stack_limit:])
+        if handler is not None and handler not in stack:
+            stack.insert(0, handler)
+        task = self._current_task()
+        coro = task.get_coro() if task else None
+
+        return {
+            "at":      time.time(),
+            "task":    task.get_name() if task else None,
+            "coro":    getattr(coro, "__qualname__", None),
+            "handler": handler.name if handler else None,
+            "where":   f"{os.path.relpath(stack[-1].filename, PROJECT_ROOT)}:{stack[-1].lineno} "
+                       f"in {stack[-1].name}" if stack else None,
+            "stack":   [f"{fr.filename}:{fr.lineno} in {fr.name}" for fr in stack],
+        }
+
+    # ───────────────────────────── 조회
+    def reset(self):
+        """최근 샘플·최대 지연 초기화 (부하 테스트 단계 시작 등)"""
+        self.recent.clear()
+        self._max_lag = 0.0
+
+    def lag_summary(self) -> Dict[str, float]:
+        lags = sorted(self.recent)
+
+        def pct(q: float) -> float:
+            return lags[min(len(lags) - 1, int(round(q * (len(lags) - 1))))] if lags else 0.0
+
+        return {
+            "samples": len(lags),
+            "p50": pct(0.50),
+            "p95": pct(0.95),
+            "p99": pct(0.99),
+            "max": lags[-1] if lags else 0.0,
+        }
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled":   self.enabled,
+            "interval":  self.interval,
+            "threshold": self.threshold,
+            "samples":   self._samples,
+            "last_lag":  LOOP_LAST.value(),
+            "max_lag":   round(self._max_lag, 4),
+            "stalls":    list(self.stalls),
+        }
+
+loop_monitor = LoopMonitor(
+    interval=float(os.getenv("LOOP_MONITOR_INTERVAL", "0.1")),
+    threshold=float(os.getenv("LOOP_MONITOR_THRESHOLD", "0.1")),
+    keep=int(os.getenv("LOOP_MONITOR_KEEP", "12000")),
+)
@@ -0,0 +1,44 @@
+"""memory.py – 구조별 메모리 추정 (관리 API 용)
+
+``sys.getsizeof`` 를 컨테이너 안쪽까지 따라가며 더한다. 같은 객체는 한 번만 센다 (intern 된 문자열·공유 키워드 등).
+asyncio Task·Event 처럼 안쪽을 따라가면 루프 전체가 딸려 오는 객체는 껍데기 크기만 센다.
+"""
+from __future__ import annotations
+
+import asyncio
+import resource
+import sys
+from typing import Any, Optional, Set
+
+_OPAQUE = (asyncio.Future, asyncio.Event, asyncio.Handle)
+
+def deep_size(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    seen = set() if seen is None else seen
+    size = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        size += sys.getsizeof(o)
+        if isinstance(o, (str, bytes, bytearray, int, float, bool, type(None), _OPAQUE)):
+            continue
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif hasattr(o, "__slots__"):
+            stack.extend(getattr(o, s) for s in o.__slots__ if hasattr(o, s))
+        elif hasattr(o, "__dict__"):
+            stack.append(o.__dict__)
+    return size
+
+def rss_bytes() -> int:
+    """현재 RSS (Linux는 /proc, 그 외는 최대 RSS로 근사)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
@@ -0,0 +1,148 @@
+"""metrics.py – 프로세스 내 경량 메트릭 레지스트리
+
+Prometheus 텍스트 포맷(``/fast/metrics``)으로 내보낼 Counter·Gauge·Histogram.
+외부 라이브러리 없이 dict + lock 으로만 구현해 워치독 스레드에서도 안전하게 갱신한다.
+
+사용 예
+-------
+ROOMS = gauge("rooms_live", "진행 중인 방 수")
+ROOMS.set(len(rooms))
+LAT = histogram("emit_seconds", "emit 소요 시간", buckets=(0.01, 0.1, 1))
+LAT.observe(0.03, event="room_update")
+"""
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Dict, Iterable, Tuple
+
+__all__ = ["Counter", "Gauge", "Histogram", "counter", "gauge", "histogram", "render"]
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _key(labels: dict) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _fmt_labels(key: LabelKey, extra: Iterable[Tuple[str, str]] = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    body = ",".join(f'{k}="{v}"' for k, v in pairs)
+    return "{" + body + "}"
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, doc: str):
+        self.name = name
+        self.doc  = doc
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, doc: str):
+        super().__init__(name, doc)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        k = _key(labels)
+        with self._lock:
+            self._values[k] = self._values.get(k, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_key(labels), 0.0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_fmt_labels(k)} {v}" for k, v in items]
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[_key(labels)] = float(value)
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, doc: str, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, doc)
+        self.buckets = tuple(sorted(buckets))
+        # label → [bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelKey, list] = {}
+
+    def observe(self, value: float, **labels):
+        k = _key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(k)
+            if row is None:
+                row = self._values[k] = [0] * (len(self.buckets) + 1) + [0.0]
+            row[idx] += 1
+            row[-1] += value
+
+    def snapshot(self, **labels) -> dict:
+        """{count, sum, buckets{le: 누적 count}} – 관리용 API에서 사용"""
+        row = self._values.get(_key(labels))
+        if row is None:
+            return {"count": 0, "sum": 0.0, "buckets": {}}
+        cum, out = 0, {}
+        for le, n in zip(self.buckets + (float("inf"),), row[:-1]):
+            cum += n
+            out[str(le)] = cum
+        return {"count": cum, "sum": row[-1], "buckets": out}
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = [(k, list(row)) for k, row in self._values.items()]
+        lines = []
+        for k, row in items:
+            cum = 0
+            for le, n in zip(self.buckets + (float("inf"),), row[:-1]):
+                cum += n
+                le_s = "+Inf" if le == float("inf") else repr(le)
+                lines.append(f"{self.name}_bucket{_fmt_labels(k, [('le', le_s)])} {cum}")
+            lines.append(f"{self.name}_count{_fmt_labels(k)} {cum}")
+            lines.append(f"{self.name}_sum{_fmt_labels(k)} {row[-1]}")
+        return lines
+
+# ────────────────────────────────────────────── registry
+_REGISTRY: Dict[str, _Metric] = {}
+_REG_LOCK = threading.Lock()
+
+def _get_or_create(cls, name: str, doc: str, **kw):
+    with _REG_LOCK:
+        m = _REGISTRY.get(name)
+        if m is None:
+            m = _REGISTRY[name] = cls(name, doc, **kw)
+        return m
+
+def counter(name: str, doc: str) -> Counter:
+    return _get_or_create(Counter, name, doc)
+
+def gauge(name: str, doc: str) -> Gauge:
+    return _get_or_create(Gauge, name, doc)
+
+def histogram(name: str, doc: str, buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+    return _get_or_create(Histogram, name, doc, buckets=buckets)
+
+def render() -> str:
+    """등록된 모든 메트릭을 Prometheus 텍스트 포맷으로 직렬화"""
+    with _REG_LOCK:
+        metrics = list(_REGISTRY.values())
+    lines: list[str] = []
+    for m in metrics:
+        lines += m.header()
+        lines += m.samples()
+    return "\n".join(lines) + "\n"
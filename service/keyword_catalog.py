@@ -0,0 +1,237 @@
+"""keyword_catalog.py – 메모리 상주 키워드 카탈로그
+
+키워드는 수백 개뿐이라 게임마다 DB 를 다녀올 필요가 없다. 부팅 때 한 번 읽어 두고 CSV 가 바뀌면 다시 읽는다.
+
+* 문자열은 ``sys.intern`` 으로 공유하고, 별칭은 미리 쪼개 tuple 로 둔다.
+* 같은 이름이 제목·가수로 따로 있을 수 있으므로 ('비', '태양') 키워드는 ``(type, name)`` 으로 구분한다.
+* ``sample()`` 은 ``keywordType`` 별로 번갈아 뽑고, 방에서 최근에 쓴 키워드는 뒤로 미룬다.
+* 비교용 변형(정규화·초성)은 ``game.analysis`` 가 키워드별로 캐시하므로 여기서는 만들지 않는다.
+
+KEYWORD_SOURCE
+--------------
+* ``db`` (기본)  : keyword 테이블에서 읽는다 (``db.fetch_all_keywords`` 캐시를 그대로 카탈로그로 변환)
+* ``memory``    : ``service/keyword_dataset.csv`` 를 직접 읽는다 (MySQL 없이 동작, mtime 으로 hot-reload)
+"""
+from __future__ import annotations
+
+import csv
+import os
+import random
+import re
+import sys
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+KEYWORD_SOURCE   = os.getenv("KEYWORD_SOURCE", "db")
+KEYWORD_RECENT   = int(os.getenv("KEYWORD_RECENT_PER_ROOM", "100"))       # 방마다 기억할 최근 키워드 수
+RELOAD_CHECK_SEC = float(os.getenv("KEYWORD_RELOAD_CHECK_SEC", "5"))     # CSV mtime 확인 주기
+
+DATASET_PATH = Path(__file__).resolve().parent / "keyword_dataset.csv"
+
+# ───────────────────────────── 정규화 (game.analysis 와 공용)
+_NON_WORD_RE = re.compile(r"[^가-힣a-z0-9]+")
+_CHO = [chr(c) for c in range(0x1100, 0x1113)]
+
+def normalize(text: str) -> str:
+    # KC 정규화 + 소문자, 공백·특수문자 축약
+    txt = unicodedata.normalize("NFKC", text).lower()
+    return _NON_WORD_RE.sub(" ", txt).strip()
+
+def initials(hangul: str) -> str:
+    """'윤미래' → 'ㅇㅁㄹ' (초성열)"""
+    res = []
+    for ch in hangul:
+        code = ord(ch) - 0xAC00
+        res.append(_CHO[code // 588] if 0 <= code <= 11171 else ch)
+    return "".join(res)
+
+def split_alias(raw: Any) -> List[str]:
+    """'레드벨벳|redvelvet' 또는 리스트 → ['레드벨벳', 'redvelvet']"""
+    if isinstance(raw, str):
+        raw = raw.split("|") if raw else []
+    return [a.strip() for a in raw or [] if a and a.strip()]
+
+# ───────────────────────────── 항목
+KeywordKey = Tuple[str, str]          # (type, name)
+
+class Keyword:
+    __slots__ = ("type", "name", "alias", "difficulty", "key")
+
+    def __init__(self, ktype: str, name: str, alias: Iterable[str], difficulty: Optional[int] = None):
+        self.type       = sys.intern(ktype or "")
+        self.name       = sys.intern(name)
+        self.alias      = tuple(sys.intern(a) for a in alias)
+        self.difficulty = difficulty
+        self.key: KeywordKey = (self.type, self.name)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Socket.IO 로 내보내는 형태 ({type, name, alias: list})"""
+        return {"type": self.type, "name": self.name, "alias": list(self.alias)}
+
+def _difficulty(raw: Any) -> Optional[int]:
+    """CSV 열·클라이언트 값 → 정수 난이도 (없거나 숫자가 아니면 None)"""
+    try:
+        return int(raw) if raw not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+# ───────────────────────────── 카탈로그
+class KeywordCatalog:
+    def __init__(self, path: Path = DATASET_PATH):
+        self.path     = path
+        self.items: List[Keyword] = []
+        self.by_key: Dict[KeywordKey, Keyword] = {}
+        self.by_type: Dict[str, List[Keyword]] = {}
+        self.version  = 0
+        self.loaded_at = 0.0
+        self._mtime   = None
+        self._checked = 0.0
+        self._source_rows = None                         # db 모드: 마지막으로 변환한 행 목록
+        self._recent: Dict[str, "OrderedDict[KeywordKey, None]"] = {}
+
+    # ── 적재
+    def _install(self, items: List[Keyword]):
+        by_type: Dict[str, List[Keyword]] = {}
+        for k in items:
+            by_type.setdefault(k.type, []).append(k)
+        self.items, self.by_type = items, by_type
+        self.by_key = {k.key: k for k in items}
+        self.version += 1
+        self.loaded_at = time.time()
+
+    def load_csv(self) -> int:
+        mtime = self.path.stat().st_mtime
+        with self.path.open(encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        self._install([
+            Keyword(
+                (r.get("keywordType") or "").strip(),
+                r["keywordName"].strip(),
+                split_alias(r.get("keywordAlias")),
+                _difficulty(r.get("keywordDifficulty")),
+            )
+            for r in rows if (r.get("keywordName") or "").strip()
+        ])
+        self._mtime = mtime
+        return len(self.items)
+
+    def load_rows(self, rows: List[Dict[str, Any]]):
+        """db.fetch_all_keywords() 결과 ({type, name, alias}) → 카탈로그 (같은 목록이면 건너뜀)"""
+        if rows is self._source_rows:
+            return
+        self._install([Keyword(r["type"], r["name"], split_alias(r.get("alias"))) for r in rows])
+        self._source_rows = rows
+
+    def maybe_reload(self) -> bool:
+        """CSV mtime 이 바뀌었으면 다시 읽는다 (stat 은 RELOAD_CHECK_SEC 마다 한 번)"""
+        now = time.monotonic()
+        if self.items and now - self._checked < RELOAD_CHECK_SEC:
+            return False
+        self._checked = now
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        count = self.load_csv()
+        print(f"🔄 키워드 카탈로그 재적재: {count}개 (v{self.version})")
+        return True
+
+    def get(self, ktype: str, name: str) -> Optional[Keyword]:
+        return self.by_key.get((ktype, name))
+
+    # ── 추출
+    def sample(
+        self,
+        limit: int,
+        *,
+        room_id: Optional[str] = None,
+        difficulty: Optional[int] = None,
+        rng: Optional[random.Random] = None,
+    ) -> List[Dict[str, Any]]:
+        """타입별로 번갈아 ``limit`` 개 (중복 없음).
+
+        방에서 최근에 쓴 키워드는 새 키워드가 모두 떨어졌을 때만 (오래된 것부터) 쓴다.
+        ``difficulty`` 를 주면 같은 난이도를 먼저 뽑는다 (start_game 의 ``difficulty``).
+        """
+        rng = rng or random
+        difficulty = _difficulty(difficulty)
+        recent = self._recent.get(room_id) if room_id else None
+        stale: Dict[str, List[Keyword]] = {}
+        for key in recent or ():                          # 오래된 것부터
+            k = self.by_key.get(key)
+            if k is not None:
+                stale.setdefault(k.type, []).append(k)
+
+        types = list(self.by_type)
+        rng.shuffle(types)                                # 타입 순서도 매번 섞는다
+        fresh: Dict[str, List[Keyword]] = {}
+        for t in types:
+            pool = [k for k in self.by_type[t] if not recent or k.key not in recent]
+            rng.shuffle(pool)
+            if difficulty is not None:
+                pool.sort(key=lambda k: k.difficulty != difficulty)     # 안정 정렬 → 섞인 순서 유지
+            fresh[t] = pool
+
+        picked: List[Keyword] = []
+        for pools in (fresh, stale):
+            iters = [iter(pools[t]) for t in types if pools.get(t)]
+            while iters and len(picked) < limit:
+                for it in list(iters):
+                    k = next(it, None)
+                    if k is None:
+                        iters.remove(it)
+                        continue
+                    picked.append(k)
+                    if len(picked) >= limit:
+                        break
+
+        if room_id:
+            self.remember(room_id, (k.key for k in picked))
+        return [k.as_dict() for k in picked]
+
+    def remember(self, room_id: str, keys: Iterable[KeywordKey]):
+        recent = self._recent.setdefault(room_id, OrderedDict())
+        for key in keys:
+            recent.pop(key, None)
+            recent[key] = None
+        while len(recent) > KEYWORD_RECENT:
+            recent.popitem(last=False)
+
+    def forget_room(self, room_id: str):
+        self._recent.pop(room_id, None)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "source":    KEYWORD_SOURCE,
+            "version":   self.version,
+            "count":     len(self.items),
+            "by_type":   {t: len(v) for t, v in self.by_type.items()},
+            "loaded_at": self.loaded_at,
+            "path":      str(self.path) if KEYWORD_SOURCE == "memory" else None,
+            "rooms_tracked": len(self._recent),
+        }
+
+catalog = KeywordCatalog()
+
+async def fetch_random_keywords(limit: int, *, room_id: Optional[str] = None, **kw) -> List[Dict[str, Any]]:
+    """start_game 용 키워드 추출. db 모드에서도 추출·최근 회피는 카탈로그에서 한다."""
+    if KEYWORD_SOURCE == "memory":
+        catalog.maybe_reload()
+    else:
+        from db import fetch_all_keywords     # MySQL 은 db 모드에서만 필요
+        catalog.load_rows(await fetch_all_keywords())
+    return catalog.sample(limit, room_id=room_id, **kw)
+
+def reload() -> Dict[str, Any]:
+    """관리 API 용 강제 재적재 (memory: CSV, db: 다음 추출 때 DB 캐시를 새로 읽음)"""
+    if KEYWORD_SOURCE == "memory":
+        catalog.load_csv()
+    else:
+        from db import invalidate_keyword_cache
+        invalidate_keyword_cache()
+    return catalog.status()
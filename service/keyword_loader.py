@@ -5,39 +5,46 @@ BASE_DIR     = Path(__file__).resolve().parent
 DATASET_PATH = BASE_DIR / "keyword_dataset.csv"
 
 import csv
-from sqlalchemy import text
-from db import engine
+import os
+from service.keyword_catalog import KEYWORD_SOURCE, catalog
+
+# replace: TRUNCATE 후 전체 삽입 (기본) / upsert: (keyword_name, keyword_type) 유니크 키 기준 갱신
+# upsert 는 uq_keyword_name_type 제약이 있어야 한다 (README 'DB' 참고)
+KEYWORD_LOAD_MODE = os.getenv("KEYWORD_LOAD_MODE", "replace")
 
 async def load_keywords():
     """
     keyword 테이블을 TRUNCATE 후 CSV 데이터 삽입
+    (KEYWORD_SOURCE=memory 면 DB 없이 카탈로그에만 적재)
     """
+    if KEYWORD_SOURCE == "memory":
+        print(f"✅ 키워드 {catalog.load_csv()}개를 메모리 카탈로그에 로드했습니다.")
+        return
+
+    from db import (
+        KEYWORD_KEY_COLS, bulk_insert, bulk_upsert, connect, invalidate_keyword_cache, keyword_table, truncate,
+    )
     # ── CSV 읽기 ─────────────────────────────────────────────
     with DATASET_PATH.open(encoding="utf-8") as f:
         rows = list(csv.DictReader(f))
 
-    # ── DB 작업 ─────────────────────────────────────────────
-    async with engine.begin() as conn:
-        await conn.execute(text("TRUNCATE TABLE keyword;"))
+    # CSV 헤더 → DB 컬럼 매핑 (camelCase → snake_case)
+    payload = [
+        {
+            "keyword_name":  r["keywordName"].strip(),
+            "keyword_type":  (r.get("keywordType")  or "").strip(),
+            "keyword_alias": (r.get("keywordAlias") or "").strip(),
+        }
+        for r in rows
+    ]
 
-        # CSV 헤더 → DB 컬럼 매핑 (camelCase → snake_case)
-        insert_sql = text(
-            """
-            INSERT INTO keyword (keyword_name, keyword_type, keyword_alias)
-            VALUES (:name, :type, :alias)
-            """
-        )
-
-        for i in range(0, len(rows), BATCH_SIZE):
-            batch = rows[i : i + BATCH_SIZE]
-            payload = [
-                {
-                    "name":  r["keywordName"].strip(),
-                    "type":  (r.get("keywordType")  or "").strip(),
-                    "alias": (r.get("keywordAlias") or "").strip(),
-                }
-                for r in batch
-            ]
-            await conn.execute(insert_sql, payload)
+    # ── DB 작업 ─────────────────────────────────────────────
+    async with connect(begin=True) as conn:
+        if KEYWORD_LOAD_MODE == "upsert":
+            await bulk_upsert(conn, keyword_table, payload, key_cols=KEYWORD_KEY_COLS, batch_size=BATCH_SIZE)
+        else:
+            await truncate(conn, keyword_table)
+            await bulk_insert(conn, keyword_table, payload, batch_size=BATCH_SIZE)
+    invalidate_keyword_cache()
 
     print(f"✅ 키워드 {len(rows)}개를 로드했습니다.")
@@ -0,0 +1,94 @@
+"""startup.py – 기동 단계 타이밍 · 무거운 모듈 워밍업 · readiness 상태
+
+STARTUP_MODE
+------------
+* ``eager`` (기본) : lifespan 안에서 키워드 적재와 무거운 import 를 끝낸 뒤 요청을 받는다.
+* ``lazy``         : 바로 요청을 받기 시작하고, 키워드 적재와 import 워밍업은 백그라운드에서 진행.
+                     워밍업 전에 녹음이 들어오면 해당 모듈은 첫 사용 시점에 import 된다.
+
+``/fast/healthz`` 는 프로세스 생존(liveness), ``/fast/readyz`` 는 워밍업 완료(readiness)를 뜻한다.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib
+import os
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Optional
+
+from monitoring.metrics import gauge
+
+STARTUP_MODE = os.getenv("STARTUP_MODE", "eager")
+
+# librosa(numba)·bs4·aiohttp·rapidfuzz 를 끌고 오는 모듈들.
+# librosa 는 자체 lazy_loader 를 써서 ``import librosa`` 만으로는 numba JIT 이 돌지 않으므로
+# resample 이 실제로 쓰는 librosa.core.audio 까지 올려 둔다 (첫 리샘플 때 수 초씩 루프가 멈추던 원인).
+HEAVY_MODULES = ("audio_utils", "librosa.core.audio", "game.analysis")
+
+PHASE_SECONDS = gauge("startup_phase_seconds", "기동 단계별 소요 시간")
+
+_T0 = time.perf_counter()
+phases: Dict[str, float] = {}
+_state = {"ready": False, "ready_at": None, "error": None}
+_background: Optional[asyncio.Task] = None
+
+@contextmanager
+def phase(name: str):
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases[name] = round(time.perf_counter() - t, 4)
+        PHASE_SECONDS.set(phases[name], phase=name)
+
+def import_heavy():
+    """무거운 모듈을 순서대로 import (이미 로드된 모듈은 즉시 반환)"""
+    for name in HEAVY_MODULES:
+        with phase(f"import:{name}"):
+            importlib.import_module(name)
+
+def mark_ready():
+    _state["ready"] = True
+    _state["ready_at"] = round(time.perf_counter() - _T0, 4)
+    PHASE_SECONDS.set(_state["ready_at"], phase="ready")
+
+async def run(load_keywords: Optional[Callable[[], Awaitable[None]]] = None):
+    """lifespan 에서 호출. eager 면 끝까지 기다리고, lazy 면 백그라운드로 돌린다."""
+    global _background
+    phases["lifespan_start"] = round(time.perf_counter() - _T0, 4)
+
+    async def _load():
+        if load_keywords:
+            with phase("keyword_load"):
+                await load_keywords()
+
+    async def _warm():
+        try:
+            if STARTUP_MODE == "lazy":
+                # 키워드 적재(DB I/O)와 import(스레드)를 겹쳐 진행.
+                # 스레드의 import 도 GIL 을 주기적으로 넘기므로 루프가 통째로 멈추지는 않는다.
+                await asyncio.gather(_load(), asyncio.to_thread(import_heavy))
+            else:
+                await _load()
+                import_heavy()
+            mark_ready()
+        except Exception as e:           # 워밍업 실패는 readiness 로 노출
+            _state["error"] = repr(e)
+            print(f"❌ 기동 워밍업 실패 ({STARTUP_MODE}): {e!r}")
+            if STARTUP_MODE != "lazy":
+                raise                    # eager 는 lifespan 에서 그대로 실패 (lazy 는 아무도 await 하지 않으므로 삼킨다)
+
+    if STARTUP_MODE == "lazy":
+        _background = asyncio.create_task(_warm(), name="startup-warm")
+    else:
+        await _warm()
+
+def report() -> dict:
+    return {
+        "mode":     STARTUP_MODE,
+        "ready":    _state["ready"],
+        "ready_at": _state["ready_at"],
+        "error":    _state["error"],
+        "phases":   dict(phases),
+    }
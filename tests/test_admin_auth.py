@@ -0,0 +1,25 @@
+import pytest
+from fastapi import HTTPException
+
+import admin
+
+def _check(monkeypatch, token, open_, header):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", token)
+    monkeypatch.setattr(admin, "ADMIN_OPEN", open_)
+    admin.require_admin(header)
+
+def test_denied_when_token_unset(monkeypatch):
+    with pytest.raises(HTTPException) as e:
+        _check(monkeypatch, None, False, None)
+    assert e.value.status_code == 403
+
+def test_open_only_with_explicit_flag(monkeypatch):
+    _check(monkeypatch, None, True, None)
+
+@pytest.mark.parametrize("header", [None, "", "wrong"])
+def test_wrong_or_missing_header(monkeypatch, header):
+    with pytest.raises(HTTPException):
+        _check(monkeypatch, "s3cret", False, header)
+
+def test_matching_header(monkeypatch):
+    _check(monkeypatch, "s3cret", False, "s3cret")
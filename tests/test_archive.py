@@ -0,0 +1,29 @@
+from game.archive import TurnArchive, iter_records, read_audio
+
+def _flush(archive: TurnArchive):
+    archive._pool.submit(lambda: None).result()
+
+def test_records_round_trip_with_status(tmp_path):
+    archive = TurnArchive(tmp_path)
+    kw = {"type": "가수", "name": "IU", "alias": []}
+    archive.record(room_id="r", turn=0, keyword=kw, seed="1:0",
+                   trace={"responses": {"acr": {}}, "timings": {"acr": 0.1}},
+                   result={"matched": True, "score": 90}, audio=b"full")
+    archive.record(room_id="r", turn=1, keyword=kw, seed="1:1",
+                   trace={"responses": {"acr": {}}}, result={"matched": False, "score": 0},
+                   audio=b"slow", status="timeout")
+    archive.record(room_id="r", turn=2, keyword=kw, seed="1:2", trace={},
+                   result={"matched": False, "score": 0}, audio=b"", status="error", error="RuntimeError()")
+    _flush(archive)
+
+    recs = list(iter_records(tmp_path))
+    assert [r["status"] for r in recs] == ["ok", "timeout", "error"]
+    assert recs[1]["responses"] == {"acr": {}}
+    assert recs[2]["error"] == "RuntimeError()"
+    assert [read_audio(tmp_path, r) for r in recs] == [b"full", b"slow", b""]
+
+def test_disabled_archive_records_nothing(tmp_path):
+    archive = TurnArchive(None)
+    assert not archive.wants()
+    archive.record(room_id="r", turn=0, keyword={}, seed=None, trace={}, result={}, audio=b"x")
+    assert list(iter_records(tmp_path)) == []
@@ -0,0 +1,48 @@
+import random
+from collections import Counter
+
+from service.keyword_catalog import Keyword, KeywordCatalog
+
+def _catalog(items):
+    cat = KeywordCatalog()
+    cat._install(items)
+    return cat
+
+def test_same_name_with_different_types_are_distinct():
+    cat = _catalog([Keyword("제목", "비", []), Keyword("가수", "비", ["Rain"])])
+    assert len(cat.by_key) == 2
+    assert cat.get("가수", "비").alias == ("Rain",)
+    assert cat.get("제목", "비").alias == ()
+
+    picked = cat.sample(2, room_id="r", rng=random.Random(0))
+    assert {(k["type"], k["name"]) for k in picked} == {("제목", "비"), ("가수", "비")}
+    # 한쪽만 최근에 썼으면 다른 쪽은 여전히 새 키워드
+    cat.forget_room("r")
+    cat.remember("r", [("제목", "비")])
+    assert cat.sample(1, room_id="r", rng=random.Random(0)) == [{"type": "가수", "name": "비", "alias": ["Rain"]}]
+
+def test_sample_alternates_types_without_duplicates():
+    items = [Keyword("가수", f"a{i}", []) for i in range(10)] + [Keyword("제목", f"t{i}", []) for i in range(10)]
+    picked = _catalog(items).sample(8, rng=random.Random(1))
+    assert len({(k["type"], k["name"]) for k in picked}) == 8
+    assert Counter(k["type"] for k in picked) == {"가수": 4, "제목": 4}
+
+def test_recent_keywords_are_used_last():
+    items = [Keyword("가수", f"a{i}", []) for i in range(4)]
+    cat = _catalog(items)
+    first = cat.sample(3, room_id="r", rng=random.Random(2))
+    second = cat.sample(3, room_id="r", rng=random.Random(3))
+    left = {"a0", "a1", "a2", "a3"} - {k["name"] for k in first}
+    assert second[0]["name"] in left
+    assert second[1]["name"] == first[0]["name"]       # 그다음은 가장 오래된 최근 키워드부터
+
+def test_difficulty_is_preferred_and_parsed():
+    items = [Keyword("가수", f"e{i}", [], 1) for i in range(5)] + [Keyword("가수", f"h{i}", [], 3) for i in range(2)]
+    picked = _catalog(items).sample(2, difficulty="3", rng=random.Random(4))
+    assert {k["name"] for k in picked} == {"h0", "h1"}
+
+def test_csv_loads_duplicate_names():
+    cat = KeywordCatalog()
+    n = cat.load_csv()
+    assert n == len(cat.by_key) == len(cat.items)
+    assert cat.get("제목", "태양") is not None and cat.get("가수", "태양") is not None
@@ -0,0 +1,78 @@
+import asyncio
+import csv
+import os
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="fast-db-")
+os.environ.setdefault("FAST_DATABASE_URL", f"sqlite+aiosqlite:///{_DB_DIR}/fast.db")
+
+import db                                   # noqa: E402  (엔진은 import 시점의 URL 로 만들어진다)
+from service import keyword_loader          # noqa: E402
+
+def _run(coro):
+    async def main():
+        try:
+            await db.create_schema()
+            return await coro
+        finally:
+            await db.engine.dispose()
+    return asyncio.run(main())
+
+async def _rows():
+    async with db.connect() as conn:
+        result = await conn.execute(db.SELECT_KEYWORDS)
+        return sorted(tuple(r) for r in result.all())
+
+async def _reset():
+    async with db.connect(begin=True) as conn:
+        await db.truncate(conn, db.keyword_table)
+
+def test_bulk_insert_batches():
+    async def body():
+        await _reset()
+        rows = [{"keyword_name": f"k{i}", "keyword_type": "제목", "keyword_alias": ""} for i in range(25)]
+        async with db.connect(begin=True) as conn:
+            await db.bulk_insert(conn, db.keyword_table, rows, batch_size=7)
+        return await _rows()
+    assert len(_run(body())) == 25
+
+def test_bulk_upsert_keys_on_name_and_type():
+    async def body():
+        await _reset()
+        first = [
+            {"keyword_name": "비", "keyword_type": "제목", "keyword_alias": ""},
+            {"keyword_name": "비", "keyword_type": "가수", "keyword_alias": "Rain"},
+        ]
+        again = [{"keyword_name": "비", "keyword_type": "가수", "keyword_alias": "Rain|정지훈"}]
+        async with db.connect(begin=True) as conn:
+            await db.bulk_upsert(conn, db.keyword_table, first, key_cols=db.KEYWORD_KEY_COLS)
+            await db.bulk_upsert(conn, db.keyword_table, again, key_cols=db.KEYWORD_KEY_COLS)
+        return await _rows()
+    assert _run(body()) == [("가수", "비", "Rain|정지훈"), ("제목", "비", "")]
+
+def test_upsert_load_keeps_every_csv_row(monkeypatch):
+    monkeypatch.setattr(keyword_loader, "KEYWORD_SOURCE", "db")
+    monkeypatch.setattr(keyword_loader, "KEYWORD_LOAD_MODE", "upsert")
+    with keyword_loader.DATASET_PATH.open(encoding="utf-8") as f:
+        expected = {(r["keywordType"].strip(), r["keywordName"].strip()) for r in csv.DictReader(f)}
+
+    async def body():
+        await _reset()
+        await keyword_loader.load_keywords()
+        await keyword_loader.load_keywords()            # 두 번 적재해도 중복이 생기지 않는다
+        return await _rows()
+    rows = _run(body())
+    assert len(rows) == len(expected)
+    assert {(t, n) for t, n, _ in rows} == expected
+    assert ("제목", "태양") in expected and ("가수", "태양") in expected
+
+def test_fetch_all_keywords_splits_alias():
+    async def body():
+        await _reset()
+        async with db.connect(begin=True) as conn:
+            await db.bulk_insert(conn, db.keyword_table, [
+                {"keyword_name": "IU", "keyword_type": "가수", "keyword_alias": "아이유 | IU"},
+            ])
+        db.invalidate_keyword_cache()
+        return await db.fetch_all_keywords()
+    assert _run(body()) == [{"type": "가수", "name": "IU", "alias": ["아이유", "IU"]}]
@@ -0,0 +1,49 @@
+import asyncio
+import copy
+import threading
+import time
+
+from monitoring.loop_monitor import LoopMonitor
+
+def _run_in_thread(coro):
+    t = threading.Thread(target=asyncio.run, args=(coro,))
+    t.start()
+    t.join(timeout=10)
+
+def test_stall_keeps_handler_frame_under_deep_library_stack():
+    mon = LoopMonitor(interval=0.02, threshold=0.1, stack_limit=5)
+    nested: list = []
+    for _ in range(300):                      # copy.deepcopy 재귀 → 프로젝트 밖 프레임 수백 개
+        nested = [nested]
+
+    async def slow_handler():
+        mon.start()
+        await asyncio.sleep(0.1)
+        until = time.monotonic() + 0.6
+        while time.monotonic() < until:
+            copy.deepcopy(nested)
+        await asyncio.sleep(0.1)
+        mon.stop()
+
+    _run_in_thread(slow_handler())
+
+    assert mon.stalls
+    rec = mon.stalls[-1]
+    assert rec["handler"] == "slow_handler"
+    assert rec["task"] is not None
+    assert len(rec["stack"]) <= 6             # 안쪽 stack_limit 개 + 핸들러
+
+def test_lag_summary_and_reset():
+    mon = LoopMonitor(interval=0.01, threshold=1.0)
+
+    async def run():
+        mon.start()
+        await asyncio.sleep(0.1)
+        mon.stop()
+
+    _run_in_thread(run())
+    summary = mon.lag_summary()
+    assert summary["samples"] > 0
+    assert summary["p50"] <= summary["p99"] <= summary["max"]
+    mon.reset()
+    assert mon.lag_summary()["samples"] == 0
@@ -0,0 +1,66 @@
+import asyncio
+
+from main import listen_acks             # main 이 이벤트 모듈까지 먼저 올린다 (순환 import)
+from game import phases
+
+def test_gate_opens_when_all_ack_or_leave():
+    async def body():
+        gate = phases.PhaseGate("listen", {"a", "b"})
+        assert not gate._event.is_set()
+        assert not gate.ack("stranger")
+        assert gate.ack("a")
+        assert not gate._event.is_set()
+        gate.discard("b")                     # 나간 플레이어는 기다리지 않는다
+        await asyncio.wait_for(gate.wait(), 0.1)
+    asyncio.run(body())
+
+def test_empty_gate_is_open():
+    async def body():
+        await asyncio.wait_for(phases.PhaseGate("result", []).wait(), 0.1)
+    asyncio.run(body())
+
+def test_hold_returns_early_after_min_and_ignores_stale_phase(monkeypatch):
+    monkeypatch.setattr(phases, "ADAPTIVE_PHASES", True)
+    monkeypatch.setattr(phases, "PHASE_MIN_SEC", 0.05)
+
+    async def body():
+        task = asyncio.create_task(phases.hold("room", "listen", 5, {"a"}))
+        await asyncio.sleep(0.01)
+        assert not phases.ack("room", "a", "result")      # 이전 페이즈 ack 는 무시
+        assert phases.ack("room", "a", "listen")
+        took = await task
+        assert 0.05 <= took < 1
+        assert "room" not in listen_acks
+    asyncio.run(body())
+
+def test_hold_times_out(monkeypatch):
+    monkeypatch.setattr(phases, "ADAPTIVE_PHASES", True)
+
+    async def body():
+        return await phases.hold("room", "keyword", 0.05, {"a"})
+    assert asyncio.run(body()) >= 0.05
+    assert "room" not in listen_acks
+
+def test_hold_ends_when_turn_player_leaves(monkeypatch):
+    for adaptive in (True, False):
+        monkeypatch.setattr(phases, "ADAPTIVE_PHASES", adaptive)
+        monkeypatch.setattr(phases, "PHASE_MIN_SEC", 0.05)
+
+        async def body():
+            task = asyncio.create_task(phases.hold("room", "keyword", 5, {"a"}))
+            await asyncio.sleep(0.01)
+            phases.discard("room", "a")               # leave_room 이 부르는 것과 같다
+            return await task
+        took = asyncio.run(body())
+        assert took < 1, adaptive
+        assert "room" not in listen_acks
+
+def test_hold_ignores_acks_when_not_adaptive(monkeypatch):
+    monkeypatch.setattr(phases, "ADAPTIVE_PHASES", False)
+
+    async def body():
+        task = asyncio.create_task(phases.hold("room", "listen", 0.2, {"a"}))
+        await asyncio.sleep(0.01)
+        assert not phases.ack("room", "a", "listen")
+        return await task
+    assert asyncio.run(body()) >= 0.2
@@ -0,0 +1,108 @@
+from game.room_index import RoomIndex
+
+def _all_pages(index, phase=None, limit=3):
+    out, cursor = [], None
+    while True:
+        total, ids, cursor = index.page(phase, cursor, limit)
+        out += ids
+        if cursor is None:
+            return total, out
+
+def test_phase_moves_and_counts():
+    idx = RoomIndex()
+    for r in ("a", "b", "c"):
+        idx.set_phase(r, "waiting")
+    idx.set_phase("b", "record")
+    idx.set_phase("b", "record")                      # 같은 페이즈는 무시
+    assert idx.counts() == {"waiting": 2, "record": 1}
+    assert idx.phase_of("b") == "record"
+    idx.remove("b")
+    idx.remove("missing")
+    assert idx.counts() == {"waiting": 2}
+    assert len(idx) == 2
+
+def test_cursor_pages_cover_everything_in_order():
+    idx = RoomIndex()
+    for i in range(10):
+        idx.set_phase(f"r{i}", "waiting")
+    for i in range(0, 10, 3):
+        idx.set_phase(f"r{i}", "listen")              # 페이즈에 들어온 순서대로
+    total, ids = _all_pages(idx)
+    assert total == 10 and ids == [f"r{i}" for i in range(10)]
+    assert _all_pages(idx, "listen", 2) == (4, ["r0", "r3", "r6", "r9"])
+    assert _all_pages(idx, "waiting") == (6, ["r1", "r2", "r4", "r5", "r7", "r8"])
+    assert idx.page("missing") == (0, [], None)
+
+def test_cursor_stays_valid_across_removals_and_compaction():
+    idx = RoomIndex()
+    for i in range(200):
+        idx.set_phase(f"r{i}", "waiting")
+    total, first, cursor = idx.page(None, None, 50)
+    for i in range(0, 150):                           # 빈 자리 > 절반 → 압축
+        idx.remove(f"r{i}")
+    total, ids, _ = idx.page(None, cursor, 10)
+    assert total == 50 and ids == [f"r{i}" for i in range(150, 160)]
+
+class _CountingList(list):
+    """페이지가 실제로 들여다본 자리 수를 센다"""
+    reads = 0
+
+    def __getitem__(self, i):
+        _CountingList.reads += 1
+        return super().__getitem__(i)
+
+def test_deep_page_does_not_scan_from_start():
+    idx = RoomIndex()
+    for i in range(10_000):
+        idx.set_phase(f"r{i}", "waiting")
+    _, _, cursor = idx.page("waiting", None, 9_990)
+    bucket = idx._by_phase["waiting"]
+    bucket.ids = _CountingList(bucket.ids)
+    _CountingList.reads = 0
+    _, ids, _ = idx.page("waiting", cursor, 10)
+    assert ids == [f"r{i}" for i in range(9_990, 10_000)]
+    assert _CountingList.reads == 10                  # 앞쪽 9,990 개는 건너뛰지 않고 아예 보지 않는다
+
+def test_cursor_pages_are_disjoint_and_cover_every_room():
+    idx = RoomIndex()
+    for i in range(1_000):
+        idx.set_phase(f"r{i}", "waiting")
+    seen, cursor = [], None
+    while True:
+        _, ids, cursor = idx.page(None, cursor, 7)
+        assert not set(ids) & set(seen)
+        seen += ids
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(f"r{i}" for i in range(1_000))
+
+def test_finished_game_does_not_revive_an_emptied_room(monkeypatch):
+    import asyncio
+    import main                              # 순환 import – main 이 game.rounds 를 먼저 올린다
+    from game import phases, rounds
+    from game.room_index import room_index
+
+    for name in ("KW_LEN", "RECORD_LEN", "LISTEN_LEN", "RESULT_LEN"):
+        monkeypatch.setattr(rounds, name, 0.05)
+    monkeypatch.setattr(phases, "PHASE_MIN_SEC", 0.0)
+    monkeypatch.setattr(rounds, "schedule_prefetch", lambda room_id: None)
+
+    async def body():
+        main.rooms["ghost"] = {
+            "users": {"a": {"nickname": "A", "ready": True}}, "order": ["a"], "host": "a",
+            "state": "playing", "max_rounds": 1, "scores": {"a": 0},
+            "keywords": [{"type": "가수", "name": "IU"}], "kw_idx": 0,
+        }
+        room_index.set_phase("ghost", "waiting")
+        game = asyncio.create_task(rounds.run_rounds("ghost"))
+        await asyncio.sleep(0.01)                   # keyword 페이즈 중에 마지막 플레이어가 나간다 (leave_room 과 같은 순서)
+        main.rooms["ghost"]["users"].pop("a")
+        main.rooms["ghost"]["order"] = []
+        phases.discard("ghost", "a")
+        main.rooms.pop("ghost")
+        room_index.remove("ghost")
+        await asyncio.wait_for(game, 2)
+
+    asyncio.run(body())
+    assert "ghost" not in main.rooms
+    assert room_index.phase_of("ghost") is None
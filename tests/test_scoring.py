@@ -0,0 +1,44 @@
+from game.scoring import KeywordMatcher, ScoreEngine, matcher_for
+
+def _hum(title, artist, score):
+    return {"title": title, "artists": [{"name": artist}], "score": score}
+
+def test_same_seed_same_scores():
+    tracks = [_hum("Psycho", "Red Velvet", 0.9)]
+    m = matcher_for({"type": "가수", "name": "Red Velvet", "alias": "레드벨벳|redvelvet"})
+    a = [ScoreEngine("42:0").best_acr(m, tracks)["score"] for _ in range(5)]
+    assert len(set(a)) == 1
+    assert 81 <= a[0] <= 100
+
+def test_score_ranges():
+    engine = ScoreEngine(1)
+    for sim in (0.0, 0.5, 1.0, 2.0):
+        assert 81 <= engine.score_acr(sim) <= 100
+        assert 61 <= engine.score_stt(sim) <= 80
+
+def test_artist_match_normalizes_features_and_aliases():
+    m = KeywordMatcher({"type": "가수", "name": "아이유", "alias": ["IU"]})
+    assert m.match("Blueming", "아이유")
+    assert m.match("Blueming", "아이유 (IU), 다른 가수")
+    assert m.match("Blueming", "IU feat. Someone")
+    assert not m.match("아이유", "Someone Else")
+
+def test_title_match_is_substring():
+    m = KeywordMatcher({"type": "제목", "name": "비", "alias": []})
+    assert m.match("비 오는 날", "누구")
+    assert not m.match("Sunny", "비")
+
+def test_best_acr_picks_highest_matching_track():
+    m = matcher_for({"type": "가수", "name": "IU"})
+    tracks = [_hum("A", "Other", 0.99), _hum("B", "IU", 0.4), _hum("C", "IU", 0.7)]
+    best = ScoreEngine(0).best_acr(m, tracks)
+    assert best["title"] == "C" and best["sim"] == 0.7
+    assert ScoreEngine(0).best_acr(m, [_hum("A", "Other", 0.9)]) is None
+
+def test_best_stt_prefers_lyrics_overlap():
+    m = matcher_for({"type": "가수", "name": "IU"})
+    cands = [("Blueming", "IU"), ("Palette", "IU"), ("Other", "Someone")]
+    best = ScoreEngine(0).best_stt(m, "palette iu 노래", cands)
+    assert best["title"] == "Palette" and best["title_in"]
+    assert 61 <= best["score"] <= 80
+    assert ScoreEngine(0).best_stt(m, "", [("x", "Someone")]) is None
@@ -0,0 +1,35 @@
+import pytest
+from socketio import packet
+
+from websocket import serializer
+from websocket.serializer import ENCODE_BYTES, MeteredPacket
+
+@pytest.fixture
+def always_sample(monkeypatch):
+    monkeypatch.setattr(serializer, "SIO_DEFLATE_SAMPLE", 1.0)
+    calls = []
+    monkeypatch.setattr(serializer.DEFLATE_RATIO, "observe", lambda v, **kw: calls.append((kw["event"], v)))
+    return calls
+
+def test_json_packet_counts_bytes_and_samples_text(always_sample):
+    pkt = MeteredPacket(packet.EVENT, data=["round_result", {"title": "비" * 200}])
+    encoded = pkt.encode()
+    assert isinstance(encoded, str)
+    assert ENCODE_BYTES.value(event="round_result") >= len(encoded.encode())
+    assert [e for e, _ in always_sample] == ["round_result"]
+    assert always_sample[0][1] < 0.5
+
+def test_json_binary_attachment_is_not_sampled(always_sample):
+    audio = bytes(range(256)) * 64
+    pkt = MeteredPacket(packet.EVENT, data=["listen_phase", {"audio": audio}])
+    parts = pkt.encode()
+    assert isinstance(parts, list) and len(parts) == 2
+    # 첫 파트(텍스트 자리표시자)만 압축해 본다
+    assert len(always_sample) == 1
+
+def test_msgpack_packet_with_audio_is_skipped(always_sample):
+    pytest.importorskip("msgpack")
+    cls = serializer._msgpack_class()
+    cls(packet.EVENT, data=["submit_echo", {"audio": b"\x00" * 4096}]).encode()
+    cls(packet.EVENT, data=["round_result", {"title": "비" * 200}]).encode()
+    assert [e for e, _ in always_sample] == ["round_result"]
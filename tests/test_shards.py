@@ -0,0 +1,26 @@
+import asyncio
+
+import pytest
+
+from game.shards import SHARD_JOBS, Shard, ShardError, shard_of
+
+def test_shard_of_is_stable():
+    assert shard_of("room-1", 4) == shard_of("room-1", 4)
+    assert {shard_of(f"r{i}", 4) for i in range(100)} == {0, 1, 2, 3}
+
+def test_control_jobs_are_not_counted_and_errors_surface():
+    shard = Shard(99)
+
+    async def body():
+        try:
+            stats = await asyncio.wait_for(shard.call("stats", (), control=True), 60)
+            assert isinstance(stats, dict)
+            assert shard.jobs == 0 and shard.inflight == 0
+            assert SHARD_JOBS.value(shard="99", kind="stats") == 0
+
+            with pytest.raises(ShardError):
+                await asyncio.wait_for(shard.call("bogus", ()), 60)
+            assert shard.jobs == 1 and shard.inflight == 0
+        finally:
+            shard.stop()
+    asyncio.run(body())
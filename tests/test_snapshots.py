@@ -0,0 +1,67 @@
+import pytest
+
+from game.snapshots import FileSnapshotStore, SQLiteSnapshotStore, Snapshotter
+
+def _room():
+    return {
+        "users": {
+            "sid-a": {"id": "u1", "nickname": "가", "avatar": 1},
+            "sid-b": {"id": "u2", "nickname": "나", "avatar": 2},
+        },
+        "host": "sid-a",
+        "order": ["sid-b", "sid-a"],
+        "scores": {"sid-a": 10, "sid-b": 0},
+        "keywords": [{"type": "가수", "name": "IU", "alias": []}],
+        "seed": 1234,
+        "max_rounds": 3,
+        "round": 1, "turn": 1, "kw_idx": 1,
+        "phase": "record", "deadline": 100.0,
+    }
+
+@pytest.fixture(params=["file", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "file":
+        return FileSnapshotStore(tmp_path / "snap")
+    return SQLiteSnapshotStore(str(tmp_path / "snap.db"))
+
+def _flush(snap: Snapshotter):
+    snap._pool.submit(lambda: None).result()
+
+def test_round_trip_by_user_id(store):
+    snap = Snapshotter(store)
+    snap.snapshot("room/1", _room())
+    _flush(snap)
+    loaded = Snapshotter(store).load()["room/1"]
+    assert loaded["seed"] == 1234
+    assert loaded["host"] == "u1"
+    assert loaded["order"] == ["u2", "u1"]
+    assert loaded["scores"] == {"u1": 10, "u2": 0}
+    assert loaded["players"]["u2"]["nickname"] == "나"
+    assert loaded["phase"] == "record"
+
+def test_unchanged_parts_are_skipped(store, monkeypatch):
+    snap = Snapshotter(store)
+    saved = []
+    monkeypatch.setattr(store, "save", lambda room_id, part, data: saved.append(part))
+    room = _room()
+    snap.snapshot("r", room)
+    snap.snapshot("r", room)
+    room["phase"] = "listen"
+    snap.snapshot("r", room)
+    _flush(snap)
+    assert saved == ["meta", "progress", "progress"]
+
+def test_forget_deletes_and_resets_digest(store):
+    snap = Snapshotter(store)
+    snap.snapshot("r", _room())
+    snap.forget("r")
+    _flush(snap)
+    assert snap.load() == {}
+    snap.snapshot("r", _room())          # 다이제스트가 지워졌으므로 다시 기록
+    _flush(snap)
+    assert "r" in snap.load()
+
+def test_disabled_snapshotter_is_noop():
+    snap = Snapshotter(None)
+    snap.snapshot("r", _room())
+    assert snap.load() == {}
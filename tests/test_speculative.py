@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+
+from game import speculative
+from game.speculative import _Budget
+
+def test_budget_is_refilled_by_analyses_not_time():
+    b = _Budget(ratio=0.5, burst=2)
+    assert b.take() and b.take()
+    assert not b.take()
+    b.earn()
+    assert not b.take()                 # 0.5 개로는 부족
+    b.earn()
+    assert b.take()
+    for _ in range(10):
+        b.earn()
+    assert b.tokens == 2                # burst 상한
+
+@pytest.fixture
+def fresh(monkeypatch):
+    monkeypatch.setattr(speculative, "SPECULATIVE", True)
+    monkeypatch.setattr(speculative, "SPECULATIVE_MIN_SEC", 5.0)
+    monkeypatch.setattr(speculative, "SPECULATIVE_BURST", 1.0)
+    monkeypatch.setattr(speculative, "_budget", _Budget(1.0, 1.0))
+    monkeypatch.setattr(speculative, "_turns", {})
+    monkeypatch.setattr(speculative, "_running", set())
+    monkeypatch.setattr(speculative, "_full_inflight", 0)
+
+async def _analyze(prefix, keyword, **kw):
+    await asyncio.sleep(0)
+    return {"matched": True, "prefix": prefix}
+
+def _open(key):
+    speculative.open_turn(key, "room", "sid", {"type": "가수", "name": "IU"}, "1:0")
+    return speculative._turns[key]
+
+def test_elapsed_is_measured_on_the_server(fresh):
+    async def body():
+        spec = _open("k")
+        speculative.feed("k", "sid", b"a" * 10, _analyze)        # 방금 record_begin → 아직 이르다
+        assert spec.task is None
+        spec.t0 -= 6                                             # 6초 지남
+        speculative.feed("k", "sid", b"b", _analyze)
+        assert spec.task is not None
+        taken = speculative.take("k")
+        await taken.task
+        assert taken.confident()["prefix"] == b"a" * 10 + b"b"
+    asyncio.run(body())
+
+def test_budget_limits_launches_until_full_analyses_run(fresh):
+    async def body():
+        first, second = _open("k1"), _open("k2")
+        first.t0 = second.t0 = first.t0 - 6
+        speculative.feed("k1", "sid", b"x", _analyze)
+        speculative.feed("k2", "sid", b"x", _analyze)
+        assert first.task is not None
+        assert second.task is None and second.closed             # 예산 소진
+        await first.task
+
+        third = _open("k3")
+        third.t0 -= 6
+        with speculative.full_analysis():                        # 전체 분석이 돌면 토큰이 쌓인다
+            assert speculative.status()["full_inflight"] == 1
+            speculative.feed("k3", "sid", b"x", _analyze)
+        assert third.task is not None
+        await third.task
+        assert speculative.status()["full_inflight"] == 0
+    asyncio.run(body())
+
+def test_other_players_chunks_are_ignored(fresh):
+    async def body():
+        spec = _open("k")
+        speculative.feed("k", "someone-else", b"x", _analyze)
+        assert spec.nbytes == 0
+        speculative.drop("k")
+    asyncio.run(body())
+
+def test_confident_does_not_wait_for_a_running_prefix(fresh):
+    async def slow(prefix, keyword, **kw):
+        await asyncio.sleep(0.2)
+        return {"matched": True}
+
+    async def body():
+        spec = _open("k")
+        spec.t0 -= 6
+        speculative.feed("k", "sid", b"x", slow)
+        assert speculative.take("k").confident() is None      # 진행 중 → 바로 None
+        assert not spec.task.cancelled()                         # 이미 보낸 호출은 마저 끝낸다
+        assert (await spec.task)["matched"]
+    asyncio.run(body())
+
+def _submit(monkeypatch, prefix_sec, full_sec):
+    """submit_recording 을 앞부분·전체 분석 지연만 바꿔 돌려 (판정, 전체 분석 취소 여부)"""
+    from main import round_buffer     # 순환 import – main 이 websocket.events 를 먼저 올린다
+    from websocket import events
+
+    full_cancelled = []
+
+    async def prefix(raw, keyword, **kw):
+        await asyncio.sleep(prefix_sec)
+        return {"matched": True, "source": "prefix"}
+
+    async def full(raw, keyword, **kw):
+        try:
+            await asyncio.sleep(full_sec)
+        except asyncio.CancelledError:
+            full_cancelled.append(True)
+            raise
+        return {"matched": True, "source": "full"}
+
+    async def convert(raw, **kw):
+        return b"wav"
+
+    monkeypatch.setattr(events, "convert_format_async", convert)
+    monkeypatch.setattr(events, "analyze_recording", full)
+
+    async def body():
+        key = "room:sid:0"
+        spec = _open(key)
+        spec.t0 -= 6
+        speculative.feed(key, "sid", b"x", prefix)
+        await events.handle_submit_recording("sid", {
+            "roomId": "room", "playerSid": "sid", "turn": 0, "keyword": spec.keyword, "audio": b"x",
+        })
+        result = await round_buffer.pop(key)["future"]
+        await asyncio.sleep(0)
+        return result, bool(full_cancelled), spec.task.cancelled()
+    return asyncio.run(body())
+
+def test_confident_prefix_cancels_the_concurrent_full_analysis(fresh, monkeypatch):
+    result, full_cancelled, prefix_cancelled = _submit(monkeypatch, prefix_sec=0.05, full_sec=5)
+    assert result["source"] == "prefix"
+    assert full_cancelled and not prefix_cancelled
+
+def test_full_analysis_wins_when_prefix_is_slower(fresh, monkeypatch):
+    result, full_cancelled, prefix_cancelled = _submit(monkeypatch, prefix_sec=0.3, full_sec=0.05)
+    assert result["source"] == "full"
+    assert not full_cancelled and not prefix_cancelled
@@ -0,0 +1,24 @@
+import asyncio
+
+import startup
+
+def test_lazy_warm_failure_is_stored_not_raised(monkeypatch):
+    monkeypatch.setattr(startup, "STARTUP_MODE", "lazy")
+    monkeypatch.setattr(startup, "HEAVY_MODULES", ())
+    monkeypatch.setitem(startup._state, "error", None)
+    monkeypatch.setitem(startup._state, "ready", False)
+
+    async def broken_load():
+        raise RuntimeError("db down")
+
+    async def main():
+        await startup.run(broken_load)
+        task = startup._background
+        await asyncio.gather(task, return_exceptions=True)
+        return task
+
+    task = asyncio.run(main())
+    assert task.exception() is None
+    report = startup.report()
+    assert report["ready"] is False
+    assert "db down" in report["error"]
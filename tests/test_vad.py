@@ -0,0 +1,58 @@
+import io
+
+import numpy as np
+import soundfile as sf
+
+import audio_utils
+from audio_utils import _to_wav, prepare_recording, trim_silence
+
+SR = 16_000
+
+def _wav(y, sr=SR) -> bytes:
+    buf = io.BytesIO()
+    sf.write(buf, y.astype(np.float32), sr, format="WAV", subtype="PCM_16")
+    return buf.getvalue()
+
+def _read(wav: bytes):
+    return sf.read(io.BytesIO(wav), dtype="float32")
+
+def _tone(sec, amp, sr=SR, freq=440.0):
+    t = np.arange(int(sec * sr)) / sr
+    return (amp * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+def test_trim_silence_keeps_voiced_span_with_padding():
+    rng = np.random.default_rng(0)
+    y = np.concatenate([
+        rng.normal(0, 1e-4, SR).astype(np.float32),     # 1초 무음
+        _tone(1.0, 0.3),
+        rng.normal(0, 1e-4, 2 * SR).astype(np.float32),  # 2초 무음
+    ])
+    trimmed, voiced = trim_silence(y, SR)
+    pad = audio_utils.VAD_PAD_MS / 1000
+    assert 0.9 <= voiced <= 1.1
+    assert 1.0 <= len(trimmed) / SR <= 1.0 + 2 * pad + 0.1
+
+def test_trim_silence_all_silent():
+    trimmed, voiced = trim_silence(np.zeros(SR, dtype=np.float32), SR)
+    assert voiced == 0.0 and len(trimmed) == 0
+
+def test_prepare_recording_silent_is_empty():
+    out = prepare_recording(_wav(np.zeros(SR, dtype=np.float32)))
+    assert out["empty"] and out["stt"] is None and out["hum"] is None
+
+def test_prepare_recording_normalized_outputs_stay_in_range():
+    # 조용한 44.1 kHz 사각파: 리샘플할 때마다 피크가 달라지므로 출력마다 따로 정규화돼야 한다
+    sr = 44_100
+    t = np.arange(2 * sr) / sr
+    y = (0.2 * np.sign(np.sin(2 * np.pi * 300 * t))).astype(np.float32)
+    out = prepare_recording(_wav(y, sr))
+    assert not out["empty"]
+    for key, want_sr in (("stt", 16_000), ("hum", 8_000)):
+        data, got_sr = _read(out[key])
+        assert got_sr == want_sr
+        assert 0.99 < np.max(np.abs(data)) <= 1.0
+
+def test_to_wav_clips_instead_of_wrapping():
+    data, _ = _read(_to_wav(np.array([1.5, -1.5, 0.5], dtype=np.float32), SR))
+    assert data[0] > 0.99 and data[1] < -0.99
+    assert abs(data[2] - 0.5) < 1e-3
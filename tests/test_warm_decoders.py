@@ -0,0 +1,54 @@
+import asyncio
+
+import audio_utils
+
+def test_warm_decoders_runs_once_per_process(monkeypatch):
+    calls = []
+
+    async def fake(raw, **kw):
+        calls.append(len(raw))
+        return b""
+
+    monkeypatch.setattr(audio_utils, "_decoders_warm", False)
+    monkeypatch.setattr(audio_utils, "convert_format_async", fake)
+    monkeypatch.setattr(audio_utils, "prepare_recording_async", fake)
+
+    async def main():
+        await audio_utils.warm_decoders()
+        first = len(calls)
+        await audio_utils.warm_decoders()
+        await audio_utils.warm_decoders()
+        return first
+
+    first = asyncio.run(main())
+    assert first == audio_utils.DECODE_WORKERS
+    assert len(calls) == first
+
+def test_warm_decoders_retries_after_failure(monkeypatch):
+    async def broken(raw, **kw):
+        raise RuntimeError("decoder")
+
+    monkeypatch.setattr(audio_utils, "_decoders_warm", False)
+    monkeypatch.setattr(audio_utils, "convert_format_async", broken)
+    monkeypatch.setattr(audio_utils, "prepare_recording_async", broken)
+    try:
+        asyncio.run(audio_utils.warm_decoders())
+    except RuntimeError:
+        pass
+    assert audio_utils._decoders_warm is False
+
+def test_warm_decoders_reaches_hum_resample(monkeypatch):
+    targets = []
+    real = audio_utils._resample
+
+    def spy(y, orig_sr, target_sr):
+        targets.append(target_sr)
+        return real(y, orig_sr, target_sr)
+
+    monkeypatch.setattr(audio_utils, "_decoders_warm", False)
+    monkeypatch.setattr(audio_utils, "_warm_wav", None)
+    monkeypatch.setattr(audio_utils, "_resample", spy)
+    asyncio.run(audio_utils.warm_decoders())
+
+    assert audio_utils.TARGET_SR_HUM in targets     # VAD 를 통과해 8 kHz 까지 갔다
+    assert audio_utils.prepare_recording(audio_utils._warm_wav)["empty"] is False
@@ -2,15 +2,46 @@ import sys
 sys.path.append("./.venv/Lib/site-packages")
 import asyncio
 import base64
+import os
 import random
 from main import sio, rooms, round_buffer, round_events
-from audio_utils import convert_format
 from utils import broadcast_room_update
-from game.analysis import analyze_recording
-from game.rounds import run_rounds
-from db import fetch_random_keywords
+from game.rounds import (
+    run_rounds, schedule_prefetch, enter_phase, turn_seed, INTRO_LEN, FAILED_RESULT, ANALYSIS_TIMEOUT_MSG,
+)
+from game.snapshots import snapshotter
+from game.room_index import room_index
+from game.archive import turn_archive
+from game import phases, speculative
+from game.shards import shard_router, ShardDown
+from service.keyword_catalog import catalog, fetch_random_keywords
 
-# rooms, round_buffer, round_events, listen_acks 등은 main.py에서 import 하거나 별도 관리 필요
+# 클라이언트가 start_game 에 seed 를 실어 보내도 기본은 무시 (판정 보정값을 미리 알 수 있게 되므로)
+# 로컬 재현·벤치마크용으로만 ALLOW_CLIENT_SEED=1
+ALLOW_CLIENT_SEED = os.getenv("ALLOW_CLIENT_SEED", "0") == "1"
+
+# audio_utils(librosa)·game.analysis(aiohttp·bs4·rapidfuzz)는 무거워서 첫 사용 때 import
+# (startup.py 가 기동 후 백그라운드로 미리 워밍업한다)
+# ANALYSIS_SHARDS 가 설정되면 room_id 로 정한 샤드 프로세스에서 처리하고, 샤드가 죽었으면 여기서 처리
+async def convert_format_async(raw_bytes: bytes, *, room_id: str | None = None, **kw) -> bytes:
+    if room_id is not None and shard_router.enabled:
+        try:
+            return await shard_router.convert(room_id, raw_bytes, **kw)
+        except ShardDown as e:
+            print(f"⚠️ {e} → 로컬 변환")
+    from audio_utils import convert_format_async as _convert_format_async
+    return await _convert_format_async(raw_bytes, **kw)
+
+async def analyze_recording(raw: bytes, keyword: dict, *, room_id: str | None = None, **kw) -> dict:
+    if room_id is not None and shard_router.enabled:
+        try:
+            return await shard_router.analyze(room_id, raw, keyword, **kw)
+        except ShardDown as e:
+            print(f"⚠️ {e} → 로컬 분석")
+    from game.analysis import analyze_recording as _analyze_recording
+    return await _analyze_recording(raw, keyword, **kw)
+
+# rooms, round_buffer, round_events 는 main.py 에서 import (listen_acks 는 game.phases 가 관리)
 
 # 이벤트 핸들러 함수들 (main.py에서 복사)
 # ... (핸들러 함수들 복사 및 필요시 의존성 import) 
@@ -27,10 +58,16 @@ async def join_room(sid, data):
 
     if room_id not in rooms:
         rooms[room_id] = {"users": {}, "order": [], "host": sid, "state": "waiting"}
+        room_index.set_phase(room_id, "waiting")
 
     room = rooms[room_id]
 
-    if room["state"] == "playing":
+    # 재시작으로 복구된 방이면 userId 로 다시 붙인다
+    if user_id in room.get("roster", {}):
+        await _reattach(sid, room_id, room, data)
+        return
+
+    if room["state"] in ("playing", "resuming"):
         await sio.emit("redirect_lobby",
                        {"reason": "서버와 연결이 끊겨 게임에서 제외되었습니다."},
                        to=sid)
@@ -63,6 +100,29 @@ async def join_room(sid, data):
         room=room_id,
     )
 
+async def _reattach(sid, room_id: str, room: dict, data: dict):
+    info = room["roster"].pop(data["userId"])
+    room["users"][sid] = {
+        "id": data["userId"],
+        "avatar": data.get("avatar", info.get("avatar")),
+        "nickname": data.get("nickname", info.get("nickname")),
+        "ready": True,
+        "mic": False,
+    }
+    room["scores"][sid] = info.get("score", 0)
+    if room["state"] == "playing":
+        room["order"].append(sid)          # 재개 전이면 resume_room 이 원래 순서로 복원
+    if room["host"] is None or room.get("resume", {}).get("host") == data["userId"]:
+        room["host"] = sid
+
+    await sio.enter_room(sid, room_id)
+    await broadcast_room_update(room_id)
+    await sio.emit(
+        "game_resumed",
+        {"round": room.get("round"), "maxRounds": room.get("max_rounds"), "phase": room.get("phase")},
+        to=sid,
+    )
+
 @sio.event
 async def toggle_ready(sid, data=None):
     for rid, room in rooms.items():
@@ -83,6 +143,7 @@ async def leave_room(sid, data=None):
 
             leaver = room["users"].pop(sid, None)
             room["order"] = [s for s in room["order"] if s != sid]
+            phases.discard(rid, sid)                # 나간 플레이어의 ack 는 기다리지 않는다
 
             if room["host"] == sid and room["users"]:
                 new_host = next(iter(room["users"]))
@@ -91,7 +152,10 @@ async def leave_room(sid, data=None):
             await broadcast_room_update(rid)
 
             if not room["users"]:
-                del rooms[rid]
+                rooms.pop(rid, None)                # 동시에 나간 다른 플레이어가 먼저 지웠을 수 있다
+                room_index.remove(rid)
+                snapshotter.forget(rid)
+                catalog.forget_room(rid)
             # 시스템 채팅 브로드캐스트
             if leaver and rid in rooms:
                 nick = leaver["nickname"]
@@ -115,6 +179,11 @@ async def mic_ready(sid, data):
         rooms[room_id]["users"][sid]["mic"] = True
         await broadcast_room_update(room_id)
 
+def _game_seed(data: dict) -> int:
+    if ALLOW_CLIENT_SEED and data.get("seed") is not None:
+        return int(data["seed"])
+    return random.randrange(2**32)
+
 @sio.event
 async def start_game(sid, data):
     room_id = data.get("roomId")
@@ -134,7 +203,9 @@ async def start_game(sid, data):
     # 플레이어 수에 맞춰 키워드 가져오기
     num_players = len(room["users"])
     total_keywords = num_players * max_rounds
-    room_keywords = KEYWORDS or await fetch_random_keywords(total_keywords)
+    room_keywords = KEYWORDS or await fetch_random_keywords(                 # 타입 균형 + 최근 키워드 회피
+        total_keywords, room_id=room_id, difficulty=data.get("difficulty"),  # 난이도는 있으면 우선
+    )
     room.update(
         {
             "state": "playing",
@@ -144,17 +215,33 @@ async def start_game(sid, data):
             "scores": {u: 0 for u in room["users"]},
             "keywords": room_keywords,
             "kw_idx": 0,
+            # 보정 점수 RNG 시드 (리플레이·벤치마크 재현용, 항상 서버가 정한다)
+            "seed": _game_seed(data),
         }
     )
 
+    schedule_prefetch(room_id)   # 인트로 동안 첫 턴 준비
+    enter_phase(room_id, "intro", INTRO_LEN)
     await sio.emit(
         "game_intro",
         {"round": 1, "maxRounds": room["max_rounds"]},
         room=room_id,
     )
-    await asyncio.sleep(11)
+    waited = await phases.hold(room_id, "intro", INTRO_LEN, room["users"].keys())
+    phases.record_saved("intro", INTRO_LEN - waited)
     await run_rounds(room_id)
 
+# 페이즈 ack: intro_seen · keyword_ready · playback_finished · result_seen  (payload: {roomId})
+def _make_ack_handler(phase: str):
+    async def handler(sid, data=None):
+        room_id = (data or {}).get("roomId")
+        if room_id in rooms:
+            phases.ack(room_id, sid, phase)
+    return handler
+
+for _event, _phase in phases.ACK_EVENTS.items():
+    sio.on(_event, _make_ack_handler(_phase))
+
 @sio.on("chat")
 async def handle_lobby_chat(sid, msg):
     await sio.emit("chat", msg)
@@ -168,6 +255,12 @@ async def handle_room_chat(sid, data=None):
         room=data["roomId"],
     )
 
+@sio.on("recording_chunk")
+async def handle_recording_chunk(sid, data):
+    # data: { roomId, playerSid, turn, chunk: bytes } – 녹음 길이는 서버가 record_begin 부터 잰다
+    key = f"{data['roomId']}:{data['playerSid']}:{data.get('turn', -1)}"
+    speculative.feed(key, sid, data.get("chunk") or b"", analyze_recording)
+
 @sio.on("submit_recording")
 async def handle_submit_recording(sid, data):
     room_id    = data["roomId"]
@@ -178,17 +271,85 @@ async def handle_submit_recording(sid, data):
     audio_raw  = data["audio"]  # bytes (WebM/Opus)
 
     # ── 🎙️ 서버-측 WAV 변환 ─────────────────────────────
-    wav16k = convert_format(audio_raw, for_whisper=True)  # 16 kHz·mono·PCM16
+    wav16k = await convert_format_async(audio_raw, room_id=room_id, for_whisper=True)  # 16 kHz·mono·PCM16 (디코딩 스레드·샤드)
 
     # 저장 버퍼
     key        = f"{room_id}:{player_sid}:{turn}"
     audio_b64  = base64.b64encode(wav16k).decode()        # **WAV** 데이터
 
+    seed = turn_seed(rooms.get(room_id) or {})
+    spec = speculative.take(key)          # recording_chunk 로 띄운 앞부분 분석 (없으면 None)
+
     # 분석 비동기 태스크
-    async def analyze():
+    archive = turn_archive.wants()
+    trace: dict = {}
+
+    def _keep(result: dict) -> dict:
+        # 앞부분에서 확신할 만한 일치 → 전체 분석 생략
+        spec.ready("speculative")
+        if archive:
+            turn_archive.record(
+                room_id=room_id, turn=turn, keyword=keyword, seed=seed,
+                trace=spec.trace, result=result, audio=spec.prefix,
+            )
+        return result
+
+    async def _full() -> dict:
+        with speculative.full_analysis():   # 앞부분 분석 예산은 전체 분석량에 묶인다
+            result = await analyze_recording(
+                audio_raw, keyword, room_id=room_id, seed=seed, trace=trace if archive else None,
+            )
+        if archive:
+            turn_archive.record(
+                room_id=room_id, turn=turn, keyword=keyword, seed=seed,
+                trace=trace, result=result, audio=audio_raw,
+            )
+        if spec:
+            spec.ready("full")
+        return result
+
+    async def _analyze():
         # audio: 클라이언트 원본 음성 파일
         # keyword: {type, name, alias}
-        return await analyze_recording(audio_raw, keyword)
+        if spec is None or not spec.pending():
+            result = spec.confident() if spec else None
+            return _keep(result) if result is not None else await _full()
+
+        # 앞부분 분석이 아직 진행 중 → 기다리지 않고 전체 분석을 같이 시작, 먼저 끝나는 쪽을 본다
+        full = asyncio.create_task(_full())
+        try:
+            await asyncio.wait({full, spec.task}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError as e:
+            full.cancel(*e.args)            # asyncio.wait 는 기다리던 태스크를 취소하지 않는다
+            raise
+        if not full.done():
+            result = spec.confident(earn=False)     # full_analysis 가 이미 버킷을 채웠다
+            if result is not None:
+                full.cancel()
+                return _keep(result)
+        elif spec.pending():
+            spec.confident()                # late 로 기록만 (이미 보낸 ACR 호출이므로 취소하지 않는다)
+        return await full
+
+    async def analyze():
+        # 시간 초과(run_rounds 가 취소)·예외로 끝난 턴도 남겨야 느린 턴을 재채점할 수 있다
+        try:
+            return await _analyze()
+        except asyncio.CancelledError as e:
+            if archive:
+                status = "timeout" if ANALYSIS_TIMEOUT_MSG in e.args else "cancelled"
+                turn_archive.record(
+                    room_id=room_id, turn=turn, keyword=keyword, seed=seed,
+                    trace=trace, result=FAILED_RESULT, audio=audio_raw, status=status,
+                )
+            raise
+        except Exception as e:
+            if archive:
+                turn_archive.record(
+                    room_id=room_id, turn=turn, keyword=keyword, seed=seed,
+                    trace=trace, result=FAILED_RESULT, audio=audio_raw, status="error", error=repr(e),
+                )
+            raise
 
     # buffer 저장 및 이벤트 set (run_rounds 에서 생성된 이벤트가 있을 때만)
     round_buffer[key] = {"audio_b64": audio_b64, "future": asyncio.create_task(analyze())}
@@ -0,0 +1,140 @@
+"""serializer.py – Socket.IO 패킷 직렬화 선택 + 이벤트별 계측
+
+SIO_SERIALIZER
+--------------
+* ``json``    (기본) : 표준 json (기존과 같은 출력)
+* ``orjson``         : orjson 으로 인코딩·디코딩. 한글을 ``\\uXXXX`` 로 풀지 않아 payload 도 작아진다.
+                       orjson 이 없으면 표준 json(ensure_ascii=False)으로 대신한다.
+* ``msgpack``        : MessagePack 패킷 (클라이언트도 ``socket.io-msgpack-parser`` 를 써야 한다)
+
+모든 모드에서 이벤트 이름별로 인코딩 바이트·시간을 ``sio_encode_*`` 메트릭으로 남긴다.
+방 브로드캐스트는 한 번만 인코딩되므로 바이트는 "수신자 수를 곱하기 전" 값이다.
+
+압축
+----
+WebSocket permessage-deflate 는 연결 단위로 협상되고 uvicorn 이 처리한다 (``--ws-per-message-deflate``, 기본 켜짐).
+python-socketio 에는 emit 단위로 deflate 를 끄는 방법이 없으므로, 대신 ``SIO_DEFLATE_SAMPLE`` 비율로
+텍스트 패킷을 zlib 으로 시험 압축해 이벤트별 압축률(``sio_deflate_ratio``)을 보여 준다.
+바이너리 첨부(이미 압축된 webm/opus 녹음 등)는 시험 압축에서 뺀다 (msgpack 은 바이너리가 든 패킷 자체를 건너뛴다).
+HTTP long-polling 응답 압축은 engineio 의 ``http_compression`` / ``compression_threshold`` 로 조정한다.
+"""
+from __future__ import annotations
+
+import json as _stdjson
+import os
+import random
+import time
+import zlib
+from typing import Any, Dict
+
+from socketio import packet as _packet
+
+from monitoring.metrics import counter, histogram
+
+SIO_SERIALIZER          = os.getenv("SIO_SERIALIZER", "json")
+SIO_DEFLATE_SAMPLE      = float(os.getenv("SIO_DEFLATE_SAMPLE", "0.01"))
+SIO_HTTP_COMPRESSION    = os.getenv("SIO_HTTP_COMPRESSION", "1") == "1"
+SIO_COMPRESSION_THRESHOLD = int(os.getenv("SIO_COMPRESSION_THRESHOLD", "1024"))
+
+ENCODE_BYTES   = counter("sio_encode_bytes_total", "이벤트별 인코딩한 바이트 (첨부 포함)")
+ENCODE_PACKETS = counter("sio_encode_packets_total", "이벤트별 인코딩한 패킷 수")
+ENCODE_SECONDS = histogram("sio_encode_seconds", "이벤트별 패킷 인코딩 시간",
+                           buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05))
+DEFLATE_RATIO  = histogram("sio_deflate_ratio", "이벤트별 시험 압축률 (압축 후 / 전, 텍스트 패킷만)",
+                           buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0))
+
+# ───────────────────────────── json 모듈 대용 (Packet.json 자리에 들어간다)
+class _CompactJson:
+    """표준 json, 한글은 그대로 (``\\uXXXX`` 이스케이프 없이)"""
+
+    @staticmethod
+    def dumps(obj: Any, **kw) -> str:
+        kw.setdefault("separators", (",", ":"))
+        return _stdjson.dumps(obj, ensure_ascii=False, **kw)
+
+    @staticmethod
+    def loads(s, **kw):
+        return _stdjson.loads(s, **kw)
+
+class _OrJson:
+    def __init__(self, orjson):
+        self._orjson = orjson
+        self._opts = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, obj: Any, **kw) -> str:
+        try:
+            return self._orjson.dumps(obj, option=self._opts).decode()
+        except TypeError:                      # orjson 이 모르는 타입 → 표준 json 규칙대로
+            return _CompactJson.dumps(obj, default=str)
+
+    def loads(self, s, **kw):
+        return self._orjson.loads(s)
+
+def _json_module():
+    if SIO_SERIALIZER != "orjson":
+        return None
+    try:
+        import orjson
+    except ImportError:
+        print("⚠️ orjson 미설치 → 표준 json(ensure_ascii=False) 사용")
+        return _CompactJson()
+    return _OrJson(orjson)
+
+# ───────────────────────────── 계측 패킷
+def _event_name(pkt) -> str:
+    if pkt.packet_type in (_packet.EVENT, _packet.BINARY_EVENT) and isinstance(pkt.data, list) and pkt.data:
+        return str(pkt.data[0])
+    return _packet.packet_names[pkt.packet_type] if pkt.packet_type < len(_packet.packet_names) else "?"
+
+def _nbytes(part) -> int:
+    if isinstance(part, str):
+        return len(part) if part.isascii() else len(part.encode())
+    return len(part)
+
+class _MeteredMixin:
+    def encode(self):
+        t0 = time.perf_counter()
+        encoded = super().encode()
+        took = time.perf_counter() - t0
+
+        event = _event_name(self)
+        parts = encoded if isinstance(encoded, list) else [encoded]
+        ENCODE_SECONDS.observe(took, event=event)
+        ENCODE_PACKETS.inc(event=event)
+        ENCODE_BYTES.inc(sum(_nbytes(p) for p in parts), event=event)
+
+        if SIO_DEFLATE_SAMPLE > 0 and random.random() < SIO_DEFLATE_SAMPLE:
+            self._sample_deflate(event, parts)
+        return encoded
+
+    def _sample_deflate(self, event: str, parts: list):
+        # json 모드: 바이너리는 첨부 파트로 빠지므로 첫 파트(텍스트)만.
+        # msgpack 모드: 바이너리가 패킷 안에 그대로 들어가므로 (녹음 등) 그런 패킷은 통째로 건너뛴다
+        if not self.uses_binary_events and self._data_is_binary(self.data):
+            return
+        head = parts[0]
+        raw = head.encode() if isinstance(head, str) else head
+        if raw:
+            DEFLATE_RATIO.observe(len(zlib.compress(raw, 6)) / len(raw), event=event)
+
+class MeteredPacket(_MeteredMixin, _packet.Packet):
+    pass
+
+def _msgpack_class():
+    from socketio.msgpack_packet import MsgPackPacket   # requirements 의 msgpack 사용
+
+    class MeteredMsgPackPacket(_MeteredMixin, MsgPackPacket):
+        pass
+    return MeteredMsgPackPacket
+
+def server_options() -> Dict[str, Any]:
+    """socketio.AsyncServer(...) 에 넘길 직렬화·압축 옵션"""
+    opts: Dict[str, Any] = {
+        "serializer":            _msgpack_class() if SIO_SERIALIZER == "msgpack" else MeteredPacket,
+        "http_compression":      SIO_HTTP_COMPRESSION,
+        "compression_threshold": SIO_COMPRESSION_THRESHOLD,
+    }
+    json_mod = _json_module()
+    if json_mod is not None:
+        opts["json"] = json_mod
+    return opts